@@ -0,0 +1,292 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+BENCHMARK: PIPELINE PADA DATA SINTETIS BERSKALA BESAR
+
+Membuat CSV kejadian sintetis dengan schema yang sama dengan data asli
+(provinsi/kabupaten/kecamatan/desa/tahun/jumlah_kejadian, ~99% baris bernilai 0),
+lalu mengukur waktu setiap tahap secara terpisah:
+
+    ingest      parsing CSV per chunk (dtype schema)
+    aggregation agregasi chunk ke unit x tahun
+    features    fitur temporal/geografis, target, train-test split
+    training    semua varian model PART 3 (fit + CV)
+    evaluation  analisis PART 4 (tanpa plot/laporan file)
+
+    python -m dt_benchmark                       # skala 10k dan 1m
+    python -m dt_benchmark --scales 10k 1m 50m
+
+Hasil ditulis ke benchmark_results.json dan ditambahkan ke benchmark_history.jsonl
+(satu baris per run, dengan commit git) sehingga regresi antar commit terlihat.
+CSV sintetis disimpan di .dt_bench/ dan dipakai ulang antar run.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+import dt_data_preparation
+import dt_evaluation
+import dt_modeling
+import dt_profile
+
+SCALES = {'10k': 10_000, '1m': 1_000_000, '50m': 50_000_000}
+DEFAULT_SCALES = ['10k', '1m']
+
+BENCH_DIR = '.dt_bench'
+RESULTS_FILE = 'benchmark_results.json'
+HISTORY_FILE = 'benchmark_history.jsonl'
+
+# Struktur wilayah sintetis: jumlah kabupaten ikut naik dengan skala sehingga
+# proporsi kelas target per kabupaten x tahun tetap mirip data asli
+YEARS = list(range(2019, 2025))
+DESA_PER_KECAMATAN = 10
+KECAMATAN_PER_KABUPATEN = 6
+MIN_KABUPATEN = 27
+ZERO_RATE = 0.99
+GENERATE_CHUNK_ROWS = 1_000_000
+
+STAGES = ['ingest', 'aggregation', 'features', 'training', 'evaluation']
+
+
+# ============================================
+# 1. SYNTHETIC DATA
+# ============================================
+
+def synthetic_chunk(start, stop, n_kabupaten, rng):
+    """Baris [start, stop) dataset sintetis: urut per desa, lalu per tahun (seperti data asli)."""
+    row = np.arange(start, stop)
+    unit = row // len(YEARS)
+    kab = unit % n_kabupaten
+    local = unit // n_kabupaten
+    kec = local // DESA_PER_KECAMATAN
+
+    kasus = np.where(rng.random(len(row)) < ZERO_RATE, 0, 1 + rng.poisson(0.5, len(row)))
+    kab_label = pd.Series(kab).map('{:03d}'.format)
+    kec_label = kab_label + '-' + pd.Series(kec).map('{:04d}'.format)
+    return pd.DataFrame({
+        'id': row + 1,
+        'kode_provinsi': 32,
+        'nama_provinsi': 'JAWA BARAT',
+        'bps_kode_kabupaten_kota': 3200 + kab,
+        'bps_nama_kabupaten_kota': 'KABUPATEN SINTETIS ' + kab_label,
+        'bps_kode_kecamatan': (3200 + kab) * 10_000 + kec,
+        'bps_nama_kecamatan': 'KECAMATAN ' + kec_label,
+        'bps_kode_desa_kelurahan': (3200 + kab) * 10_000_000 + local,
+        'bps_nama_desa_kelurahan': 'DESA ' + kec_label + '-' + pd.Series(local).map('{:05d}'.format),
+        'jumlah_kejadian': kasus,
+        'satuan': 'KEJADIAN',
+        'tahun': np.asarray(YEARS)[row % len(YEARS)],
+    })
+
+
+def generate_csv(path, n_rows, seed=42, chunk_rows=GENERATE_CHUNK_ROWS):
+    """Tulis CSV sintetis `n_rows` baris per chunk (memori tidak bergantung pada n_rows)."""
+    n_units = -(-n_rows // len(YEARS))
+    n_kabupaten = max(MIN_KABUPATEN,
+                      -(-n_units // (DESA_PER_KECAMATAN * KECAMATAN_PER_KABUPATEN)))
+    rng = np.random.default_rng(seed)
+
+    tmp = f"{path}.tmp"
+    for start in range(0, n_rows, chunk_rows):
+        chunk = synthetic_chunk(start, min(start + chunk_rows, n_rows), n_kabupaten, rng)
+        chunk.to_csv(tmp, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def synthetic_file(scale, seed=42, bench_dir=BENCH_DIR):
+    """Path CSV sintetis untuk `scale`; dibuat sekali lalu dipakai ulang."""
+    os.makedirs(bench_dir, exist_ok=True)
+    path = os.path.join(bench_dir, f"kejadian_{scale}_seed{seed}.csv")
+    if not os.path.exists(path):
+        print(f"   Generating {SCALES[scale]:,} rows -> {path}")
+        start = time.perf_counter()
+        generate_csv(path, SCALES[scale], seed=seed)
+        print(f"   Generated in {time.perf_counter() - start:.1f} s")
+    return path
+
+
+# ============================================
+# 2. STAGE TIMING
+# ============================================
+
+class TimedChunks:
+    """Bungkus iterable chunk; `seconds` = waktu yang dihabiskan untuk parsing chunk."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.seconds = 0.0
+
+    @property
+    def n_rows(self):
+        return self.chunks.n_rows
+
+    def __iter__(self):
+        iterator = iter(self.chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self.seconds += time.perf_counter() - start
+                return
+            self.seconds += time.perf_counter() - start
+            yield chunk
+
+
+@contextlib.contextmanager
+def quiet(verbose=False):
+    """Sembunyikan output print tahap pipeline kecuali --verbose."""
+    if verbose:
+        yield
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+
+
+def benchmark_file(path, granularity='kabupaten', chunksize=dt_data_preparation.INGEST_CHUNK_ROWS,
+                   workers=None, verbose=False):
+    """Jalankan PART 2-4 pada satu CSV dan kembalikan durasi (detik) per tahap."""
+    timings = {}
+    with quiet(verbose):
+        chunks = TimedChunks(dt_data_preparation.RawChunks(path, chunksize=chunksize))
+        start = time.perf_counter()
+        df_agg = dt_data_preparation.aggregate_units(chunks, granularity)
+        timings['ingest'] = chunks.seconds
+        timings['aggregation'] = time.perf_counter() - start - chunks.seconds
+
+        start = time.perf_counter()
+        df_feat, kabupaten_mapping = dt_data_preparation.build_features(
+            df_agg, granularity=granularity)
+        prepared = dt_data_preparation.split_prepared(df_feat, kabupaten_mapping,
+                                                      chunks.n_rows, granularity=granularity)
+        timings['features'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bundle = dt_modeling.train(prepared, workers=workers)
+        timings['training'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dt_evaluation.evaluate(bundle)
+        timings['evaluation'] = time.perf_counter() - start
+
+    return {
+        'rows': chunks.n_rows,
+        'file_mb': os.path.getsize(path) / 1024**2,
+        'n_aggregated': len(df_agg),
+        'n_train': len(prepared.X_train),
+        'best_model': bundle.best_model_name,
+        'seconds': timings,
+        'total_seconds': sum(timings.values()),
+        'rss_mb': (dt_profile.current_rss() or 0) / 1024**2,
+    }
+
+
+# ============================================
+# 3. RUN RECORD
+# ============================================
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_run(history_path, scale):
+    """Record terakhir untuk `scale` di history (untuk perbandingan antar commit)."""
+    if not os.path.exists(history_path):
+        return None
+    last = None
+    with open(history_path) as f:
+        for line in f:
+            run = json.loads(line)
+            if scale in run.get('scales', {}):
+                last = run
+    return last
+
+
+def print_result(scale, result, previous=None):
+    print(f"\n[{scale}] {result['rows']:,} rows ({result['file_mb']:.1f} MB) -> "
+          f"{result['n_aggregated']:,} unit x tahun")
+    print(f"   {'stage':<12} {'seconds':>9} {'prev':>9} {'change':>8}")
+    for stage in STAGES + ['total']:
+        seconds = result['total_seconds'] if stage == 'total' else result['seconds'][stage]
+        line = f"   {stage:<12} {seconds:>9.3f}"
+        if previous is not None:
+            prev = previous['scales'][scale]
+            prev_seconds = prev['total_seconds'] if stage == 'total' else prev['seconds'][stage]
+            change = (seconds - prev_seconds) / prev_seconds * 100 if prev_seconds else 0.0
+            line += f" {prev_seconds:>9.3f} {change:>+7.1f}%"
+        print(line)
+
+
+def run(scales=DEFAULT_SCALES, granularity='kabupaten', workers=None, seed=42,
+        out=RESULTS_FILE, history=HISTORY_FILE, verbose=False):
+    print("="*70)
+    print("PIPELINE BENCHMARK (SYNTHETIC DATA)")
+    print("="*70)
+
+    record = {
+        'run_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'granularity': granularity,
+        'seed': seed,
+        'python_version': platform.python_version(),
+        'pandas_version': pd.__version__,
+        'sklearn_version': sklearn.__version__,
+        'cpu_count': os.cpu_count(),
+        'scales': {},
+    }
+    for scale in scales:
+        path = synthetic_file(scale, seed=seed)
+        previous = previous_run(history, scale)
+        result = benchmark_file(path, granularity=granularity, workers=workers, verbose=verbose)
+        record['scales'][scale] = result
+        print_result(scale, result, previous)
+        if previous is not None:
+            print(f"   (prev: commit {previous.get('commit')}, {previous.get('run_at')})")
+
+    with open(out, 'w') as f:
+        json.dump(record, f, indent=2)
+    with open(history, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+    print(f"\n✅ Benchmark saved: {out} (history: {history})")
+    return record
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dt_benchmark',
+                                     description='Benchmark pipeline pada data sintetis')
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=DEFAULT_SCALES,
+                        help='ukuran dataset sintetis')
+    parser.add_argument('--granularity', choices=list(dt_data_preparation.GRANULARITY_LEVELS),
+                        default='kabupaten', help='unit wilayah per baris model')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='jumlah worker process untuk training model')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=RESULTS_FILE)
+    parser.add_argument('--history', default=HISTORY_FILE)
+    parser.add_argument('--verbose', action='store_true', help='tampilkan output setiap tahap')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return run(scales=args.scales, granularity=args.granularity, workers=args.jobs,
+               seed=args.seed, out=args.out, history=args.history, verbose=args.verbose)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,30 +6,25 @@ Dataset: Kasus Bunuh Diri di Jawa Barat (2019-2024)
 Focus: Binary Classification dengan Decision Tree
 """
 
+import argparse
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib import cbook
 import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-
-print("="*70)
-print("DECISION TREE PROJECT - BUSINESS & DATA UNDERSTANDING")
-print("="*70)
-
-# ============================================
-# 1. BUSINESS UNDERSTANDING
-# ============================================
+import dt_plots
+import dt_profile
+import dt_report
+import dt_schema
 
-print("\n" + "="*70)
-print("BUSINESS UNDERSTANDING")
-print("="*70)
+DATA_FILE = 'jml_kejadian_bunuh_diri__des_kel.csv'
 
-business_context = """
+BUSINESS_CONTEXT = """
 KONTEKS BISNIS:
 Kasus bunuh diri merupakan masalah kesehatan mental yang serius di Jawa Barat.
 Data menunjukkan distribusi kasus yang sangat tidak merata antar wilayah.
@@ -66,244 +61,305 @@ SUCCESS CRITERIA:
 - Model interpretability tinggi untuk decision support
 """
 
-print(business_context)
+
+@dataclass
+class DataUnderstanding:
+    """Ringkasan hasil eksplorasi data mentah (output PART 1)."""
+    target_stats: dict
+    cases_nonzero: pd.Series
+    temporal: pd.DataFrame
+    geo_kabupaten: pd.DataFrame
+    insights: str
+    summary: dict
+
 
 # ============================================
-# 2. LOAD & EXPLORE DATA
+# 1. BUSINESS UNDERSTANDING
 # ============================================
 
-print("\n" + "="*70)
-print("DATA LOADING & INITIAL EXPLORATION")
-print("="*70)
-
-# Load dataset
-df = pd.read_csv('jml_kejadian_bunuh_diri__des_kel.csv')
-
-print(f"\n[DATASET OVERVIEW]")
-print("-" * 70)
-print(f"Total Records: {len(df):,}")
-print(f"Total Features: {len(df.columns)}")
-print(f"Periode: {df['tahun'].min()} - {df['tahun'].max()}")
-print(f"Jumlah Tahun: {df['tahun'].nunique()}")
-
-print(f"\n[GEOGRAPHIC COVERAGE]")
-print("-" * 70)
-print(f"Provinsi: {df['nama_provinsi'].nunique()}")
-print(f"Kabupaten/Kota: {df['bps_nama_kabupaten_kota'].nunique()}")
-print(f"Kecamatan: {df['bps_nama_kecamatan'].nunique()}")
-print(f"Desa/Kelurahan: {df['bps_nama_desa_kelurahan'].nunique()}")
-
-print(f"\n[COLUMNS]")
-print("-" * 70)
-print(df.columns.tolist())
-
-print(f"\n[DATA TYPES]")
-print("-" * 70)
-print(df.dtypes)
-
-print(f"\n[MISSING VALUES]")
-print("-" * 70)
-missing = df.isnull().sum()
-if missing.sum() == 0:
-    print("✅ NO MISSING VALUES")
-else:
-    print(missing[missing > 0])
-
-print(f"\n[SAMPLE DATA]")
-print("-" * 70)
-print(df.head(10))
+def print_business_context():
+    print("\n" + "="*70)
+    print("BUSINESS UNDERSTANDING")
+    print("="*70)
+    print(BUSINESS_CONTEXT)
+
 
 # ============================================
-# 3. TARGET VARIABLE ANALYSIS
+# 2. LOAD & EXPLORE DATA
 # ============================================
 
-print("\n" + "="*70)
-print("TARGET VARIABLE ANALYSIS (jumlah_kejadian)")
-print("="*70)
+@dt_profile.profiled('load_data')
+def load_data(path=DATA_FILE):
+    """Load dataset mentah kejadian per desa/kelurahan dengan schema dt_schema."""
+    df = dt_schema.read_raw(path)
+    dt_schema.print_memory_report(df)
+    return df
+
+
+def explore_data(df):
+    """Cetak overview dataset: cakupan, kolom, tipe data, missing values."""
+    print("\n" + "="*70)
+    print("DATA LOADING & INITIAL EXPLORATION")
+    print("="*70)
+
+    print(f"\n[DATASET OVERVIEW]")
+    print("-" * 70)
+    print(f"Total Records: {len(df):,}")
+    print(f"Total Features: {len(df.columns)}")
+    print(f"Periode: {df['tahun'].min()} - {df['tahun'].max()}")
+    print(f"Jumlah Tahun: {df['tahun'].nunique()}")
+
+    print(f"\n[GEOGRAPHIC COVERAGE]")
+    print("-" * 70)
+    print(f"Provinsi: {df['nama_provinsi'].nunique()}")
+    print(f"Kabupaten/Kota: {df['bps_nama_kabupaten_kota'].nunique()}")
+    print(f"Kecamatan: {df['bps_nama_kecamatan'].nunique()}")
+    print(f"Desa/Kelurahan: {df['bps_nama_desa_kelurahan'].nunique()}")
+
+    print(f"\n[COLUMNS]")
+    print("-" * 70)
+    print(df.columns.tolist())
+
+    print(f"\n[DATA TYPES]")
+    print("-" * 70)
+    print(df.dtypes)
+
+    print(f"\n[MISSING VALUES]")
+    print("-" * 70)
+    missing = df.isnull().sum()
+    if missing.sum() == 0:
+        print("✅ NO MISSING VALUES")
+    else:
+        print(missing[missing > 0])
+
+    print(f"\n[SAMPLE DATA]")
+    print("-" * 70)
+    print(df.head(10))
 
-print(f"\n[DESCRIPTIVE STATISTICS]")
-print("-" * 70)
-print(df['jumlah_kejadian'].describe())
 
-print(f"\n[DISTRIBUTION ANALYSIS]")
-print("-" * 70)
-print(df['jumlah_kejadian'].value_counts().head(15))
+# ============================================
+# 3. TARGET VARIABLE ANALYSIS
+# ============================================
 
-# Calculate key metrics
-total_records = len(df)
-zero_cases = (df['jumlah_kejadian'] == 0).sum()
-non_zero_cases = (df['jumlah_kejadian'] > 0).sum()
-pct_zero = zero_cases / total_records * 100
-pct_non_zero = non_zero_cases / total_records * 100
+def analyze_target(df):
+    """Hitung distribusi kelas biner (0 kasus vs >0 kasus)."""
+    print("\n" + "="*70)
+    print("TARGET VARIABLE ANALYSIS (jumlah_kejadian)")
+    print("="*70)
+
+    print(f"\n[DESCRIPTIVE STATISTICS]")
+    print("-" * 70)
+    print(df['jumlah_kejadian'].describe())
+
+    print(f"\n[DISTRIBUTION ANALYSIS]")
+    print("-" * 70)
+    print(df['jumlah_kejadian'].value_counts().head(15))
+
+    # Calculate key metrics
+    total_records = len(df)
+    zero_cases = (df['jumlah_kejadian'] == 0).sum()
+    non_zero_cases = (df['jumlah_kejadian'] > 0).sum()
+    pct_zero = zero_cases / total_records * 100
+    pct_non_zero = non_zero_cases / total_records * 100
+
+    print(f"\n[CLASS DISTRIBUTION]")
+    print("-" * 70)
+    print(f"Tidak Ada Kasus (0): {zero_cases:,} ({pct_zero:.2f}%)")
+    print(f"Ada Kasus (>0):      {non_zero_cases:,} ({pct_non_zero:.2f}%)")
+    print(f"\n⚠️ SEVERE CLASS IMBALANCE DETECTED!")
+    print(f"   Ratio = {zero_cases/non_zero_cases:.1f}:1")
+
+    return {
+        'total_records': total_records,
+        'zero_cases': zero_cases,
+        'non_zero_cases': non_zero_cases,
+        'pct_zero': pct_zero,
+        'pct_non_zero': pct_non_zero,
+    }
+
+
+def analyze_temporal(df):
+    """Agregasi kasus per tahun."""
+    print("\n[Temporal Analysis]")
+    temporal = df.groupby('tahun')['jumlah_kejadian'].agg(['sum', 'mean', 'count']).reset_index()
+    temporal['pct_with_cases'] = df.groupby('tahun').apply(
+        lambda x: (x['jumlah_kejadian'] > 0).sum() / len(x) * 100
+    ).values
+
+    print(temporal)
+    return temporal
+
+
+def analyze_geography(df):
+    """Agregasi kasus per kabupaten, diurutkan dari total kasus tertinggi."""
+    print("\n[Geographic Analysis]")
+    geo_kabupaten = df.groupby('bps_nama_kabupaten_kota').agg({
+        'jumlah_kejadian': ['sum', 'mean', 'max'],
+        'bps_nama_desa_kelurahan': 'count'
+    }).round(2)
+    geo_kabupaten.columns = ['total_kasus', 'rata_kasus', 'max_kasus', 'jumlah_desa']
+    geo_kabupaten['pct_with_cases'] = df.groupby('bps_nama_kabupaten_kota').apply(
+        lambda x: (x['jumlah_kejadian'] > 0).sum() / len(x) * 100
+    ).round(2)
+    geo_kabupaten = geo_kabupaten.sort_values('total_kasus', ascending=False)
+
+    print("\nTop 10 Kabupaten/Kota:")
+    print(geo_kabupaten.head(10))
+    return geo_kabupaten
 
-print(f"\n[CLASS DISTRIBUTION]")
-print("-" * 70)
-print(f"Tidak Ada Kasus (0): {zero_cases:,} ({pct_zero:.2f}%)")
-print(f"Ada Kasus (>0):      {non_zero_cases:,} ({pct_non_zero:.2f}%)")
-print(f"\n⚠️ SEVERE CLASS IMBALANCE DETECTED!")
-print(f"   Ratio = {zero_cases/non_zero_cases:.1f}:1")
 
 # ============================================
 # 4. VISUALIZATIONS
 # ============================================
 
-print("\n" + "="*70)
-print("CREATING VISUALIZATIONS")
-print("="*70)
-
-# [A] Class Distribution Pie Chart
-fig, axes = plt.subplots(2, 2, figsize=(14, 12))
-fig.suptitle('Target Variable Analysis', fontsize=16, fontweight='bold')
-
-# Pie chart
-colors = ['lightcoral', 'lightgreen']
-axes[0, 0].pie([zero_cases, non_zero_cases], 
-               labels=['Tidak Ada Kasus (0)', 'Ada Kasus (>0)'],
-               autopct='%1.2f%%', colors=colors, startangle=90,
-               textprops={'fontsize': 11, 'fontweight': 'bold'})
-axes[0, 0].set_title('Class Distribution (Binary)', fontsize=13, fontweight='bold')
-
-# Bar chart
-axes[0, 1].bar(['Tidak Berisiko\n(0 kasus)', 'Berisiko\n(>0 kasus)'], 
-               [zero_cases, non_zero_cases], color=colors, edgecolor='black', linewidth=1.5)
-axes[0, 1].set_ylabel('Count', fontsize=11)
-axes[0, 1].set_title('Binary Classification Target', fontsize=13, fontweight='bold')
-axes[0, 1].grid(axis='y', alpha=0.3)
-for i, v in enumerate([zero_cases, non_zero_cases]):
-    axes[0, 1].text(i, v + 500, f'{v:,}\n({[pct_zero, pct_non_zero][i]:.1f}%)', 
-                    ha='center', fontweight='bold', fontsize=10)
-
-# Distribution of cases > 0
-df_cases = df[df['jumlah_kejadian'] > 0]['jumlah_kejadian']
-axes[1, 0].hist(df_cases, bins=50, color='steelblue', edgecolor='black', alpha=0.7)
-axes[1, 0].set_xlabel('Jumlah Kasus', fontsize=11)
-axes[1, 0].set_ylabel('Frequency', fontsize=11)
-axes[1, 0].set_title('Distribution of Cases (Only >0)', fontsize=13, fontweight='bold')
-axes[1, 0].axvline(df_cases.median(), color='red', linestyle='--', 
-                   linewidth=2, label=f'Median: {df_cases.median():.0f}')
-axes[1, 0].legend()
-axes[1, 0].grid(alpha=0.3)
-
-# Box plot
-axes[1, 1].boxplot(df_cases, vert=True)
-axes[1, 1].set_ylabel('Jumlah Kasus', fontsize=11)
-axes[1, 1].set_title('Boxplot of Cases (Only >0)', fontsize=13, fontweight='bold')
-axes[1, 1].grid(alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('01_target_distribution_analysis.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 01_target_distribution_analysis.png")
-
-# [B] Temporal Analysis
-print("\n[Temporal Analysis]")
-temporal = df.groupby('tahun')['jumlah_kejadian'].agg(['sum', 'mean', 'count']).reset_index()
-temporal['pct_with_cases'] = df.groupby('tahun').apply(
-    lambda x: (x['jumlah_kejadian'] > 0).sum() / len(x) * 100
-).values
-
-print(temporal)
-
-fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-fig.suptitle('Temporal Trends Analysis', fontsize=16, fontweight='bold')
-
-# Total cases per year
-axes[0, 0].plot(temporal['tahun'], temporal['sum'], marker='o', linewidth=2, markersize=8)
-axes[0, 0].set_xlabel('Tahun', fontsize=11)
-axes[0, 0].set_ylabel('Total Kasus', fontsize=11)
-axes[0, 0].set_title('Total Cases per Year', fontsize=13, fontweight='bold')
-axes[0, 0].grid(alpha=0.3)
-for i, v in enumerate(temporal['sum']):
-    axes[0, 0].text(temporal['tahun'][i], v + 20, str(int(v)), 
-                    ha='center', fontweight='bold')
-
-# Average cases per year
-axes[0, 1].bar(temporal['tahun'], temporal['mean'], color='coral', edgecolor='black')
-axes[0, 1].set_xlabel('Tahun', fontsize=11)
-axes[0, 1].set_ylabel('Rata-rata Kasus', fontsize=11)
-axes[0, 1].set_title('Average Cases per Year', fontsize=13, fontweight='bold')
-axes[0, 1].grid(axis='y', alpha=0.3)
-
-# Percentage with cases
-axes[1, 0].plot(temporal['tahun'], temporal['pct_with_cases'], 
-                marker='s', linewidth=2, markersize=8, color='green')
-axes[1, 0].set_xlabel('Tahun', fontsize=11)
-axes[1, 0].set_ylabel('Persentase (%)', fontsize=11)
-axes[1, 0].set_title('% Wilayah dengan Kasus per Year', fontsize=13, fontweight='bold')
-axes[1, 0].grid(alpha=0.3)
-
-# Number of records per year
-axes[1, 1].bar(temporal['tahun'], temporal['count'], color='skyblue', edgecolor='black')
-axes[1, 1].set_xlabel('Tahun', fontsize=11)
-axes[1, 1].set_ylabel('Jumlah Records', fontsize=11)
-axes[1, 1].set_title('Data Records per Year', fontsize=13, fontweight='bold')
-axes[1, 1].grid(axis='y', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('02_temporal_trends.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 02_temporal_trends.png")
-
-# [C] Geographic Analysis
-print("\n[Geographic Analysis]")
-geo_kabupaten = df.groupby('bps_nama_kabupaten_kota').agg({
-    'jumlah_kejadian': ['sum', 'mean', 'max'],
-    'bps_nama_desa_kelurahan': 'count'
-}).round(2)
-geo_kabupaten.columns = ['total_kasus', 'rata_kasus', 'max_kasus', 'jumlah_desa']
-geo_kabupaten['pct_with_cases'] = df.groupby('bps_nama_kabupaten_kota').apply(
-    lambda x: (x['jumlah_kejadian'] > 0).sum() / len(x) * 100
-).round(2)
-geo_kabupaten = geo_kabupaten.sort_values('total_kasus', ascending=False)
-
-print("\nTop 10 Kabupaten/Kota:")
-print(geo_kabupaten.head(10))
-
-# Visualisasi Top 10
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-fig.suptitle('Geographic Hotspot Analysis', fontsize=16, fontweight='bold')
-
-top10 = geo_kabupaten.head(10)
-axes[0].barh(range(len(top10)), top10['total_kasus'], color='indianred', edgecolor='black')
-axes[0].set_yticks(range(len(top10)))
-axes[0].set_yticklabels(top10.index, fontsize=10)
-axes[0].set_xlabel('Total Kasus', fontsize=11)
-axes[0].set_title('Top 10 Kabupaten - Total Cases', fontsize=13, fontweight='bold')
-axes[0].invert_yaxis()
-axes[0].grid(axis='x', alpha=0.3)
-
-axes[1].barh(range(len(top10)), top10['pct_with_cases'], color='mediumseagreen', edgecolor='black')
-axes[1].set_yticks(range(len(top10)))
-axes[1].set_yticklabels(top10.index, fontsize=10)
-axes[1].set_xlabel('% Wilayah dengan Kasus', fontsize=11)
-axes[1].set_title('Top 10 Kabupaten - % Areas with Cases', fontsize=13, fontweight='bold')
-axes[1].invert_yaxis()
-axes[1].grid(axis='x', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('03_geographic_hotspots.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 03_geographic_hotspots.png")
+def render_target_distribution(zero_cases, non_zero_cases, pct_zero, pct_non_zero,
+                               case_hist, case_median, case_box):
+    # [A] Class Distribution Pie Chart
+    fig, axes = plt.subplots(2, 2, figsize=(14, 12))
+    fig.suptitle('Target Variable Analysis', fontsize=16, fontweight='bold')
+
+    # Pie chart
+    colors = ['lightcoral', 'lightgreen']
+    axes[0, 0].pie([zero_cases, non_zero_cases],
+                   labels=['Tidak Ada Kasus (0)', 'Ada Kasus (>0)'],
+                   autopct='%1.2f%%', colors=colors, startangle=90,
+                   textprops={'fontsize': 11, 'fontweight': 'bold'})
+    axes[0, 0].set_title('Class Distribution (Binary)', fontsize=13, fontweight='bold')
+
+    # Bar chart
+    axes[0, 1].bar(['Tidak Berisiko\n(0 kasus)', 'Berisiko\n(>0 kasus)'],
+                   [zero_cases, non_zero_cases], color=colors, edgecolor='black', linewidth=1.5)
+    axes[0, 1].set_ylabel('Count', fontsize=11)
+    axes[0, 1].set_title('Binary Classification Target', fontsize=13, fontweight='bold')
+    axes[0, 1].grid(axis='y', alpha=0.3)
+    for i, v in enumerate([zero_cases, non_zero_cases]):
+        axes[0, 1].text(i, v + 500, f'{v:,}\n({[pct_zero, pct_non_zero][i]:.1f}%)',
+                        ha='center', fontweight='bold', fontsize=10)
+
+    # Distribution of cases > 0
+    counts, edges = case_hist
+    axes[1, 0].hist(edges[:-1], bins=edges, weights=counts,
+                    color='steelblue', edgecolor='black', alpha=0.7)
+    axes[1, 0].set_xlabel('Jumlah Kasus', fontsize=11)
+    axes[1, 0].set_ylabel('Frequency', fontsize=11)
+    axes[1, 0].set_title('Distribution of Cases (Only >0)', fontsize=13, fontweight='bold')
+    axes[1, 0].axvline(case_median, color='red', linestyle='--',
+                       linewidth=2, label=f'Median: {case_median:.0f}')
+    axes[1, 0].legend()
+    axes[1, 0].grid(alpha=0.3)
+
+    # Box plot
+    axes[1, 1].bxp(case_box)
+    axes[1, 1].set_ylabel('Jumlah Kasus', fontsize=11)
+    axes[1, 1].set_title('Boxplot of Cases (Only >0)', fontsize=13, fontweight='bold')
+    axes[1, 1].grid(alpha=0.3)
+
+    plt.tight_layout()
+
+
+def render_temporal_trends(temporal):
+    # [B] Temporal Analysis
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    fig.suptitle('Temporal Trends Analysis', fontsize=16, fontweight='bold')
+
+    # Total cases per year
+    axes[0, 0].plot(temporal['tahun'], temporal['sum'], marker='o', linewidth=2, markersize=8)
+    axes[0, 0].set_xlabel('Tahun', fontsize=11)
+    axes[0, 0].set_ylabel('Total Kasus', fontsize=11)
+    axes[0, 0].set_title('Total Cases per Year', fontsize=13, fontweight='bold')
+    axes[0, 0].grid(alpha=0.3)
+    for i, v in enumerate(temporal['sum']):
+        axes[0, 0].text(temporal['tahun'][i], v + 20, str(int(v)),
+                        ha='center', fontweight='bold')
+
+    # Average cases per year
+    axes[0, 1].bar(temporal['tahun'], temporal['mean'], color='coral', edgecolor='black')
+    axes[0, 1].set_xlabel('Tahun', fontsize=11)
+    axes[0, 1].set_ylabel('Rata-rata Kasus', fontsize=11)
+    axes[0, 1].set_title('Average Cases per Year', fontsize=13, fontweight='bold')
+    axes[0, 1].grid(axis='y', alpha=0.3)
+
+    # Percentage with cases
+    axes[1, 0].plot(temporal['tahun'], temporal['pct_with_cases'],
+                    marker='s', linewidth=2, markersize=8, color='green')
+    axes[1, 0].set_xlabel('Tahun', fontsize=11)
+    axes[1, 0].set_ylabel('Persentase (%)', fontsize=11)
+    axes[1, 0].set_title('% Wilayah dengan Kasus per Year', fontsize=13, fontweight='bold')
+    axes[1, 0].grid(alpha=0.3)
+
+    # Number of records per year
+    axes[1, 1].bar(temporal['tahun'], temporal['count'], color='skyblue', edgecolor='black')
+    axes[1, 1].set_xlabel('Tahun', fontsize=11)
+    axes[1, 1].set_ylabel('Jumlah Records', fontsize=11)
+    axes[1, 1].set_title('Data Records per Year', fontsize=13, fontweight='bold')
+    axes[1, 1].grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+
+
+def render_geographic_hotspots(top10):
+    # [C] Geographic Analysis - Visualisasi Top 10
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    fig.suptitle('Geographic Hotspot Analysis', fontsize=16, fontweight='bold')
+
+    axes[0].barh(range(len(top10)), top10['total_kasus'], color='indianred', edgecolor='black')
+    axes[0].set_yticks(range(len(top10)))
+    axes[0].set_yticklabels(top10.index, fontsize=10)
+    axes[0].set_xlabel('Total Kasus', fontsize=11)
+    axes[0].set_title('Top 10 Kabupaten - Total Cases', fontsize=13, fontweight='bold')
+    axes[0].invert_yaxis()
+    axes[0].grid(axis='x', alpha=0.3)
+
+    axes[1].barh(range(len(top10)), top10['pct_with_cases'], color='mediumseagreen', edgecolor='black')
+    axes[1].set_yticks(range(len(top10)))
+    axes[1].set_yticklabels(top10.index, fontsize=10)
+    axes[1].set_xlabel('% Wilayah dengan Kasus', fontsize=11)
+    axes[1].set_title('Top 10 Kabupaten - % Areas with Cases', fontsize=13, fontweight='bold')
+    axes[1].invert_yaxis()
+    axes[1].grid(axis='x', alpha=0.3)
+
+    plt.tight_layout()
+
+
+def understanding_figures(result):
+    """Ringkasan kecil per figure (histogram & statistik boxplot, bukan data mentah)."""
+    target_stats = result.target_stats
+    df_cases = result.cases_nonzero
+    return [
+        dt_report.Figure('01_target_distribution_analysis.png', render_target_distribution, dict(
+            zero_cases=target_stats['zero_cases'],
+            non_zero_cases=target_stats['non_zero_cases'],
+            pct_zero=target_stats['pct_zero'],
+            pct_non_zero=target_stats['pct_non_zero'],
+            case_hist=np.histogram(df_cases, bins=50),
+            case_median=df_cases.median(),
+            case_box=cbook.boxplot_stats(df_cases.to_numpy()),
+        )),
+        dt_report.Figure('02_temporal_trends.png', render_temporal_trends,
+                         dict(temporal=result.temporal)),
+        dt_report.Figure('03_geographic_hotspots.png', render_geographic_hotspots,
+                         dict(top10=result.geo_kabupaten.head(10))),
+    ]
+
 
 # ============================================
 # 5. KEY INSIGHTS
 # ============================================
 
-print("\n" + "="*70)
-print("KEY INSIGHTS & FINDINGS")
-print("="*70)
+def build_insights(df, target_stats, temporal, geo_kabupaten, df_cases):
+    pct_zero = target_stats['pct_zero']
+    pct_non_zero = target_stats['pct_non_zero']
+    zero_cases = target_stats['zero_cases']
+    non_zero_cases = target_stats['non_zero_cases']
 
-insights = f"""
+    return f"""
 CRITICAL INSIGHTS:
 
 1. SEVERE CLASS IMBALANCE ⚠️
    - {pct_zero:.2f}% data tidak memiliki kasus (class 0)
    - {pct_non_zero:.2f}% data memiliki kasus (class 1)
    - Imbalance ratio: {zero_cases/non_zero_cases:.1f}:1
-   
+
    IMPLIKASI:
    → Perlu handling khusus untuk imbalanced data
    → Accuracy bukan metrik utama (misleading!)
@@ -313,7 +369,7 @@ CRITICAL INSIGHTS:
 2. GEOGRAPHIC CONCENTRATION
    - Top 3 kabupaten: {', '.join(geo_kabupaten.head(3).index)}
    - Hotspots berkontribusi {geo_kabupaten.head(3)['total_kasus'].sum() / df['jumlah_kejadian'].sum() * 100:.1f}% total kasus
-   
+
    IMPLIKASI:
    → Geographic features penting untuk model
    → Targeted intervention di hotspot areas
@@ -322,7 +378,7 @@ CRITICAL INSIGHTS:
 3. TEMPORAL PATTERNS
    - Tahun dengan kasus tertinggi: {temporal.loc[temporal['sum'].idxmax(), 'tahun']}
    - Trend: {'Meningkat' if temporal.iloc[-1]['sum'] > temporal.iloc[0]['sum'] else 'Menurun'}
-   
+
    IMPLIKASI:
    → Temporal features (tahun, lag) penting
    → Need for continuous monitoring
@@ -332,7 +388,7 @@ CRITICAL INSIGHTS:
    - Median kasus (bila >0): {df_cases.median():.0f}
    - Max kasus: {df['jumlah_kejadian'].max()}
    - Outliers signifikan ada
-   
+
    IMPLIKASI:
    → Decision Tree cocok (robust to outliers)
    → Binary classification lebih stable
@@ -342,7 +398,7 @@ CRITICAL INSIGHTS:
    - Early warning system feasible
    - Clear target untuk classification
    - Actionable insights untuk stakeholder
-   
+
    REKOMENDASI:
    → Binary classification: "Berisiko" vs "Tidak Berisiko"
    → Decision Tree dengan class balancing
@@ -350,39 +406,116 @@ CRITICAL INSIGHTS:
    → Geographic-based intervention planning
 """
 
-print(insights)
-
-# Save summary
-summary_file = {
-    'Total_Records': len(df),
-    'Periode': f"{df['tahun'].min()}-{df['tahun'].max()}",
-    'Kabupaten_Count': df['bps_nama_kabupaten_kota'].nunique(),
-    'Zero_Cases_Pct': pct_zero,
-    'With_Cases_Pct': pct_non_zero,
-    'Imbalance_Ratio': f"{zero_cases/non_zero_cases:.1f}:1",
-    'Top_Kabupaten': geo_kabupaten.head(3).index.tolist(),
-    'Max_Cases': int(df['jumlah_kejadian'].max()),
-    'Median_Cases_NonZero': df_cases.median()
-}
-
-summary_df = pd.DataFrame([summary_file])
-summary_df.to_csv('00_dataset_summary.csv', index=False)
-
-with open('00_business_understanding_summary.txt', 'w', encoding='utf-8') as f:
-    f.write("DECISION TREE PROJECT - BUSINESS UNDERSTANDING\n")
-    f.write("="*70 + "\n\n")
-    f.write(business_context)
-    f.write("\n\n")
-    f.write(insights)
-
-print("\n✅ Files saved:")
-print("   - 00_dataset_summary.csv")
-print("   - 00_business_understanding_summary.txt")
-print("   - 01_target_distribution_analysis.png")
-print("   - 02_temporal_trends.png")
-print("   - 03_geographic_hotspots.png")
-
-print("\n" + "="*70)
-print("🎉 BUSINESS & DATA UNDERSTANDING COMPLETED!")
-print("="*70)
-print("\nNext Step: Run 02_data_preparation_classification.py")
+
+def understand(df):
+    """Jalankan analisis PART 1 pada DataFrame mentah, tanpa plotting."""
+    explore_data(df)
+    target_stats = analyze_target(df)
+    df_cases = df[df['jumlah_kejadian'] > 0]['jumlah_kejadian']
+    temporal = analyze_temporal(df)
+    geo_kabupaten = analyze_geography(df)
+
+    print("\n" + "="*70)
+    print("KEY INSIGHTS & FINDINGS")
+    print("="*70)
+
+    insights = build_insights(df, target_stats, temporal, geo_kabupaten, df_cases)
+    print(insights)
+
+    zero_cases = target_stats['zero_cases']
+    non_zero_cases = target_stats['non_zero_cases']
+    summary = {
+        'Total_Records': len(df),
+        'Periode': f"{df['tahun'].min()}-{df['tahun'].max()}",
+        'Kabupaten_Count': df['bps_nama_kabupaten_kota'].nunique(),
+        'Zero_Cases_Pct': target_stats['pct_zero'],
+        'With_Cases_Pct': target_stats['pct_non_zero'],
+        'Imbalance_Ratio': f"{zero_cases/non_zero_cases:.1f}:1",
+        'Top_Kabupaten': geo_kabupaten.head(3).index.tolist(),
+        'Max_Cases': int(df['jumlah_kejadian'].max()),
+        'Median_Cases_NonZero': df_cases.median()
+    }
+
+    return DataUnderstanding(
+        target_stats=target_stats,
+        cases_nonzero=df_cases,
+        temporal=temporal,
+        geo_kabupaten=geo_kabupaten,
+        insights=insights,
+        summary=summary,
+    )
+
+
+def plot_understanding(result):
+    print("\n" + "="*70)
+    print("CREATING VISUALIZATIONS")
+    print("="*70)
+
+    dt_report.render_figures(understanding_figures(result))
+
+
+def save_understanding(result):
+    summary_df = pd.DataFrame([result.summary])
+    summary_df.to_csv('00_dataset_summary.csv', index=False)
+
+    with open('00_business_understanding_summary.txt', 'w', encoding='utf-8') as f:
+        f.write("DECISION TREE PROJECT - BUSINESS UNDERSTANDING\n")
+        f.write("="*70 + "\n\n")
+        f.write(BUSINESS_CONTEXT)
+        f.write("\n\n")
+        f.write(result.insights)
+
+    print("\n✅ Files saved:")
+    print("   - 00_dataset_summary.csv")
+    print("   - 00_business_understanding_summary.txt")
+    print("   - 01_target_distribution_analysis.png")
+    print("   - 02_temporal_trends.png")
+    print("   - 03_geographic_hotspots.png")
+
+
+def run(df=None, path=DATA_FILE, plots=None):
+    """PART 1 end-to-end. `df` dapat diberikan langsung agar tidak membaca ulang CSV.
+
+    `plots=False` (atau DT_PLOTS=0) melewati semua figure.
+    """
+    plots = dt_plots.plots_enabled(plots)
+    if not plots:
+        dt_plots.headless()
+    # Set style
+    plt.style.use('seaborn-v0_8-darkgrid')
+    sns.set_palette("husl")
+
+    print("="*70)
+    print("DECISION TREE PROJECT - BUSINESS & DATA UNDERSTANDING")
+    print("="*70)
+
+    print_business_context()
+
+    if df is None:
+        df = load_data(path)
+
+    result = understand(df)
+    if plots:
+        plot_understanding(result)
+    else:
+        dt_plots.skip_notice('PART 1')
+    save_understanding(result)
+
+    print("\n" + "="*70)
+    print("🎉 BUSINESS & DATA UNDERSTANDING COMPLETED!")
+    print("="*70)
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='PART 1: business & data understanding')
+    parser.add_argument('--data', default=DATA_FILE,
+                        help='CSV mentah kejadian per desa/kelurahan')
+    dt_plots.add_plot_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    run(path=args.data, plots=args.plots)
+    print("\nNext Step: Run 02_data_preparation_classification.py")
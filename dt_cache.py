@@ -0,0 +1,141 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+STAGE CACHE (content-addressed, LRU)
+
+Cache hasil tahap yang mahal (feature engineering PART 2, model fit PART 3).
+Key = hash SHA-256 dari isi input (file CSV mentah / data training) + parameter
+tahap, sehingga cache otomatis invalid bila data atau parameter berubah.
+Ukuran direktori cache dibatasi; entry yang paling lama tidak dipakai dihapus
+lebih dulu (LRU berdasarkan mtime yang di-update setiap cache hit).
+
+Konfigurasi lewat environment variable:
+    DT_CACHE=0            nonaktifkan cache
+    DT_CACHE_DIR=...      lokasi cache (default: .dt_cache)
+    DT_CACHE_MAX_MB=...   batas ukuran cache (default: 512)
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import joblib
+import pandas as pd
+
+CACHE_DIR = '.dt_cache'
+DEFAULT_MAX_MB = 512
+CHUNK_SIZE = 1 << 20
+
+
+# ============================================
+# 1. HASHING
+# ============================================
+
+def file_digest(path):
+    """SHA-256 isi file, dibaca per blok 1 MB."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def frame_digest(*frames):
+    """SHA-256 isi satu atau lebih DataFrame/Series (nilai + index + nama kolom)."""
+    h = hashlib.sha256()
+    for frame in frames:
+        h.update(pd.util.hash_pandas_object(frame, index=True).to_numpy().tobytes())
+        columns = frame.columns if isinstance(frame, pd.DataFrame) else [frame.name]
+        h.update(json.dumps([str(c) for c in columns]).encode('utf-8'))
+    return h.hexdigest()
+
+
+def make_key(*parts):
+    """Gabungkan digest dan parameter (harus JSON-serializable) menjadi satu key."""
+    payload = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ============================================
+# 2. CACHE STORE
+# ============================================
+
+class StageCache:
+    """Direktori cache dengan eviction LRU berdasarkan total ukuran file."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key, ext):
+        return os.path.join(self.directory, f'{key}{ext}')
+
+    def lookup(self, key, ext):
+        """Path entry bila ada (dan tandai sebagai baru dipakai), selain itu None."""
+        path = self.path(key, ext)
+        try:
+            os.utime(path, None)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, key, ext, write):
+        """Tulis entry secara atomik lewat `write(tmp_path)`, lalu jalankan eviction."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, self.path(key, ext))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+        return self.path(key, ext)
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # dihapus proses lain (training paralel)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Hapus entry paling lama tidak dipakai sampai total ukuran <= max_bytes."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+    # Objek Python (model, hasil CV) disimpan dengan joblib
+    def load_object(self, key):
+        path = self.lookup(key, '.joblib')
+        return joblib.load(path) if path else None
+
+    def store_object(self, key, obj):
+        return self.store(key, '.joblib', lambda tmp: joblib.dump(obj, tmp))
+
+
+def default_cache():
+    """StageCache dari environment, atau None bila DT_CACHE=0."""
+    if os.environ.get('DT_CACHE', '1') == '0':
+        return None
+    max_mb = float(os.environ.get('DT_CACHE_MAX_MB', DEFAULT_MAX_MB))
+    return StageCache(os.environ.get('DT_CACHE_DIR', CACHE_DIR),
+                      max_bytes=int(max_mb * 1024 * 1024))
@@ -0,0 +1,97 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+KALIBRASI PROBABILITAS (OUT-OF-FOLD)
+
+Probabilitas leaf decision tree (apalagi dengan class_weight='balanced') bukan
+estimasi peluang yang terkalibrasi: model balanced sengaja menaikkan probabilitas
+kelas minoritas. Kalibrator dipasang pada probabilitas out-of-fold dari CV PART 3
+(tidak pernah melihat baris yang diprediksinya) lalu disimpan bersama model:
+
+    isotonic  fungsi monoton non-parametrik (default bila sampel OOF >= 1000)
+    sigmoid   Platt scaling, 2 parameter (lebih stabil untuk data kecil)
+
+`transform()` hanya berupa lookup/interpolasi vektor (np.interp) atau satu
+ekspresi sigmoid, jadi murah untuk batch scoring jutaan baris.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss
+
+CALIBRATION_METHOD = 'auto'     # 'isotonic', 'sigmoid', atau 'auto'
+ISOTONIC_MIN_SAMPLES = 1000     # di bawah ini isotonic cenderung overfit -> sigmoid
+RELIABILITY_BINS = 10
+
+
+@dataclass
+class Calibrator:
+    """Pemetaan probabilitas mentah -> probabilitas terkalibrasi."""
+    method: str
+    knots_x: np.ndarray = None      # isotonic: titik tabel lookup
+    knots_y: np.ndarray = None
+    slope: float = None             # sigmoid: p' = 1 / (1 + exp(-(slope * p + intercept)))
+    intercept: float = None
+    n_samples: int = 0
+    brier_raw: float = None         # Brier OOF sebelum / sesudah kalibrasi
+    brier_calibrated: float = None
+
+    def transform(self, proba):
+        proba = np.asarray(proba, dtype=float)
+        if self.method == 'isotonic':
+            return np.interp(proba, self.knots_x, self.knots_y)
+        return 1.0 / (1.0 + np.exp(-(self.slope * proba + self.intercept)))
+
+
+def choose_method(n_samples, method=CALIBRATION_METHOD):
+    if method != 'auto':
+        return method
+    return 'isotonic' if n_samples >= ISOTONIC_MIN_SAMPLES else 'sigmoid'
+
+
+def fit_calibrator(oof_proba, y_true, method=CALIBRATION_METHOD):
+    """Kalibrator dari probabilitas OOF kelas 1 dan label training."""
+    oof_proba = np.asarray(oof_proba, dtype=float)
+    y_true = np.asarray(y_true).astype(int)
+    valid = ~np.isnan(oof_proba)
+    oof_proba, y_true = oof_proba[valid], y_true[valid]
+    method = choose_method(len(oof_proba), method)
+
+    if method == 'isotonic':
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds='clip')
+        iso.fit(oof_proba, y_true)
+        calibrator = Calibrator(method=method, knots_x=iso.X_thresholds_,
+                                knots_y=iso.y_thresholds_)
+    elif method == 'sigmoid':
+        platt = LogisticRegression(C=np.inf).fit(oof_proba.reshape(-1, 1), y_true)
+        calibrator = Calibrator(method=method, slope=float(platt.coef_[0, 0]),
+                                intercept=float(platt.intercept_[0]))
+    else:
+        raise ValueError(f"Metode kalibrasi tidak dikenal: {method!r}")
+
+    calibrator.n_samples = len(oof_proba)
+    calibrator.brier_raw = brier_score_loss(y_true, oof_proba)
+    calibrator.brier_calibrated = brier_score_loss(y_true, calibrator.transform(oof_proba))
+    return calibrator
+
+
+def reliability_table(y_true, proba, n_bins=RELIABILITY_BINS):
+    """Reliability curve: rata-rata prediksi vs frekuensi positif per bin lebar sama."""
+    y_true = np.asarray(y_true, dtype=float)
+    proba = np.asarray(proba, dtype=float)
+    bins = np.minimum((proba * n_bins).astype(int), n_bins - 1)
+
+    count = np.bincount(bins, minlength=n_bins)
+    sum_pred = np.bincount(bins, weights=proba, minlength=n_bins)
+    sum_true = np.bincount(bins, weights=y_true, minlength=n_bins)
+    filled = count > 0
+    return pd.DataFrame({
+        'bin_lower': np.arange(n_bins)[filled] / n_bins,
+        'bin_upper': (np.arange(n_bins)[filled] + 1) / n_bins,
+        'count': count[filled],
+        'mean_predicted': sum_pred[filled] / count[filled],
+        'fraction_positive': sum_true[filled] / count[filled],
+    })
@@ -6,177 +6,32 @@ Focus: Feature Engineering untuk Binary Classification
 Target: Wilayah "Berisiko" (>0 kasus) vs "Tidak Berisiko" (0 kasus)
 """
 
+import argparse
+import json
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.ipc
 import matplotlib.pyplot as plt
+from matplotlib import cbook
 import seaborn as sns
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*70)
-print("DATA PREPARATION FOR DECISION TREE CLASSIFICATION")
-print("="*70)
-
-# ============================================
-# 1. LOAD DATA
-# ============================================
-
-print("\n[1] LOADING DATA...")
-print("-" * 70)
-
-df = pd.read_csv('jml_kejadian_bunuh_diri__des_kel.csv')
-print(f"✅ Dataset loaded: {len(df):,} records")
-
-# ============================================
-# 2. FEATURE ENGINEERING
-# ============================================
-
-print("\n" + "="*70)
-print("FEATURE ENGINEERING")
-print("="*70)
-
-# [A] AGREGASI PER KABUPATEN & TAHUN
-print("\n[A] Agregating data per Kabupaten & Tahun...")
-
-df_agg = df.groupby(['bps_nama_kabupaten_kota', 'tahun']).agg({
-    'jumlah_kejadian': ['sum', 'mean', 'max', 'std', 'count'],
-    'bps_nama_kecamatan': 'nunique',
-    'bps_nama_desa_kelurahan': 'nunique'
-}).reset_index()
-
-# Flatten column names
-df_agg.columns = ['kabupaten', 'tahun', 'total_kasus', 'rata_kasus', 
-                  'max_kasus', 'std_kasus', 'count_records',
-                  'jumlah_kecamatan', 'jumlah_desa']
-
-# Handle NaN in std
-df_agg['std_kasus'].fillna(0, inplace=True)
-
-print(f"✅ Aggregated shape: {df_agg.shape}")
-print(f"   Features: {list(df_agg.columns)}")
-
-# [B] TEMPORAL FEATURES (LAG & TREND)
-print("\n[B] Creating temporal features...")
-
-df_agg = df_agg.sort_values(['kabupaten', 'tahun']).reset_index(drop=True)
-
-# Lag features
-df_agg['kasus_1tahun_lalu'] = df_agg.groupby('kabupaten')['total_kasus'].shift(1)
-df_agg['kasus_2tahun_lalu'] = df_agg.groupby('kabupaten')['total_kasus'].shift(2)
-
-# Trend
-df_agg['tren'] = df_agg['total_kasus'] - df_agg['kasus_1tahun_lalu']
-
-# Growth rate (handle division by zero)
-df_agg['growth_rate'] = df_agg.apply(
-    lambda row: ((row['total_kasus'] - row['kasus_1tahun_lalu']) / row['kasus_1tahun_lalu'] * 100) 
-    if pd.notna(row['kasus_1tahun_lalu']) and row['kasus_1tahun_lalu'] > 0 
-    else 0, 
-    axis=1
-)
-
-# Rolling statistics (2 years window)
-df_agg['rolling_mean_2y'] = df_agg.groupby('kabupaten')['total_kasus'].transform(
-    lambda x: x.rolling(window=2, min_periods=1).mean()
-)
-
-df_agg['rolling_max_2y'] = df_agg.groupby('kabupaten')['total_kasus'].transform(
-    lambda x: x.rolling(window=2, min_periods=1).max()
-)
-
-print("✅ Temporal features created:")
-print("   - kasus_1tahun_lalu, kasus_2tahun_lalu")
-print("   - tren, growth_rate")
-print("   - rolling_mean_2y, rolling_max_2y")
-
-# [C] GEOGRAPHIC FEATURES
-print("\n[C] Creating geographic features...")
-
-# Total historis per kabupaten (all years)
-total_historis = df.groupby('bps_nama_kabupaten_kota')['jumlah_kejadian'].sum()
-df_agg['total_kasus_historis'] = df_agg['kabupaten'].map(total_historis)
-
-# Rata-rata kasus per desa
-df_agg['kasus_per_desa'] = df_agg['total_kasus'] / df_agg['jumlah_desa']
-
-# Density score (kasus per kecamatan)
-df_agg['density_score'] = df_agg['total_kasus'] / df_agg['jumlah_kecamatan']
-
-# Severity indicator (max relative to mean)
-df_agg['severity_ratio'] = df_agg.apply(
-    lambda row: row['max_kasus'] / row['rata_kasus'] if row['rata_kasus'] > 0 else 0,
-    axis=1
-)
-
-print("✅ Geographic features created:")
-print("   - total_kasus_historis")
-print("   - kasus_per_desa")
-print("   - density_score")
-print("   - severity_ratio")
-
-# [D] CATEGORICAL ENCODING
-print("\n[D] Encoding categorical features...")
-
-le = LabelEncoder()
-df_agg['kabupaten_encoded'] = le.fit_transform(df_agg['kabupaten'])
-
-# Save label encoder mapping
-kabupaten_mapping = pd.DataFrame({
-    'kabupaten': le.classes_,
-    'encoded_value': range(len(le.classes_))
-})
-kabupaten_mapping.to_csv('kabupaten_encoding_mapping.csv', index=False)
-
-print(f"✅ Encoded {len(le.classes_)} kabupaten")
-print("   Mapping saved to: kabupaten_encoding_mapping.csv")
-
-# [E] CREATE BINARY TARGET
-print("\n[E] Creating binary target variable...")
-
-df_agg['berisiko'] = (df_agg['total_kasus'] > 0).astype(int)
-
-target_dist = df_agg['berisiko'].value_counts()
-print(f"\n✅ Binary target created:")
-print(f"   Class 0 (Tidak Berisiko): {target_dist[0]} ({target_dist[0]/len(df_agg)*100:.2f}%)")
-print(f"   Class 1 (Berisiko):       {target_dist[1]} ({target_dist[1]/len(df_agg)*100:.2f}%)")
-print(f"   Imbalance ratio: {target_dist[0]/target_dist[1]:.2f}:1")
-
-# ============================================
-# 3. HANDLE MISSING VALUES
-# ============================================
-
-print("\n" + "="*70)
-print("HANDLING MISSING VALUES")
-print("="*70)
-
-print("\nMissing values BEFORE handling:")
-missing_before = df_agg.isnull().sum()
-print(missing_before[missing_before > 0])
-
-# Fill NaN in lag features with 0
-fill_cols = ['kasus_1tahun_lalu', 'kasus_2tahun_lalu', 'tren', 'growth_rate']
-for col in fill_cols:
-    df_agg[col].fillna(0, inplace=True)
+import dt_cache
+import dt_plots
+import dt_profile
+import dt_report
+import dt_schema
 
-print("\nMissing values AFTER handling:")
-missing_after = df_agg.isnull().sum()
-if missing_after.sum() == 0:
-    print("✅ No missing values!")
-else:
-    print(missing_after[missing_after > 0])
-
-# ============================================
-# 4. FEATURE SELECTION
-# ============================================
-
-print("\n" + "="*70)
-print("FEATURE SELECTION")
-print("="*70)
+DATA_FILE = 'jml_kejadian_bunuh_diri__des_kel.csv'
 
 # Select features untuk modeling
-feature_cols = [
+FEATURE_COLS = [
     # Temporal
     'tahun',
     'kasus_1tahun_lalu',
@@ -185,7 +40,7 @@ feature_cols = [
     'growth_rate',
     'rolling_mean_2y',
     'rolling_max_2y',
-    
+
     # Geographic
     'kabupaten_encoded',
     'jumlah_kecamatan',
@@ -193,7 +48,7 @@ feature_cols = [
     'kasus_per_desa',
     'density_score',
     'total_kasus_historis',
-    
+
     # Statistical
     'rata_kasus',
     'max_kasus',
@@ -202,191 +57,857 @@ feature_cols = [
     'count_records'
 ]
 
-print(f"\n✅ Selected {len(feature_cols)} features:")
-for i, feat in enumerate(feature_cols, 1):
-    print(f"   {i:2d}. {feat}")
+TARGET_COL = 'berisiko'
+
+# Lag (tahun) dan ukuran rolling window untuk fitur temporal; kolom baru
+# (mis. rolling_mean_3y) perlu ditambahkan ke FEATURE_COLS agar dipakai model
+TEMPORAL_LAGS = (1, 2)
+ROLLING_WINDOWS = (2,)
+
+# Granularity unit model: kolom data mentah yang menjadi key grup (selain tahun)
+GRANULARITY_LEVELS = {
+    'kabupaten': ['bps_nama_kabupaten_kota'],
+    'kecamatan': ['bps_nama_kabupaten_kota', 'bps_nama_kecamatan'],
+    'desa': ['bps_nama_kabupaten_kota', 'bps_nama_kecamatan', 'bps_nama_desa_kelurahan'],
+}
+AREA_COLS = {
+    'bps_nama_kabupaten_kota': 'kabupaten',
+    'bps_nama_kecamatan': 'kecamatan',
+    'bps_nama_desa_kelurahan': 'desa',
+}
+COUNT_COLS = {
+    'bps_nama_kecamatan': 'jumlah_kecamatan',
+    'bps_nama_desa_kelurahan': 'jumlah_desa',
+}
+# Data mentah lebih besar dari ini diagregasi per chunk
+AGG_CHUNK_ROWS = 1_000_000
+
+# Streaming ingest hanya membaca kolom yang dipakai agregasi
+INGEST_COLS = ['bps_nama_kabupaten_kota', 'bps_nama_kecamatan',
+               'bps_nama_desa_kelurahan', 'jumlah_kejadian', 'tahun']
+INGEST_CHUNK_ROWS = 200_000
+
+# Handoff antar tahap: satu file Arrow IPC menggantikan X/y_train/test.csv
+HANDOFF_FILE = 'prepared_data.arrow'
+HANDOFF_META_KEY = b'dt_handoff'
+SPLIT_COL = '_split'
+SPLIT_POS_COL = '_split_pos'
+
+# Naikkan bila logika feature engineering berubah agar cache lama tidak terpakai
+PREP_CACHE_VERSION = 1
+
+
+@dataclass
+class PreparedData:
+    """Output PART 2: fitur hasil rekayasa + train-test split."""
+    X_train: pd.DataFrame
+    X_test: pd.DataFrame
+    y_train: pd.Series
+    y_test: pd.Series
+    data: pd.DataFrame
+    feature_cols: list
+    kabupaten_mapping: pd.DataFrame
+    n_raw: int
+    n_aggregated: int
+    cache_key: str = None
+    granularity: str = 'kabupaten'
+
 
 # ============================================
-# 5. DATA SPLITTING
+# 1. LOAD DATA
 # ============================================
 
-print("\n" + "="*70)
-print("TRAIN-TEST SPLIT")
-print("="*70)
+@dt_profile.profiled('load_data')
+def load_data(path=DATA_FILE):
+    print("\n[1] LOADING DATA...")
+    print("-" * 70)
+
+    df = dt_schema.read_raw(path)
+    print(f"✅ Dataset loaded: {len(df):,} records")
+    dt_schema.print_memory_report(df)
+    return df
+
 
-# Remove rows with any remaining NaN
-df_clean = df_agg.dropna()
-print(f"\nData after dropna: {len(df_clean)} records")
+class RawChunks:
+    """CSV mentah sebagai iterable chunk (hanya kolom untuk agregasi, dtype eksplisit).
 
-# Prepare X and y
-X = df_clean[feature_cols]
-y = df_clean['berisiko']
+    Bisa diiterasi berulang kali; `n_rows` berisi jumlah baris setelah iterasi selesai.
+    """
 
-print(f"\nFeature matrix shape: {X.shape}")
-print(f"Target vector shape: {y.shape}")
+    def __init__(self, path=DATA_FILE, chunksize=INGEST_CHUNK_ROWS, usecols=INGEST_COLS):
+        self.path = path
+        self.chunksize = chunksize
+        self.usecols = list(usecols)
+        self.n_rows = 0
 
-# Stratified split (maintain class distribution)
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, 
-    test_size=0.2, 
-    random_state=42, 
-    stratify=y
-)
+    def __iter__(self):
+        self.n_rows = 0
+        with dt_schema.read_raw(self.path, usecols=self.usecols,
+                                chunksize=self.chunksize) as reader:
+            for chunk in reader:
+                self.n_rows += len(chunk)
+                yield chunk
 
-print(f"\n✅ Data split completed:")
-print(f"   Training set:   {X_train.shape[0]} samples ({X_train.shape[0]/len(X)*100:.1f}%)")
-print(f"   Testing set:    {X_test.shape[0]} samples ({X_test.shape[0]/len(X)*100:.1f}%)")
 
-print(f"\n   Class distribution in TRAINING set:")
-train_dist = y_train.value_counts()
-print(f"      Class 0: {train_dist[0]} ({train_dist[0]/len(y_train)*100:.2f}%)")
-print(f"      Class 1: {train_dist[1]} ({train_dist[1]/len(y_train)*100:.2f}%)")
+def load_chunks(path=DATA_FILE, chunksize=INGEST_CHUNK_ROWS):
+    print("\n[1] STREAMING DATA...")
+    print("-" * 70)
+    print(f"✅ Reading {path} in chunks of {chunksize:,} rows")
+    return RawChunks(path, chunksize=chunksize)
 
-print(f"\n   Class distribution in TESTING set:")
-test_dist = y_test.value_counts()
-print(f"      Class 0: {test_dist[0]} ({test_dist[0]/len(y_test)*100:.2f}%)")
-print(f"      Class 1: {test_dist[1]} ({test_dist[1]/len(y_test)*100:.2f}%)")
 
 # ============================================
-# 6. SAVE PREPARED DATA
+# 2. FEATURE ENGINEERING
 # ============================================
 
-print("\n" + "="*70)
-print("SAVING PREPARED DATA")
-print("="*70)
-
-# Save train-test splits
-X_train.to_csv('X_train.csv', index=False)
-X_test.to_csv('X_test.csv', index=False)
-y_train.to_csv('y_train.csv', index=False, header=['berisiko'])
-y_test.to_csv('y_test.csv', index=False, header=['berisiko'])
-
-print("✅ Train-test data saved:")
-print("   - X_train.csv")
-print("   - X_test.csv")
-print("   - y_train.csv")
-print("   - y_test.csv")
-
-# Save complete processed dataset (for reference)
-df_clean.to_csv('data_processed_complete.csv', index=False)
-print("   - data_processed_complete.csv")
-
-# Save feature list
-feature_list_df = pd.DataFrame({
-    'feature_name': feature_cols,
-    'feature_index': range(len(feature_cols))
-})
-feature_list_df.to_csv('feature_list.csv', index=False)
-print("   - feature_list.csv")
+def unit_cols(granularity='kabupaten'):
+    """Kolom identitas unit (tanpa tahun) pada df_agg untuk granularity tertentu."""
+    if granularity not in GRANULARITY_LEVELS:
+        raise ValueError(f"granularity harus salah satu dari {list(GRANULARITY_LEVELS)}")
+    return [AREA_COLS[c] for c in GRANULARITY_LEVELS[granularity]]
+
+
+def _as_category(df, cols):
+    # Key grup sebagai categorical: hemat memori & groupby memakai kode integer
+    return df.assign(**{c: df[c].astype('category') for c in cols})
+
+
+def _row_hash(frame):
+    """Hash uint64 per baris (nilai string sama -> hash sama, categorical maupun object)."""
+    if 'tahun' in frame:
+        # Chunk dengan tahun kosong dibaca sebagai float -> samakan ke int sebelum hashing
+        frame = frame.astype({'tahun': 'int64'})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def _partial_aggregate(chunk, keys, count_cols):
+    """Statistik parsial satu chunk: sum, count, max, mean, M2 (untuk std) + pasangan unik.
+
+    Pasangan (grup, kecamatan/desa) unik disimpan sebagai dua array hash uint64
+    (hash grup, hash pasangan), bukan DataFrame kolom object.
+    """
+    group_keys = keys + ['tahun']
+    chunk = _as_category(chunk, keys)
+    grouped = chunk.groupby(group_keys, observed=True)['jumlah_kejadian']
+    part = grouped.agg(['sum', 'count', 'max', 'mean'])
+    part['m2'] = grouped.var(ddof=0) * part['count']
+    part = part.reset_index().astype({c: object for c in keys})
+
+    distinct = {}
+    for col in count_cols:
+        pairs = chunk[list(dict.fromkeys(group_keys + [col]))].dropna()
+        pair_hash, first = np.unique(_row_hash(pairs), return_index=True)
+        distinct[col] = (_row_hash(pairs[group_keys].iloc[first]), pair_hash)
+    return part, distinct
+
+
+def _merge_partials(parts, group_keys):
+    """Gabungkan statistik parsial (rumus paralel Chan untuk varians) -> skema parsial yang sama."""
+    part = pd.concat(parts, ignore_index=True)
+    part['weighted'] = part['mean'].fillna(0) * part['count']
+    merged = part.groupby(group_keys, sort=False).agg(
+        sum=('sum', 'sum'), count=('count', 'sum'), max=('max', 'max'),
+        weighted=('weighted', 'sum'))
+    merged['mean'] = merged.pop('weighted') / merged['count'].where(merged['count'] > 0)
+
+    part = part.join(merged['mean'].rename('merged_mean'), on=group_keys)
+    part['m2'] = part['m2'].fillna(0) + part['count'] * (part['mean'] - part['merged_mean']) ** 2
+    merged['m2'] = part.groupby(group_keys, sort=False)['m2'].sum()
+    return merged.reset_index()
+
+
+def _unique_pairs(pairs):
+    """Gabung daftar (hash grup, hash pasangan) lalu buang pasangan duplikat."""
+    group_hash = np.concatenate([g for g, _ in pairs])
+    pair_hash, first = np.unique(np.concatenate([p for _, p in pairs]), return_index=True)
+    return group_hash[first], pair_hash
+
+
+def fold_chunks(chunks, keys, count_cols):
+    """Lipat chunk satu per satu ke agregat berjalan per unit x tahun.
+
+    Statistik (sum, count, max, mean, M2) disimpan per grup. Jumlah kecamatan/desa unik
+    butuh himpunan pasangan (grup, kecamatan/desa) yang sudah terlihat; pasangan itu
+    disimpan sebagai hash uint64 (16 byte per pasangan unik). Hasil parsial baru
+    digabung (statistik) / dideduplikasi (pasangan) hanya bila ukurannya sudah dua
+    kali lipat sejak penggabungan terakhir, sehingga total kerja tidak tumbuh kuadratik
+    dengan jumlah chunk. Memori statistik sebanding dengan jumlah grup; memori pasangan
+    sebanding dengan jumlah pasangan unik (pada data desa x tahun mendekati jumlah baris
+    mentah, tetapi hanya 16 byte per pasangan).
+    """
+    group_keys = keys + ['tahun']
+    parts, rows, merged_rows = [], 0, 0
+    distinct = {col: [] for col in count_cols}
+    pairs, deduped = {col: 0 for col in count_cols}, {col: 0 for col in count_cols}
+    for chunk in chunks:
+        part, part_distinct = _partial_aggregate(chunk, keys, count_cols)
+        parts.append(part)
+        rows += len(part)
+        if rows > 2 * merged_rows:
+            parts = [_merge_partials(parts, group_keys)]
+            rows = merged_rows = len(parts[0])
+        for col in count_cols:
+            distinct[col].append(part_distinct[col])
+            pairs[col] += len(part_distinct[col][1])
+            if pairs[col] > 2 * deduped[col]:
+                distinct[col] = [_unique_pairs(distinct[col])]
+                pairs[col] = deduped[col] = len(distinct[col][0][1])
+
+    state = _merge_partials(parts, group_keys) if len(parts) > 1 else parts[0]
+    agg = state.set_index(group_keys)
+    agg['std_kasus'] = np.sqrt(agg['m2'] / (agg['count'] - 1).where(agg['count'] > 1))
+    agg = agg.rename(columns={'sum': 'total_kasus', 'mean': 'rata_kasus', 'max': 'max_kasus',
+                              'count': 'count_records'})
+    state_hash = _row_hash(state[group_keys])
+    for col in count_cols:
+        group_hash, _ = _unique_pairs(distinct[col])
+        groups, counts = np.unique(group_hash, return_counts=True)
+        agg[COUNT_COLS[col]] = pd.Series(counts, index=groups).reindex(state_hash).to_numpy()
+    return agg.reset_index()
+
+
+@dt_profile.profiled('aggregation')
+def aggregate_units(df, granularity='kabupaten', chunk_rows=AGG_CHUNK_ROWS):
+    """Agregasi data mentah ke unit (kabupaten/kecamatan/desa) x tahun.
+
+    `df` boleh DataFrame atau iterable chunk DataFrame (mis. `RawChunks`). DataFrame
+    yang lebih besar dari `chunk_rows` juga diagregasi per chunk, sehingga memori kerja
+    groupby dibatasi oleh ukuran chunk, bukan ukuran data mentah.
+    """
+    # [A] AGREGASI PER UNIT & TAHUN
+    print(f"\n[A] Agregating data per {granularity.capitalize()} & Tahun...")
+
+    keys = GRANULARITY_LEVELS[granularity]
+    count_cols = list(COUNT_COLS)
+    names = unit_cols(granularity)
+
+    if isinstance(df, pd.DataFrame) and len(df) <= chunk_rows:
+        df_agg = _as_category(df, keys).groupby(keys + ['tahun'], observed=True).agg({
+            'jumlah_kejadian': ['sum', 'mean', 'max', 'std', 'count'],
+            **{col: 'nunique' for col in count_cols}
+        }).reset_index()
+
+        # Flatten column names
+        df_agg.columns = names + ['tahun', 'total_kasus', 'rata_kasus',
+                                  'max_kasus', 'std_kasus', 'count_records',
+                                  'jumlah_kecamatan', 'jumlah_desa']
+    else:
+        chunks = df
+        if isinstance(df, pd.DataFrame):
+            chunks = (df.iloc[i:i + chunk_rows] for i in range(0, len(df), chunk_rows))
+        df_agg = fold_chunks(chunks, keys, count_cols)
+        df_agg = df_agg.rename(columns=AREA_COLS).sort_values(names + ['tahun'])
+        df_agg = df_agg[names + ['tahun', 'total_kasus', 'rata_kasus', 'max_kasus',
+                                 'std_kasus', 'count_records', 'jumlah_kecamatan',
+                                 'jumlah_desa']].reset_index(drop=True)
+        df_agg = _as_category(df_agg, names)
+
+    # Handle NaN in std
+    df_agg['std_kasus'] = df_agg['std_kasus'].fillna(0)
+
+    print(f"✅ Aggregated shape: {df_agg.shape}")
+    print(f"   Features: {list(df_agg.columns)}")
+    return df_agg
+
+
+def lag_col(lag):
+    return f'kasus_{lag}tahun_lalu'
+
+
+def group_offsets(*keys):
+    """Untuk array key yang sudah terurut: index awal grup tiap baris & posisi di dalam grup."""
+    n = len(keys[0])
+    is_start = np.zeros(n, dtype=bool)
+    is_start[:1] = True
+    for k in keys:
+        is_start[1:] |= k[1:] != k[:-1]
+    starts = np.flatnonzero(is_start)
+    row_start = starts[np.cumsum(is_start) - 1]
+    return row_start, np.arange(n) - row_start
+
+
+def temporal_window_features(values, row_start, pos, lags=TEMPORAL_LAGS,
+                             windows=ROLLING_WINDOWS):
+    """Lag, rolling mean dan rolling max per grup dalam satu pass (tanpa groupby).
+
+    `values` harus sudah terurut per grup lalu waktu; hasil identik dengan
+    groupby().shift(k) dan rolling(window=w, min_periods=1).mean()/max().
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    idx = np.arange(n)
+    features = {}
+
+    shifted = {}
+    for k in sorted(set(lags) | set(range(1, max(windows, default=1)))):
+        out = np.full(n, np.nan)
+        ok = pos >= k
+        out[ok] = values[idx[ok] - k]
+        shifted[k] = out
+    for k in lags:
+        features[lag_col(k)] = shifted[k]
+
+    # Rolling mean dari prefix sum; rolling max dari lag 0..w-1 yang masih dalam grup
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    for w in windows:
+        lo = np.maximum(idx - w + 1, row_start)
+        features[f'rolling_mean_{w}y'] = (csum[idx + 1] - csum[lo]) / (idx + 1 - lo)
+        rmax = values.copy()
+        for k in range(1, w):
+            rmax = np.fmax(rmax, shifted[k])
+        features[f'rolling_max_{w}y'] = rmax
+    return features
+
+
+def add_temporal_features(df_agg, lags=TEMPORAL_LAGS, windows=ROLLING_WINDOWS,
+                          granularity='kabupaten'):
+    # [B] TEMPORAL FEATURES (LAG & TREND)
+    print("\n[B] Creating temporal features...")
+
+    units = unit_cols(granularity)
+    df_agg = df_agg.sort_values(units + ['tahun']).reset_index(drop=True)
+
+    # Satu pass untuk semua lag & rolling window (grup kontigu setelah sort)
+    row_start, pos = group_offsets(*[df_agg[c].to_numpy() for c in units])
+    lags = sorted(set(lags) | {1})
+    features = temporal_window_features(df_agg['total_kasus'].to_numpy(), row_start, pos,
+                                        lags=lags, windows=windows)
+    for col in [lag_col(k) for k in lags]:
+        df_agg[col] = features.pop(col)
+
+    # Trend
+    df_agg['tren'] = df_agg['total_kasus'] - df_agg['kasus_1tahun_lalu']
+
+    # Growth rate (handle division by zero): 0 bila tahun lalu NaN atau 0
+    prev = df_agg['kasus_1tahun_lalu'].to_numpy(dtype=float)
+    total = df_agg['total_kasus'].to_numpy(dtype=float)
+    valid = prev > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df_agg['growth_rate'] = np.where(valid, (total - prev) / prev * 100, 0.0)
+
+    # Rolling statistics
+    for col, values in features.items():
+        df_agg[col] = values
+
+    print("✅ Temporal features created:")
+    print(f"   - {', '.join(lag_col(k) for k in lags)}")
+    print("   - tren, growth_rate")
+    print(f"   - {', '.join(features)}")
+    return df_agg
+
+
+def add_geographic_features(df_agg, granularity='kabupaten'):
+    # [C] GEOGRAPHIC FEATURES
+    print("\n[C] Creating geographic features...")
+
+    # Total historis per unit (all years) = jumlah total_kasus semua tahun
+    df_agg['total_kasus_historis'] = df_agg.groupby(
+        unit_cols(granularity), observed=True)['total_kasus'].transform('sum')
+
+    # Rata-rata kasus per desa
+    df_agg['kasus_per_desa'] = df_agg['total_kasus'] / df_agg['jumlah_desa']
+
+    # Density score (kasus per kecamatan)
+    df_agg['density_score'] = df_agg['total_kasus'] / df_agg['jumlah_kecamatan']
+
+    # Severity indicator (max relative to mean)
+    rata = df_agg['rata_kasus'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df_agg['severity_ratio'] = np.where(
+            rata > 0, df_agg['max_kasus'].to_numpy(dtype=float) / rata, 0.0
+        )
+
+    print("✅ Geographic features created:")
+    print("   - total_kasus_historis")
+    print("   - kasus_per_desa")
+    print("   - density_score")
+    print("   - severity_ratio")
+    return df_agg
+
+
+def encode_kabupaten(df_agg):
+    # [D] CATEGORICAL ENCODING
+    print("\n[D] Encoding categorical features...")
+
+    le = LabelEncoder()
+    df_agg['kabupaten_encoded'] = le.fit_transform(df_agg['kabupaten'])
+
+    # Label encoder mapping
+    kabupaten_mapping = pd.DataFrame({
+        'kabupaten': le.classes_,
+        'encoded_value': range(len(le.classes_))
+    })
+
+    print(f"✅ Encoded {len(le.classes_)} kabupaten")
+    return df_agg, kabupaten_mapping
+
+
+def encode_with_classes(df_agg, classes):
+    """Encoding kabupaten memakai mapping tersimpan (scoring); kabupaten baru -> -1."""
+    codes = pd.Series(range(len(classes)), index=classes)
+    df_agg['kabupaten_encoded'] = (df_agg['kabupaten'].astype(object).map(codes)
+                                   .fillna(-1).astype(int))
+    unknown = df_agg.loc[df_agg['kabupaten_encoded'] < 0, 'kabupaten'].unique()
+    if len(unknown):
+        print(f"⚠️ {len(unknown)} kabupaten tidak ada di mapping training (encoded -1): "
+              f"{', '.join(map(str, unknown[:5]))}")
+    return df_agg
+
+
+def temporal_params(feature_cols):
+    """Lag & rolling window yang dipakai sekumpulan fitur (mis. feature_cols model tersimpan)."""
+    lags, windows = set(TEMPORAL_LAGS), set()
+    for col in feature_cols:
+        if col.startswith('kasus_') and col.endswith('tahun_lalu'):
+            lags.add(int(col[len('kasus_'):-len('tahun_lalu')]))
+        elif col.startswith('rolling_') and col.endswith('y'):
+            windows.add(int(col.rsplit('_', 1)[1][:-1]))
+    return sorted(lags), sorted(windows) or list(ROLLING_WINDOWS)
+
+
+def add_target(df_agg):
+    # [E] CREATE BINARY TARGET
+    print("\n[E] Creating binary target variable...")
+
+    df_agg[TARGET_COL] = (df_agg['total_kasus'] > 0).astype(int)
+
+    target_dist = df_agg[TARGET_COL].value_counts()
+    print(f"\n✅ Binary target created:")
+    print(f"   Class 0 (Tidak Berisiko): {target_dist[0]} ({target_dist[0]/len(df_agg)*100:.2f}%)")
+    print(f"   Class 1 (Berisiko):       {target_dist[1]} ({target_dist[1]/len(df_agg)*100:.2f}%)")
+    print(f"   Imbalance ratio: {target_dist[0]/target_dist[1]:.2f}:1")
+    return df_agg
+
+
+@dt_profile.profiled('feature_engineering')
+def engineer_features(df, lags=TEMPORAL_LAGS, windows=ROLLING_WINDOWS,
+                      granularity='kabupaten'):
+    """Agregasi data mentah ke unit (granularity) x tahun dan bangun semua fitur + target."""
+    print("\n" + "="*70)
+    print("FEATURE ENGINEERING")
+    print("="*70)
+
+    df_agg = aggregate_units(df, granularity)
+    return build_features(df_agg, lags=lags, windows=windows, granularity=granularity)
+
+
+def build_features(df_agg, lags=TEMPORAL_LAGS, windows=ROLLING_WINDOWS,
+                   granularity='kabupaten'):
+    """Fitur temporal + geografis, encoding kabupaten, dan target dari df_agg (unit x tahun)."""
+    df_agg = add_temporal_features(df_agg, lags=lags, windows=windows,
+                                   granularity=granularity)
+    df_agg = add_geographic_features(df_agg, granularity)
+    df_agg, kabupaten_mapping = encode_kabupaten(df_agg)
+    df_agg = add_target(df_agg)
+    return df_agg, kabupaten_mapping
+
 
 # ============================================
-# 7. EXPLORATORY VISUALIZATION
+# 3. HANDLE MISSING VALUES
 # ============================================
 
-print("\n" + "="*70)
-print("CREATING EXPLORATORY VISUALIZATIONS")
-print("="*70)
+def fill_lag_features(df_agg):
+    # Fill NaN in lag features with 0 (tahun pertama tiap unit tidak punya histori)
+    fill_cols = [c for c in df_agg.columns if c.endswith('tahun_lalu')] + ['tren', 'growth_rate']
+    for col in fill_cols:
+        df_agg[col] = df_agg[col].fillna(0)
+    return df_agg
 
-# [A] Feature distributions by class
-print("\n[A] Feature distributions...")
 
-# Select numeric features for visualization
-viz_features = ['total_kasus', 'kasus_1tahun_lalu', 'tren', 'growth_rate',
-                'kasus_per_desa', 'density_score', 'jumlah_desa']
+def handle_missing_values(df_agg):
+    print("\n" + "="*70)
+    print("HANDLING MISSING VALUES")
+    print("="*70)
 
-fig, axes = plt.subplots(3, 3, figsize=(16, 12))
-fig.suptitle('Feature Distributions by Class', fontsize=16, fontweight='bold')
-axes = axes.ravel()
+    print("\nMissing values BEFORE handling:")
+    missing_before = df_agg.isnull().sum()
+    print(missing_before[missing_before > 0])
 
-for idx, feat in enumerate(viz_features):
-    if idx < len(axes):
-        df_clean.boxplot(column=feat, by='berisiko', ax=axes[idx])
-        axes[idx].set_title(f'{feat}')
-        axes[idx].set_xlabel('Berisiko (0=Tidak, 1=Ya)')
-        axes[idx].get_figure().suptitle('')  # Remove auto title
+    df_agg = fill_lag_features(df_agg)
 
-# Hide unused subplots
-for idx in range(len(viz_features), len(axes)):
-    axes[idx].set_visible(False)
+    print("\nMissing values AFTER handling:")
+    missing_after = df_agg.isnull().sum()
+    if missing_after.sum() == 0:
+        print("✅ No missing values!")
+    else:
+        print(missing_after[missing_after > 0])
+    return df_agg
+
+
+# ============================================
+# 4. FEATURE SELECTION
+# ============================================
 
-plt.tight_layout()
-plt.savefig('04_feature_distributions_by_class.png', dpi=300, bbox_inches='tight')
-plt.show()
+def select_features(feature_cols=FEATURE_COLS):
+    print("\n" + "="*70)
+    print("FEATURE SELECTION")
+    print("="*70)
 
-print("✅ Saved: 04_feature_distributions_by_class.png")
+    print(f"\n✅ Selected {len(feature_cols)} features:")
+    for i, feat in enumerate(feature_cols, 1):
+        print(f"   {i:2d}. {feat}")
+    return list(feature_cols)
 
-# [B] Correlation matrix
-print("\n[B] Correlation analysis...")
 
-# Select key numeric features
-corr_features = ['total_kasus', 'kasus_1tahun_lalu', 'kasus_2tahun_lalu', 
+# ============================================
+# 5. DATA SPLITTING
+# ============================================
+
+@dt_profile.profiled('train_test_split')
+def split_data(df_clean, feature_cols, test_size=0.2, random_state=42):
+    # Prepare X and y
+    X = df_clean[feature_cols]
+    y = df_clean[TARGET_COL]
+
+    print(f"\nFeature matrix shape: {X.shape}")
+    print(f"Target vector shape: {y.shape}")
+
+    # Stratified split (maintain class distribution)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y,
+        test_size=test_size,
+        random_state=random_state,
+        stratify=y
+    )
+
+    print(f"\n✅ Data split completed:")
+    print(f"   Training set:   {X_train.shape[0]} samples ({X_train.shape[0]/len(X)*100:.1f}%)")
+    print(f"   Testing set:    {X_test.shape[0]} samples ({X_test.shape[0]/len(X)*100:.1f}%)")
+
+    print(f"\n   Class distribution in TRAINING set:")
+    train_dist = y_train.value_counts()
+    print(f"      Class 0: {train_dist[0]} ({train_dist[0]/len(y_train)*100:.2f}%)")
+    print(f"      Class 1: {train_dist[1]} ({train_dist[1]/len(y_train)*100:.2f}%)")
+
+    print(f"\n   Class distribution in TESTING set:")
+    test_dist = y_test.value_counts()
+    print(f"      Class 0: {test_dist[0]} ({test_dist[0]/len(y_test)*100:.2f}%)")
+    print(f"      Class 1: {test_dist[1]} ({test_dist[1]/len(y_test)*100:.2f}%)")
+
+    return X_train, X_test, y_train, y_test
+
+
+def prepare(df, feature_cols=FEATURE_COLS, test_size=0.2, random_state=42,
+            lags=TEMPORAL_LAGS, windows=ROLLING_WINDOWS, granularity='kabupaten'):
+    """PART 2 dalam memori: DataFrame mentah -> PreparedData (tanpa I/O file)."""
+    df_agg, kabupaten_mapping = engineer_features(df, lags=lags, windows=windows,
+                                                  granularity=granularity)
+    n_raw = len(df) if isinstance(df, pd.DataFrame) else df.n_rows
+    return split_prepared(df_agg, kabupaten_mapping, n_raw, feature_cols=feature_cols,
+                          test_size=test_size, random_state=random_state,
+                          granularity=granularity)
+
+
+def split_prepared(df_agg, kabupaten_mapping, n_raw, feature_cols=FEATURE_COLS,
+                   test_size=0.2, random_state=42, granularity='kabupaten'):
+    """Missing values, feature selection, dan train-test split dari hasil build_features."""
+    df_agg = handle_missing_values(df_agg)
+    feature_cols = select_features(feature_cols)
+
+    print("\n" + "="*70)
+    print("TRAIN-TEST SPLIT")
+    print("="*70)
+
+    # Remove rows with any remaining NaN
+    df_clean = df_agg.dropna()
+    print(f"\nData after dropna: {len(df_clean)} records")
+
+    X_train, X_test, y_train, y_test = split_data(
+        df_clean, feature_cols, test_size=test_size, random_state=random_state
+    )
+
+    return PreparedData(
+        X_train=X_train,
+        X_test=X_test,
+        y_train=y_train,
+        y_test=y_test,
+        data=df_clean,
+        feature_cols=feature_cols,
+        kabupaten_mapping=kabupaten_mapping,
+        n_raw=n_raw,
+        n_aggregated=len(df_agg),
+        granularity=granularity,
+    )
+
+
+def prepare_cached(cache, df=None, path=DATA_FILE, feature_cols=FEATURE_COLS,
+                   test_size=0.2, random_state=42, lags=TEMPORAL_LAGS,
+                   windows=ROLLING_WINDOWS, granularity='kabupaten', chunksize=None):
+    """Seperti `prepare`, tetapi hasilnya di-cache berdasarkan hash data mentah + parameter.
+
+    Tanpa `df`, key dihitung dari isi file `path` dan CSV hanya dibaca saat cache miss
+    (per chunk bila `chunksize` diberikan).
+    """
+    digest = dt_cache.frame_digest(df) if df is not None else dt_cache.file_digest(path)
+    key = dt_cache.make_key('prepare', PREP_CACHE_VERSION, digest, list(feature_cols),
+                            test_size, random_state, list(lags), list(windows),
+                            granularity)
+
+    hit = cache.lookup(key, '.arrow')
+    if hit:
+        print(f"\n✅ Cache hit: prepared data {key[:12]} (feature engineering skipped)")
+        return load_prepared(hit)
+
+    if df is None:
+        df = load_chunks(path, chunksize) if chunksize else load_data(path)
+    prepared = prepare(df, feature_cols=feature_cols, test_size=test_size,
+                       random_state=random_state, lags=lags, windows=windows,
+                       granularity=granularity)
+    prepared.cache_key = key
+    cache.store(key, '.arrow', lambda tmp: save_handoff(prepared, tmp))
+    return prepared
+
+
+# ============================================
+# 6. SAVE PREPARED DATA
+# ============================================
+
+@dt_profile.profiled('save_handoff')
+def save_handoff(prepared, path=HANDOFF_FILE):
+    """Simpan PreparedData ke satu file Arrow IPC (Feather v2, tanpa kompresi).
+
+    Berisi seluruh baris `data` (fitur + target, dtype asli), kolom penanda split
+    dan urutan baris di dalam split, serta feature list + mapping kabupaten di
+    metadata schema. Tanpa kompresi agar bisa di-memory-map saat dibaca.
+    """
+    data = prepared.data.copy()
+
+    # Split indices: 0 = train, 1 = test; posisi menjaga urutan hasil train_test_split
+    data[SPLIT_COL] = np.int8(-1)
+    data.loc[prepared.X_train.index, SPLIT_COL] = 0
+    data.loc[prepared.X_test.index, SPLIT_COL] = 1
+    data[SPLIT_POS_COL] = np.int32(0)
+    data.loc[prepared.X_train.index, SPLIT_POS_COL] = np.arange(len(prepared.X_train), dtype=np.int32)
+    data.loc[prepared.X_test.index, SPLIT_POS_COL] = np.arange(len(prepared.X_test), dtype=np.int32)
+
+    table = pa.Table.from_pandas(data, preserve_index=True)
+    meta = {
+        'feature_cols': list(prepared.feature_cols),
+        'target_col': TARGET_COL,
+        'kabupaten_classes': prepared.kabupaten_mapping['kabupaten'].tolist(),
+        'n_raw': int(prepared.n_raw),
+        'n_aggregated': int(prepared.n_aggregated),
+        'cache_key': prepared.cache_key,
+        'granularity': prepared.granularity,
+    }
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        HANDOFF_META_KEY: json.dumps(meta).encode('utf-8'),
+    })
+
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+@dt_profile.profiled('load_prepared')
+def load_prepared(path=HANDOFF_FILE):
+    """Baca PreparedData dari file handoff Arrow IPC secara memory-mapped."""
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    meta = json.loads(table.schema.metadata[HANDOFF_META_KEY])
+
+    # split_blocks: kolom numerik tanpa null bisa dipakai tanpa copy
+    data = table.to_pandas(split_blocks=True)
+    split = data.pop(SPLIT_COL).to_numpy()
+    split_pos = data.pop(SPLIT_POS_COL).to_numpy()
+
+    feature_cols = meta['feature_cols']
+    target_col = meta['target_col']
+    train = data.iloc[np.flatnonzero(split == 0)[np.argsort(split_pos[split == 0], kind='stable')]]
+    test = data.iloc[np.flatnonzero(split == 1)[np.argsort(split_pos[split == 1], kind='stable')]]
+
+    classes = meta['kabupaten_classes']
+    return PreparedData(
+        X_train=train[feature_cols],
+        X_test=test[feature_cols],
+        y_train=train[target_col],
+        y_test=test[target_col],
+        data=data,
+        feature_cols=feature_cols,
+        kabupaten_mapping=pd.DataFrame({
+            'kabupaten': classes,
+            'encoded_value': range(len(classes))
+        }),
+        n_raw=meta['n_raw'],
+        n_aggregated=meta['n_aggregated'],
+        cache_key=meta.get('cache_key'),
+        granularity=meta.get('granularity', 'kabupaten'),
+    )
+
+
+def export_csv(prepared):
+    """Ekspor opsional dalam format CSV untuk dibaca manusia (tidak dipakai antar tahap)."""
+    # Save train-test splits
+    prepared.X_train.to_csv('X_train.csv', index=False)
+    prepared.X_test.to_csv('X_test.csv', index=False)
+    prepared.y_train.to_csv('y_train.csv', index=False, header=[TARGET_COL])
+    prepared.y_test.to_csv('y_test.csv', index=False, header=[TARGET_COL])
+
+    print("✅ CSV export saved:")
+    print("   - X_train.csv")
+    print("   - X_test.csv")
+    print("   - y_train.csv")
+    print("   - y_test.csv")
+
+    # Save complete processed dataset (for reference)
+    prepared.data.to_csv('data_processed_complete.csv', index=False)
+    print("   - data_processed_complete.csv")
+
+    # Save feature list
+    feature_list_df = pd.DataFrame({
+        'feature_name': prepared.feature_cols,
+        'feature_index': range(len(prepared.feature_cols))
+    })
+    feature_list_df.to_csv('feature_list.csv', index=False)
+    print("   - feature_list.csv")
+
+    # Save label encoder mapping
+    prepared.kabupaten_mapping.to_csv('kabupaten_encoding_mapping.csv', index=False)
+    print("   - kabupaten_encoding_mapping.csv")
+
+
+def save_prepared(prepared, path=HANDOFF_FILE, csv=False):
+    print("\n" + "="*70)
+    print("SAVING PREPARED DATA")
+    print("="*70)
+
+    save_handoff(prepared, path)
+    print(f"✅ Handoff saved: {path}")
+    print("   (features, target, split indices, kabupaten mapping)")
+
+    if csv:
+        export_csv(prepared)
+
+
+# ============================================
+# 7. EXPLORATORY VISUALIZATION
+# ============================================
+
+VIZ_FEATURES = ['total_kasus', 'kasus_1tahun_lalu', 'tren', 'growth_rate',
+                'kasus_per_desa', 'density_score', 'jumlah_desa']
+CORR_FEATURES = ['total_kasus', 'kasus_1tahun_lalu', 'kasus_2tahun_lalu',
                  'tren', 'jumlah_desa', 'kasus_per_desa', 'density_score',
-                 'total_kasus_historis', 'rolling_mean_2y', 'berisiko']
-
-corr_matrix = df_clean[corr_features].corr()
-
-plt.figure(figsize=(12, 10))
-sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='coolwarm', 
-            center=0, square=True, linewidths=1,
-            cbar_kws={'label': 'Correlation Coefficient'})
-plt.title('Feature Correlation Matrix', fontsize=14, fontweight='bold', pad=20)
-plt.tight_layout()
-plt.savefig('05_correlation_matrix.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 05_correlation_matrix.png")
-
-# [C] Class balance visualization
-print("\n[C] Class balance comparison...")
-
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-fig.suptitle('Class Distribution: Train vs Test', fontsize=16, fontweight='bold')
-
-# Training set
-train_counts = y_train.value_counts()
-axes[0].bar(['Tidak Berisiko\n(Class 0)', 'Berisiko\n(Class 1)'], 
-            train_counts.values, color=['lightcoral', 'lightgreen'],
-            edgecolor='black', linewidth=2)
-axes[0].set_ylabel('Count', fontsize=11)
-axes[0].set_title('Training Set', fontsize=13, fontweight='bold')
-axes[0].grid(axis='y', alpha=0.3)
-for i, v in enumerate(train_counts.values):
-    pct = v / len(y_train) * 100
-    axes[0].text(i, v + 2, f'{v}\n({pct:.1f}%)', ha='center', fontweight='bold')
-
-# Testing set
-test_counts = y_test.value_counts()
-axes[1].bar(['Tidak Berisiko\n(Class 0)', 'Berisiko\n(Class 1)'], 
-            test_counts.values, color=['lightcoral', 'lightgreen'],
-            edgecolor='black', linewidth=2)
-axes[1].set_ylabel('Count', fontsize=11)
-axes[1].set_title('Testing Set', fontsize=13, fontweight='bold')
-axes[1].grid(axis='y', alpha=0.3)
-for i, v in enumerate(test_counts.values):
-    pct = v / len(y_test) * 100
-    axes[1].text(i, v + 1, f'{v}\n({pct:.1f}%)', ha='center', fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('06_train_test_class_distribution.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 06_train_test_class_distribution.png")
+                 'total_kasus_historis', 'rolling_mean_2y', TARGET_COL]
+
+
+def render_feature_distributions(box_stats):
+    # [A] Feature distributions by class
+    fig, axes = plt.subplots(3, 3, figsize=(16, 12))
+    fig.suptitle('Feature Distributions by Class', fontsize=16, fontweight='bold')
+    axes = axes.ravel()
+
+    for idx, (feat, stats) in enumerate(box_stats.items()):
+        if idx < len(axes):
+            axes[idx].bxp(stats)
+            axes[idx].set_xticklabels([s['label'] for s in stats])
+            axes[idx].set_title(f'{feat}')
+            axes[idx].set_xlabel('Berisiko (0=Tidak, 1=Ya)')
+
+    # Hide unused subplots
+    for idx in range(len(box_stats), len(axes)):
+        axes[idx].set_visible(False)
+
+    plt.tight_layout()
+
+
+def render_correlation_matrix(corr_matrix):
+    # [B] Correlation matrix
+    plt.figure(figsize=(12, 10))
+    sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='coolwarm',
+                center=0, square=True, linewidths=1,
+                cbar_kws={'label': 'Correlation Coefficient'})
+    plt.title('Feature Correlation Matrix', fontsize=14, fontweight='bold', pad=20)
+    plt.tight_layout()
+
+
+def render_class_balance(train_counts, test_counts, n_train, n_test):
+    # [C] Class balance visualization
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    fig.suptitle('Class Distribution: Train vs Test', fontsize=16, fontweight='bold')
+
+    # Training set
+    axes[0].bar(['Tidak Berisiko\n(Class 0)', 'Berisiko\n(Class 1)'],
+                train_counts.values, color=['lightcoral', 'lightgreen'],
+                edgecolor='black', linewidth=2)
+    axes[0].set_ylabel('Count', fontsize=11)
+    axes[0].set_title('Training Set', fontsize=13, fontweight='bold')
+    axes[0].grid(axis='y', alpha=0.3)
+    for i, v in enumerate(train_counts.values):
+        pct = v / n_train * 100
+        axes[0].text(i, v + 2, f'{v}\n({pct:.1f}%)', ha='center', fontweight='bold')
+
+    # Testing set
+    axes[1].bar(['Tidak Berisiko\n(Class 0)', 'Berisiko\n(Class 1)'],
+                test_counts.values, color=['lightcoral', 'lightgreen'],
+                edgecolor='black', linewidth=2)
+    axes[1].set_ylabel('Count', fontsize=11)
+    axes[1].set_title('Testing Set', fontsize=13, fontweight='bold')
+    axes[1].grid(axis='y', alpha=0.3)
+    for i, v in enumerate(test_counts.values):
+        pct = v / n_test * 100
+        axes[1].text(i, v + 1, f'{v}\n({pct:.1f}%)', ha='center', fontweight='bold')
+
+    plt.tight_layout()
+
+
+def class_box_stats(df_clean, feat):
+    """Statistik boxplot `feat` per kelas target (label = nilai kelas)."""
+    stats = []
+    for label, values in df_clean.groupby(TARGET_COL)[feat]:
+        stats.extend(cbook.boxplot_stats(values.dropna().to_numpy(), labels=[str(label)]))
+    return stats
+
+
+def prepared_figures(prepared):
+    """Ringkasan per figure: statistik boxplot, matriks korelasi, jumlah kelas."""
+    df_clean = prepared.data
+    return [
+        dt_report.Figure('04_feature_distributions_by_class.png', render_feature_distributions,
+                         dict(box_stats={feat: class_box_stats(df_clean, feat)
+                                         for feat in VIZ_FEATURES})),
+        dt_report.Figure('05_correlation_matrix.png', render_correlation_matrix,
+                         dict(corr_matrix=df_clean[CORR_FEATURES].corr())),
+        dt_report.Figure('06_train_test_class_distribution.png', render_class_balance, dict(
+            train_counts=prepared.y_train.value_counts(),
+            test_counts=prepared.y_test.value_counts(),
+            n_train=len(prepared.y_train),
+            n_test=len(prepared.y_test),
+        )),
+    ]
+
+
+@dt_profile.profiled('plot_prepared')
+def plot_prepared(prepared):
+    print("\n" + "="*70)
+    print("CREATING EXPLORATORY VISUALIZATIONS")
+    print("="*70)
+
+    dt_report.render_figures(prepared_figures(prepared))
+
 
 # ============================================
 # 8. SUMMARY REPORT
 # ============================================
 
-print("\n" + "="*70)
-print("DATA PREPARATION SUMMARY")
-print("="*70)
+def build_summary(prepared):
+    df_clean = prepared.data
+    X_train, X_test = prepared.X_train, prepared.X_test
+    y_train, y_test = prepared.y_train, prepared.y_test
+    feature_cols = prepared.feature_cols
+
+    target_dist = df_clean[TARGET_COL].value_counts()
+    train_dist = y_train.value_counts()
+    test_dist = y_test.value_counts()
 
-summary = f"""
+    return f"""
 DATA PREPARATION SUMMARY
 {'='*70}
 
 ORIGINAL DATA:
-- Total records: {len(df):,}
-- After aggregation: {len(df_agg):,}
+- Total records: {prepared.n_raw:,}
+- After aggregation: {prepared.n_aggregated:,} ({prepared.granularity} x tahun)
 - After cleaning: {len(df_clean):,}
 
 FEATURE ENGINEERING:
@@ -405,7 +926,7 @@ DATA SPLIT:
 - Training: {len(X_train)} samples (80%)
   • Class 0: {train_dist[0]} ({train_dist[0]/len(y_train)*100:.2f}%)
   • Class 1: {train_dist[1]} ({train_dist[1]/len(y_train)*100:.2f}%)
-  
+
 - Testing: {len(X_test)} samples (20%)
   • Class 0: {test_dist[0]} ({test_dist[0]/len(y_test)*100:.2f}%)
   • Class 1: {test_dist[1]} ({test_dist[1]/len(y_test)*100:.2f}%)
@@ -425,11 +946,9 @@ KEY FEATURES (Expected High Importance):
 - kabupaten_encoded (location)
 
 FILES GENERATED:
-✅ X_train.csv, X_test.csv
-✅ y_train.csv, y_test.csv
-✅ data_processed_complete.csv
-✅ feature_list.csv
-✅ kabupaten_encoding_mapping.csv
+✅ prepared_data.arrow (features, target, split indices, kabupaten mapping)
+✅ Optional (--export-csv): X_train.csv, X_test.csv, y_train.csv, y_test.csv,
+   data_processed_complete.csv, feature_list.csv, kabupaten_encoding_mapping.csv
 ✅ 04_feature_distributions_by_class.png
 ✅ 05_correlation_matrix.png
 ✅ 06_train_test_class_distribution.png
@@ -445,15 +964,79 @@ NEXT STEP:
 Run 03_decision_tree_modeling.py to build and compare multiple Decision Tree models.
 """
 
-print(summary)
-
-# Save summary to file
-with open('01_data_preparation_summary.txt', 'w', encoding='utf-8') as f:
-    f.write(summary)
-
-print("\n✅ Summary saved: 01_data_preparation_summary.txt")
 
-print("\n" + "="*70)
-print("🎉 DATA PREPARATION COMPLETED!")
-print("="*70)
-print("\nNext Step: Run 03_decision_tree_modeling.py")
+def write_summary(prepared):
+    print("\n" + "="*70)
+    print("DATA PREPARATION SUMMARY")
+    print("="*70)
+
+    summary = build_summary(prepared)
+    print(summary)
+
+    # Save summary to file
+    with open('01_data_preparation_summary.txt', 'w', encoding='utf-8') as f:
+        f.write(summary)
+
+    print("\n✅ Summary saved: 01_data_preparation_summary.txt")
+
+
+def run(df=None, path=DATA_FILE, export_csv=False, cache=None, granularity='kabupaten',
+        chunksize=None, plots=None):
+    """PART 2 end-to-end. `df` dapat diberikan langsung agar tidak membaca ulang CSV.
+
+    Dengan `chunksize`, CSV dibaca streaming per chunk dan langsung diagregasi.
+    `plots=False` (atau DT_PLOTS=0) melewati semua figure.
+    """
+    plots = dt_plots.plots_enabled(plots)
+    if not plots:
+        dt_plots.headless()
+
+    print("="*70)
+    print("DATA PREPARATION FOR DECISION TREE CLASSIFICATION")
+    print("="*70)
+
+    if cache is not None:
+        prepared = prepare_cached(cache, df=df, path=path, granularity=granularity,
+                                  chunksize=chunksize)
+    else:
+        if df is None:
+            df = load_chunks(path, chunksize) if chunksize else load_data(path)
+        prepared = prepare(df, granularity=granularity)
+    save_prepared(prepared, csv=export_csv)
+    if plots:
+        plot_prepared(prepared)
+    else:
+        dt_plots.skip_notice('PART 2')
+    write_summary(prepared)
+
+    print("\n" + "="*70)
+    print("🎉 DATA PREPARATION COMPLETED!")
+    print("="*70)
+    return prepared
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='PART 2: data preparation')
+    parser.add_argument('--data', default=DATA_FILE,
+                        help='CSV mentah kejadian per desa/kelurahan')
+    parser.add_argument('--export-csv', action='store_true',
+                        help='ekspor juga X/y train-test dalam format CSV')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='selalu hitung ulang feature engineering')
+    parser.add_argument('--granularity', choices=list(GRANULARITY_LEVELS),
+                        default='kabupaten', help='unit wilayah per baris model')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='baca CSV per chunk N baris (streaming, hemat memori)')
+    dt_plots.add_plot_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    # Lewat modul `dt_data_preparation` (bukan __main__) agar PreparedData di cache bisa dibaca modul lain
+    import dt_data_preparation
+    args = dt_data_preparation.parse_args()
+    dt_data_preparation.run(path=args.data, export_csv=args.export_csv,
+                            cache=None if args.no_cache else dt_cache.default_cache(),
+                            granularity=args.granularity, chunksize=args.chunksize,
+                            plots=args.plots)
+    print("\nNext Step: Run 03_decision_tree_modeling.py")
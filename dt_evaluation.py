@@ -5,367 +5,633 @@ PART 4: MODEL EVALUATION & BUSINESS INSIGHTS
 Deep dive analysis dan business recommendations
 """
 
+import argparse
+import os
+from dataclasses import dataclass
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.metrics import confusion_matrix, classification_report
+from sklearn.metrics import brier_score_loss, confusion_matrix, classification_report
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*70)
-print("MODEL EVALUATION & BUSINESS INSIGHTS")
-print("="*70)
+import dt_calibration
+import dt_data_preparation
+import dt_modeling
+import dt_plots
+import dt_profile
+import dt_report
+import dt_threshold
+
+TEMPORAL_FEATURES = ['tahun', 'kasus_1tahun_lalu', 'kasus_2tahun_lalu',
+                     'tren', 'growth_rate', 'rolling_mean_2y', 'rolling_max_2y']
+GEOGRAPHIC_FEATURES = ['kabupaten_encoded', 'jumlah_kecamatan', 'jumlah_desa',
+                       'kasus_per_desa', 'density_score', 'total_kasus_historis']
+
+
+@dataclass
+class Report:
+    """Output PART 4: hasil analisis evaluasi untuk laporan & visualisasi."""
+    best_model_name: str
+    best_metrics: pd.Series
+    cm: np.ndarray
+    predictions: pd.DataFrame
+    feature_imp: pd.DataFrame
+    top10_features: pd.DataFrame
+    n_features_80pct: int
+    temporal_imp: float
+    geographic_imp: float
+    analysis_df: pd.DataFrame
+    false_positives: pd.DataFrame
+    false_negatives: pd.DataFrame
+    risk_by_kabupaten: pd.DataFrame
+    threshold: dt_threshold.ThresholdChoice   # cutoff OOF, metrik pada test set
+    reliability: pd.DataFrame
+    brier: dict
+    data_complete: pd.DataFrame
+    kabupaten_mapping: pd.DataFrame
+    n_train: int
+    n_test: int
+    n_features: int
+
+    @property
+    def confusion(self):
+        """(tn, fp, fn, tp)"""
+        return tuple(int(v) for v in self.cm.ravel())
+
+    @property
+    def very_high(self):
+        return self.risk_by_kabupaten[self.risk_by_kabupaten['risk_level'] == 'Very High']
+
+    @property
+    def high(self):
+        return self.risk_by_kabupaten[self.risk_by_kabupaten['risk_level'] == 'High']
+
+    @property
+    def high_risk(self):
+        # High-risk kabupaten
+        return self.risk_by_kabupaten[self.risk_by_kabupaten['risk_level'].isin(['High', 'Very High'])]
+
 
 # ============================================
 # 1. LOAD RESULTS
 # ============================================
 
-print("\n[1] LOADING RESULTS...")
-print("-" * 70)
-
-# Load comparison results
-comparison = pd.read_csv('model_comparison_metrics.csv')
-predictions = pd.read_csv('predictions_best_model.csv')
-feature_imp = pd.read_csv('feature_importance.csv')
-data_complete = pd.read_csv('data_processed_complete.csv')
-kabupaten_mapping = pd.read_csv('kabupaten_encoding_mapping.csv')
-X_train = pd.read_csv('X_train.csv')
-X_test = pd.read_csv('X_test.csv')
-y_train = pd.read_csv('y_train.csv')
-y_test = pd.read_csv('y_test.csv')
-
-# Get best model info
-best_model_idx = comparison['F1-Score'].idxmax()
-best_model_name = comparison.loc[best_model_idx, 'Model']
-best_metrics = comparison.iloc[best_model_idx]
-
-print(f"✅ Best Model: {best_model_name}")
-print(f"   F1-Score: {best_metrics['F1-Score']:.4f}")
-print(f"   ROC-AUC:  {best_metrics['ROC-AUC']:.4f}")
+def load_results():
+    """Baca output PART 3 dan handoff PART 2 (mode script terpisah).
+
+    Bila model bundle tersedia, prediksi dihitung ulang dari model tersimpan;
+    selain itu dibaca dari predictions_best_model.csv.
+    """
+    print("\n[1] LOADING RESULTS...")
+    print("-" * 70)
+
+    # Load comparison results
+    comparison = pd.read_csv('model_comparison_metrics.csv')
+    # Model tanpa importance -> PART 4 melewati analisis feature importance
+    feature_imp = (pd.read_csv('feature_importance.csv')
+                   if os.path.exists('feature_importance.csv') else None)
+    prepared = dt_data_preparation.load_prepared()
+
+    threshold = None
+    if os.path.exists(dt_modeling.MODEL_FILE):
+        saved = dt_modeling.load_model()
+        threshold = getattr(saved, 'threshold', None)
+        print(f"✅ Scoring test set with saved model: {saved.name}")
+        predictions = pd.DataFrame({
+            'actual': np.asarray(prepared.y_test),
+            'predicted': saved.predict(prepared.X_test),
+            'probability_class_1': saved.predict_proba(prepared.X_test),
+        })
+        if saved.calibrator is not None:
+            predictions['calibrated_probability'] = saved.calibrate(
+                predictions['probability_class_1'].to_numpy())
+    else:
+        predictions = pd.read_csv('predictions_best_model.csv')
+    return comparison, predictions, feature_imp, prepared, threshold
+
 
 # ============================================
 # 2. CONFUSION MATRIX DEEP DIVE
 # ============================================
 
-print("\n" + "="*70)
-print("CONFUSION MATRIX ANALYSIS")
-print("="*70)
-
-cm = confusion_matrix(predictions['actual'], predictions['predicted'])
-
-# Extract values
-tn, fp, fn, tp = cm.ravel()
-
-print(f"\nConfusion Matrix Breakdown:")
-print(f"{'='*50}")
-print(f"True Negatives (TN):  {tn:4d} - Correctly predicted 'Tidak Berisiko'")
-print(f"False Positives (FP): {fp:4d} - Incorrectly predicted 'Berisiko'")
-print(f"False Negatives (FN): {fn:4d} - Missed actual 'Berisiko' cases")
-print(f"True Positives (TP):  {tp:4d} - Correctly predicted 'Berisiko'")
-
-# Calculate additional metrics
-total = tn + fp + fn + tp
-accuracy = (tn + tp) / total
-precision = tp / (tp + fp) if (tp + fp) > 0 else 0
-recall = tp / (tp + fn) if (tp + fn) > 0 else 0
-specificity = tn / (tn + fp) if (tn + fp) > 0 else 0
-false_positive_rate = fp / (fp + tn) if (fp + tn) > 0 else 0
-
-print(f"\n{'='*50}")
-print(f"Accuracy:              {accuracy:.4f} ({accuracy*100:.2f}%)")
-print(f"Precision (PPV):       {precision:.4f}")
-print(f"Recall (Sensitivity):  {recall:.4f}")
-print(f"Specificity:           {specificity:.4f}")
-print(f"False Positive Rate:   {false_positive_rate:.4f}")
-
-print(f"\n{'INTERPRETASI:'}")
-print(f"{'='*50}")
-
-if precision >= 0.70:
-    print(f"✅ Precision BAIK ({precision:.2%})")
-    print(f"   → Prediksi 'Berisiko' cukup akurat")
-    print(f"   → {fp} false alarms dari {fp+tp} prediksi positif")
-elif precision >= 0.60:
-    print(f"⚠️ Precision CUKUP ({precision:.2%})")
-    print(f"   → Masih ada {fp} false alarms")
-else:
-    print(f"❌ Precision RENDAH ({precision:.2%})")
-    print(f"   → Terlalu banyak false alarms ({fp})")
-
-if recall >= 0.70:
-    print(f"\n✅ Recall BAIK ({recall:.2%})")
-    print(f"   → Model dapat mendeteksi mayoritas kasus berisiko")
-    print(f"   → Hanya {fn} kasus yang terlewat")
-elif recall >= 0.50:
-    print(f"\n⚠️ Recall CUKUP ({recall:.2%})")
-    print(f"   → Model mendeteksi sebagian kasus berisiko")
-    print(f"   → {fn} kasus masih terlewat (perlu perbaikan)")
-else:
-    print(f"\n❌ Recall RENDAH ({recall:.2%})")
-    print(f"   → Model melewatkan banyak kasus ({fn})")
-
-# Business Impact Analysis
-print(f"\n{'BUSINESS IMPACT:'}")
-print(f"{'='*50}")
-print(f"False Negatives (FN = {fn}):")
-print(f"  → Wilayah berisiko yang TIDAK terdeteksi")
-print(f"  → CRITICAL: Missed opportunity untuk intervensi")
-print(f"  → Rekomendasi: Perlu monitoring tambahan")
-
-print(f"\nFalse Positives (FP = {fp}):")
-print(f"  → Wilayah yang salah diprediksi berisiko")
-print(f"  → Impact: Resource allocation tidak efisien")
-print(f"  → Rekomendasi: Verifikasi manual sebelum intervensi")
+def analyze_confusion_matrix(predictions):
+    print("\n" + "="*70)
+    print("CONFUSION MATRIX ANALYSIS")
+    print("="*70)
+
+    cm = confusion_matrix(predictions['actual'], predictions['predicted'])
+
+    # Extract values
+    tn, fp, fn, tp = cm.ravel()
+
+    print(f"\nConfusion Matrix Breakdown:")
+    print(f"{'='*50}")
+    print(f"True Negatives (TN):  {tn:4d} - Correctly predicted 'Tidak Berisiko'")
+    print(f"False Positives (FP): {fp:4d} - Incorrectly predicted 'Berisiko'")
+    print(f"False Negatives (FN): {fn:4d} - Missed actual 'Berisiko' cases")
+    print(f"True Positives (TP):  {tp:4d} - Correctly predicted 'Berisiko'")
+
+    # Calculate additional metrics
+    total = tn + fp + fn + tp
+    accuracy = (tn + tp) / total
+    precision = tp / (tp + fp) if (tp + fp) > 0 else 0
+    recall = tp / (tp + fn) if (tp + fn) > 0 else 0
+    specificity = tn / (tn + fp) if (tn + fp) > 0 else 0
+    false_positive_rate = fp / (fp + tn) if (fp + tn) > 0 else 0
+
+    print(f"\n{'='*50}")
+    print(f"Accuracy:              {accuracy:.4f} ({accuracy*100:.2f}%)")
+    print(f"Precision (PPV):       {precision:.4f}")
+    print(f"Recall (Sensitivity):  {recall:.4f}")
+    print(f"Specificity:           {specificity:.4f}")
+    print(f"False Positive Rate:   {false_positive_rate:.4f}")
+
+    print(f"\n{'INTERPRETASI:'}")
+    print(f"{'='*50}")
+
+    if precision >= 0.70:
+        print(f"✅ Precision BAIK ({precision:.2%})")
+        print(f"   → Prediksi 'Berisiko' cukup akurat")
+        print(f"   → {fp} false alarms dari {fp+tp} prediksi positif")
+    elif precision >= 0.60:
+        print(f"⚠️ Precision CUKUP ({precision:.2%})")
+        print(f"   → Masih ada {fp} false alarms")
+    else:
+        print(f"❌ Precision RENDAH ({precision:.2%})")
+        print(f"   → Terlalu banyak false alarms ({fp})")
+
+    if recall >= 0.70:
+        print(f"\n✅ Recall BAIK ({recall:.2%})")
+        print(f"   → Model dapat mendeteksi mayoritas kasus berisiko")
+        print(f"   → Hanya {fn} kasus yang terlewat")
+    elif recall >= 0.50:
+        print(f"\n⚠️ Recall CUKUP ({recall:.2%})")
+        print(f"   → Model mendeteksi sebagian kasus berisiko")
+        print(f"   → {fn} kasus masih terlewat (perlu perbaikan)")
+    else:
+        print(f"\n❌ Recall RENDAH ({recall:.2%})")
+        print(f"   → Model melewatkan banyak kasus ({fn})")
+
+    # Business Impact Analysis
+    print(f"\n{'BUSINESS IMPACT:'}")
+    print(f"{'='*50}")
+    print(f"False Negatives (FN = {fn}):")
+    print(f"  → Wilayah berisiko yang TIDAK terdeteksi")
+    print(f"  → CRITICAL: Missed opportunity untuk intervensi")
+    print(f"  → Rekomendasi: Perlu monitoring tambahan")
+
+    print(f"\nFalse Positives (FP = {fp}):")
+    print(f"  → Wilayah yang salah diprediksi berisiko")
+    print(f"  → Impact: Resource allocation tidak efisien")
+    print(f"  → Rekomendasi: Verifikasi manual sebelum intervensi")
+
+    return cm
+
 
 # ============================================
 # 3. FEATURE IMPORTANCE ANALYSIS
 # ============================================
 
-print("\n" + "="*70)
-print("FEATURE IMPORTANCE ANALYSIS")
-print("="*70)
+def analyze_feature_importance(feature_imp):
+    print("\n" + "="*70)
+    print("FEATURE IMPORTANCE ANALYSIS")
+    print("="*70)
 
-top10_features = feature_imp.head(10)
+    if feature_imp is None or feature_imp.empty:
+        print("\n⏭️ Feature importance tidak tersedia untuk model ini, analisis dilewati")
+        return pd.DataFrame(columns=['feature', 'importance']), 0, np.nan, np.nan
 
-print(f"\nTop 10 Most Important Features:")
-print(f"{'='*50}")
-for i, row in top10_features.iterrows():
-    print(f"{i+1:2d}. {row['feature']:25s} : {row['importance']:.4f}")
+    top10_features = feature_imp.head(10)
 
-# Cumulative importance
-cumsum = feature_imp['importance'].cumsum()
-n_features_80pct = (cumsum <= 0.80).sum() + 1
+    print(f"\nTop 10 Most Important Features:")
+    print(f"{'='*50}")
+    for i, row in top10_features.iterrows():
+        print(f"{i+1:2d}. {row['feature']:25s} : {row['importance']:.4f}")
 
-print(f"\n{'INSIGHT:'}")
-print(f"{'='*50}")
-print(f"✅ Top {n_features_80pct} features explain ~80% of model decisions")
-print(f"✅ Feature engineering berhasil menciptakan fitur prediktif")
+    # Cumulative importance
+    cumsum = feature_imp['importance'].cumsum()
+    n_features_80pct = (cumsum <= 0.80).sum() + 1
 
-# Categorize features
-temporal_features = ['tahun', 'kasus_1tahun_lalu', 'kasus_2tahun_lalu', 
-                     'tren', 'growth_rate', 'rolling_mean_2y', 'rolling_max_2y']
-geographic_features = ['kabupaten_encoded', 'jumlah_kecamatan', 'jumlah_desa', 
-                       'kasus_per_desa', 'density_score', 'total_kasus_historis']
+    print(f"\n{'INSIGHT:'}")
+    print(f"{'='*50}")
+    print(f"✅ Top {n_features_80pct} features explain ~80% of model decisions")
+    print(f"✅ Feature engineering berhasil menciptakan fitur prediktif")
 
-temporal_imp = feature_imp[feature_imp['feature'].isin(temporal_features)]['importance'].sum()
-geographic_imp = feature_imp[feature_imp['feature'].isin(geographic_features)]['importance'].sum()
+    # Categorize features
+    temporal_imp = feature_imp[feature_imp['feature'].isin(TEMPORAL_FEATURES)]['importance'].sum()
+    geographic_imp = feature_imp[feature_imp['feature'].isin(GEOGRAPHIC_FEATURES)]['importance'].sum()
 
-print(f"\nFeature Category Importance:")
-print(f"  Temporal features:   {temporal_imp:.2%}")
-print(f"  Geographic features: {geographic_imp:.2%}")
+    print(f"\nFeature Category Importance:")
+    print(f"  Temporal features:   {temporal_imp:.2%}")
+    print(f"  Geographic features: {geographic_imp:.2%}")
 
-# ============================================
-# 4. PREDICTION ANALYSIS
-# ============================================
+    return top10_features, n_features_80pct, temporal_imp, geographic_imp
 
-print("\n" + "="*70)
-print("PREDICTION ANALYSIS")
-print("="*70)
-
-# Merge predictions with original data
-analysis_df = pd.concat([X_test.reset_index(drop=True), 
-                         y_test.reset_index(drop=True),
-                         predictions.reset_index(drop=True)], axis=1)
-
-# Add kabupaten names
-analysis_df['kabupaten'] = analysis_df['kabupaten_encoded'].map(
-    dict(zip(kabupaten_mapping['encoded_value'], kabupaten_mapping['kabupaten']))
-)
-
-# Analyze errors
-false_positives = analysis_df[
-    (analysis_df['actual'] == 0) & (analysis_df['predicted'] == 1)
-]
-false_negatives = analysis_df[
-    (analysis_df['actual'] == 1) & (analysis_df['predicted'] == 0)
-]
-
-print(f"\n[FALSE POSITIVES - Salah prediksi BERISIKO]")
-print(f"{'='*50}")
-print(f"Total: {len(false_positives)} wilayah")
-if len(false_positives) > 0:
-    print(f"\nWilayah yang paling sering salah prediksi:")
-    fp_kabupaten = false_positives['kabupaten'].value_counts().head(5)
-    for kab, count in fp_kabupaten.items():
-        print(f"  - {kab}: {count} kali")
-    
-    print(f"\nKarakteristik False Positives:")
-    print(f"  Rata-rata kasus_1tahun_lalu: {false_positives['kasus_1tahun_lalu'].mean():.2f}")
-    print(f"  Rata-rata probability:        {false_positives['probability_class_1'].mean():.2%}")
-
-print(f"\n[FALSE NEGATIVES - Terlewat deteksi BERISIKO]")
-print(f"{'='*50}")
-print(f"Total: {len(false_negatives)} wilayah")
-if len(false_negatives) > 0:
-    print(f"\n⚠️ CRITICAL: Wilayah berisiko yang TIDAK terdeteksi:")
-    fn_kabupaten = false_negatives['kabupaten'].value_counts().head(5)
-    for kab, count in fn_kabupaten.items():
-        print(f"  - {kab}: {count} kali")
-    
-    print(f"\nKarakteristik False Negatives:")
-    print(f"  Rata-rata kasus_1tahun_lalu: {false_negatives['kasus_1tahun_lalu'].mean():.2f}")
-    print(f"  Rata-rata probability:        {false_negatives['probability_class_1'].mean():.2%}")
-    
-    print(f"\n💡 INSIGHT:")
-    print(f"   Model mungkin melewatkan wilayah dengan:")
-    print(f"   - Historical cases rendah tapi suddenly spike")
-    print(f"   - New emerging risk areas")
 
 # ============================================
-# 5. GEOGRAPHIC RISK MAPPING
+# 4. PREDICTION ANALYSIS
 # ============================================
 
-print("\n" + "="*70)
-print("GEOGRAPHIC RISK MAPPING")
-print("="*70)
+def analyze_predictions(X_test, y_test, predictions, kabupaten_mapping):
+    print("\n" + "="*70)
+    print("PREDICTION ANALYSIS")
+    print("="*70)
 
-# Calculate risk score per kabupaten
-risk_by_kabupaten = analysis_df.groupby('kabupaten').agg({
-    'predicted': 'sum',  # Total prediksi berisiko
-    'probability_class_1': 'mean',  # Rata-rata probability
-    'actual': 'sum'  # Actual cases
-}).reset_index()
+    # Merge predictions with original data
+    analysis_df = pd.concat([X_test.reset_index(drop=True),
+                             y_test.reset_index(drop=True),
+                             predictions.reset_index(drop=True)], axis=1)
 
-risk_by_kabupaten.columns = ['kabupaten', 'predicted_risk_count', 
-                              'avg_risk_probability', 'actual_risk_count']
-risk_by_kabupaten['risk_score'] = (
-    risk_by_kabupaten['avg_risk_probability'] * 100
-).round(2)
+    # Add kabupaten names
+    analysis_df['kabupaten'] = analysis_df['kabupaten_encoded'].map(
+        dict(zip(kabupaten_mapping['encoded_value'], kabupaten_mapping['kabupaten']))
+    )
+
+    # Analyze errors
+    false_positives = analysis_df[
+        (analysis_df['actual'] == 0) & (analysis_df['predicted'] == 1)
+    ]
+    false_negatives = analysis_df[
+        (analysis_df['actual'] == 1) & (analysis_df['predicted'] == 0)
+    ]
 
-risk_by_kabupaten = risk_by_kabupaten.sort_values('risk_score', ascending=False)
+    print(f"\n[FALSE POSITIVES - Salah prediksi BERISIKO]")
+    print(f"{'='*50}")
+    print(f"Total: {len(false_positives)} wilayah")
+    if len(false_positives) > 0:
+        print(f"\nWilayah yang paling sering salah prediksi:")
+        fp_kabupaten = false_positives['kabupaten'].value_counts().head(5)
+        for kab, count in fp_kabupaten.items():
+            print(f"  - {kab}: {count} kali")
+
+        print(f"\nKarakteristik False Positives:")
+        print(f"  Rata-rata kasus_1tahun_lalu: {false_positives['kasus_1tahun_lalu'].mean():.2f}")
+        print(f"  Rata-rata probability:        {false_positives['probability_class_1'].mean():.2%}")
+
+    print(f"\n[FALSE NEGATIVES - Terlewat deteksi BERISIKO]")
+    print(f"{'='*50}")
+    print(f"Total: {len(false_negatives)} wilayah")
+    if len(false_negatives) > 0:
+        print(f"\n⚠️ CRITICAL: Wilayah berisiko yang TIDAK terdeteksi:")
+        fn_kabupaten = false_negatives['kabupaten'].value_counts().head(5)
+        for kab, count in fn_kabupaten.items():
+            print(f"  - {kab}: {count} kali")
+
+        print(f"\nKarakteristik False Negatives:")
+        print(f"  Rata-rata kasus_1tahun_lalu: {false_negatives['kasus_1tahun_lalu'].mean():.2f}")
+        print(f"  Rata-rata probability:        {false_negatives['probability_class_1'].mean():.2%}")
+
+        print(f"\n💡 INSIGHT:")
+        print(f"   Model mungkin melewatkan wilayah dengan:")
+        print(f"   - Historical cases rendah tapi suddenly spike")
+        print(f"   - New emerging risk areas")
+
+    return analysis_df, false_positives, false_negatives
+
+
+def analyze_threshold(predictions, threshold=None):
+    """Terapkan cutoff OOF dari PART 3 (tidak dipilih ulang) ke probabilitas test set."""
+    print("\n" + "="*70)
+    print("DECISION THRESHOLD (TEST SET)")
+    print("="*70)
+
+    if threshold is None:
+        threshold = 0.5
+        print("\n⚠️ Model tanpa cutoff OOF (model lama) - memakai cutoff default 0.5")
+    choice = dt_threshold.evaluate_threshold(predictions['actual'],
+                                             predictions['probability_class_1'], threshold)
+
+    print(f"Criteria: Precision > {dt_threshold.MIN_PRECISION:.0%}, "
+          f"Recall > {dt_threshold.MIN_RECALL:.0%} "
+          f"(cost FN={dt_threshold.FN_COST:g}, FP={dt_threshold.FP_COST:g})")
+    status = "✅ memenuhi kriteria" if choice.meets_criteria else "⚠️ tidak memenuhi kriteria pada test set"
+    print(f"\nThreshold (dipilih pada OOF): {choice.threshold:.4f} ({status})")
+    print(f"  Precision: {choice.precision:.4f}")
+    print(f"  Recall:    {choice.recall:.4f}")
+    print(f"  F1-Score:  {choice.f1:.4f}")
+    print(f"  Cost:      {choice.cost:g}")
+
+    return choice
+
+
+def analyze_calibration(predictions):
+    """Brier score dan reliability curve (test set) sebelum/sesudah kalibrasi OOF."""
+    print("\n" + "="*70)
+    print("PROBABILITY CALIBRATION")
+    print("="*70)
+
+    columns = {'raw': 'probability_class_1'}
+    if 'calibrated_probability' in predictions:
+        columns['calibrated'] = 'calibrated_probability'
+    else:
+        print("\n⚠️ Tidak ada kalibrator (model lama) - hanya probabilitas mentah")
+
+    brier = {}
+    tables = []
+    for kind, col in columns.items():
+        brier[kind] = brier_score_loss(predictions['actual'], predictions[col])
+        tables.append(dt_calibration.reliability_table(predictions['actual'], predictions[col])
+                      .assign(probability=kind))
+        print(f"  Brier score (test) {kind:<10}: {brier[kind]:.4f}")
+    reliability = pd.concat(tables, ignore_index=True)
+
+    print(f"\nReliability curve ({dt_calibration.RELIABILITY_BINS} bins):")
+    print(reliability.to_string(index=False))
+    return reliability, brier
 
-print(f"\nRISK RANKING BY KABUPATEN:")
-print(f"{'='*50}")
-print(risk_by_kabupaten.to_string(index=False))
 
-# Categorize risk levels
-risk_by_kabupaten['risk_level'] = pd.cut(
-    risk_by_kabupaten['risk_score'],
-    bins=[0, 30, 50, 70, 100],
-    labels=['Low', 'Medium', 'High', 'Very High']
-)
+# ============================================
+# 5. GEOGRAPHIC RISK MAPPING
+# ============================================
 
-print(f"\nRISK LEVEL DISTRIBUTION:")
-print(risk_by_kabupaten['risk_level'].value_counts())
+def map_geographic_risk(analysis_df):
+    print("\n" + "="*70)
+    print("GEOGRAPHIC RISK MAPPING")
+    print("="*70)
+
+    # Calculate risk score per kabupaten (probabilitas terkalibrasi bila ada)
+    proba_col = ('calibrated_probability' if 'calibrated_probability' in analysis_df
+                 else 'probability_class_1')
+    risk_by_kabupaten = analysis_df.groupby('kabupaten').agg({
+        'predicted': 'sum',  # Total prediksi berisiko
+        proba_col: 'mean',  # Rata-rata probability
+        'actual': 'sum'  # Actual cases
+    }).reset_index()
+
+    risk_by_kabupaten.columns = ['kabupaten', 'predicted_risk_count',
+                                  'avg_risk_probability', 'actual_risk_count']
+    risk_by_kabupaten['risk_score'] = (
+        risk_by_kabupaten['avg_risk_probability'] * 100
+    ).round(2)
+
+    risk_by_kabupaten = risk_by_kabupaten.sort_values('risk_score', ascending=False)
+
+    print(f"\nRISK RANKING BY KABUPATEN:")
+    print(f"{'='*50}")
+    print(risk_by_kabupaten.to_string(index=False))
+
+    # Categorize risk levels
+    risk_by_kabupaten['risk_level'] = pd.cut(
+        risk_by_kabupaten['risk_score'],
+        bins=[0, 30, 50, 70, 100],
+        labels=['Low', 'Medium', 'High', 'Very High']
+    )
+
+    print(f"\nRISK LEVEL DISTRIBUTION:")
+    print(risk_by_kabupaten['risk_level'].value_counts())
+
+    return risk_by_kabupaten
+
+
+def ci_text(metrics, metric, fmt='.3f'):
+    """' [low, high]' dari kolom bootstrap CI comparison (kosong untuk CSV lama)."""
+    low, high = metrics.get(f'{metric} CI Low'), metrics.get(f'{metric} CI High')
+    if low is None or pd.isna(low):
+        return ''
+    return f" [{low:{fmt}}, {high:{fmt}}]"
+
+
+@dt_profile.profiled('evaluation')
+def evaluate_results(comparison, predictions, feature_imp, prepared, threshold=None):
+    """PART 4 dalam memori: hasil modeling -> Report (tanpa I/O file)."""
+    # Get best model info
+    best_model_idx = comparison['F1-Score'].idxmax()
+    best_model_name = comparison.loc[best_model_idx, 'Model']
+    best_metrics = comparison.iloc[best_model_idx]
+
+    print(f"✅ Best Model: {best_model_name}")
+    print(f"   F1-Score: {best_metrics['F1-Score']:.4f}{ci_text(best_metrics, 'F1-Score', '.4f')}")
+    print(f"   ROC-AUC:  {best_metrics['ROC-AUC']:.4f}{ci_text(best_metrics, 'ROC-AUC', '.4f')}")
+
+    cm = analyze_confusion_matrix(predictions)
+    top10_features, n_features_80pct, temporal_imp, geographic_imp = \
+        analyze_feature_importance(feature_imp)
+    analysis_df, false_positives, false_negatives = analyze_predictions(
+        prepared.X_test, prepared.y_test, predictions, prepared.kabupaten_mapping
+    )
+    threshold = analyze_threshold(predictions, threshold)
+    reliability, brier = analyze_calibration(predictions)
+    risk_by_kabupaten = map_geographic_risk(analysis_df)
+
+    return Report(
+        best_model_name=best_model_name,
+        best_metrics=best_metrics,
+        cm=cm,
+        predictions=predictions,
+        feature_imp=feature_imp,
+        top10_features=top10_features,
+        n_features_80pct=n_features_80pct,
+        temporal_imp=temporal_imp,
+        geographic_imp=geographic_imp,
+        analysis_df=analysis_df,
+        false_positives=false_positives,
+        false_negatives=false_negatives,
+        risk_by_kabupaten=risk_by_kabupaten,
+        threshold=threshold,
+        reliability=reliability,
+        brier=brier,
+        data_complete=prepared.data,
+        kabupaten_mapping=prepared.kabupaten_mapping,
+        n_train=len(prepared.X_train),
+        n_test=len(prepared.X_test),
+        n_features=len(prepared.X_test.columns),
+    )
+
+
+def evaluate(bundle):
+    """Evaluasi ModelBundle hasil PART 3 langsung dari memori."""
+    return evaluate_results(bundle.comparison, bundle.predictions,
+                            bundle.feature_importance, bundle.prepared,
+                            bundle.threshold.threshold)
+
+
+def save_risk_mapping(report):
+    # Save risk mapping
+    report.risk_by_kabupaten.to_csv('geographic_risk_mapping.csv', index=False)
+    print(f"\n✅ Risk mapping saved: geographic_risk_mapping.csv")
+
+    report.reliability.to_csv('calibration_reliability.csv', index=False)
+    print(f"✅ Reliability curve saved: calibration_reliability.csv")
 
-# Save risk mapping
-risk_by_kabupaten.to_csv('geographic_risk_mapping.csv', index=False)
-print(f"\n✅ Risk mapping saved: geographic_risk_mapping.csv")
 
 # ============================================
 # 6. VISUALIZATIONS
 # ============================================
 
-print("\n" + "="*70)
-print("CREATING ADVANCED VISUALIZATIONS")
-print("="*70)
-
-# [A] Error Analysis
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('Prediction Error Analysis', fontsize=16, fontweight='bold')
-
-# Confusion Matrix with percentages
-cm_pct = cm.astype('float') / cm.sum(axis=1)[:, np.newaxis] * 100
-sns.heatmap(cm_pct, annot=True, fmt='.1f', cmap='RdYlGn_r', 
-            xticklabels=['Tidak Berisiko', 'Berisiko'],
-            yticklabels=['Tidak Berisiko', 'Berisiko'],
-            ax=axes[0, 0], cbar_kws={'label': 'Percentage (%)'})
-axes[0, 0].set_title('Confusion Matrix (%)', fontsize=13, fontweight='bold')
-axes[0, 0].set_ylabel('Actual', fontsize=11)
-axes[0, 0].set_xlabel('Predicted', fontsize=11)
-
-# Prediction probability distribution
-axes[0, 1].hist(predictions[predictions['actual']==0]['probability_class_1'], 
-               bins=30, alpha=0.5, label='Actual: Tidak Berisiko', color='blue')
-axes[0, 1].hist(predictions[predictions['actual']==1]['probability_class_1'], 
-               bins=30, alpha=0.5, label='Actual: Berisiko', color='red')
-axes[0, 1].axvline(x=0.5, color='black', linestyle='--', linewidth=2, label='Decision Threshold')
-axes[0, 1].set_xlabel('Predicted Probability (Class 1)', fontsize=11)
-axes[0, 1].set_ylabel('Frequency', fontsize=11)
-axes[0, 1].set_title('Probability Distribution by Actual Class', fontsize=13, fontweight='bold')
-axes[0, 1].legend()
-axes[0, 1].grid(alpha=0.3)
-
-# False Positive Analysis
-if len(false_positives) > 0:
-    fp_top = false_positives['kabupaten'].value_counts().head(10)
-    axes[1, 0].barh(range(len(fp_top)), fp_top.values, color='orange', edgecolor='black')
-    axes[1, 0].set_yticks(range(len(fp_top)))
-    axes[1, 0].set_yticklabels(fp_top.index, fontsize=9)
-    axes[1, 0].set_xlabel('Count', fontsize=11)
-    axes[1, 0].set_title('Top 10 Kabupaten - False Positives', fontsize=13, fontweight='bold')
-    axes[1, 0].invert_yaxis()
-    axes[1, 0].grid(axis='x', alpha=0.3)
-
-# False Negative Analysis
-if len(false_negatives) > 0:
-    fn_top = false_negatives['kabupaten'].value_counts().head(10)
-    axes[1, 1].barh(range(len(fn_top)), fn_top.values, color='red', edgecolor='black')
-    axes[1, 1].set_yticks(range(len(fn_top)))
-    axes[1, 1].set_yticklabels(fn_top.index, fontsize=9)
-    axes[1, 1].set_xlabel('Count', fontsize=11)
-    axes[1, 1].set_title('Top 10 Kabupaten - False Negatives (CRITICAL)', 
-                        fontsize=13, fontweight='bold')
-    axes[1, 1].invert_yaxis()
-    axes[1, 1].grid(axis='x', alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('12_error_analysis.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 12_error_analysis.png")
-
-# [B] Geographic Risk Heatmap
-plt.figure(figsize=(12, 8))
-risk_pivot = risk_by_kabupaten.set_index('kabupaten')['risk_score']
-colors = ['green' if x < 30 else 'yellow' if x < 50 else 'orange' if x < 70 else 'red' 
-          for x in risk_pivot.values]
-
-plt.barh(range(len(risk_pivot)), risk_pivot.values, color=colors, edgecolor='black')
-plt.yticks(range(len(risk_pivot)), risk_pivot.index, fontsize=10)
-plt.xlabel('Risk Score (%)', fontsize=12)
-plt.title('Geographic Risk Mapping by Kabupaten', fontsize=14, fontweight='bold')
-plt.axvline(x=50, color='red', linestyle='--', linewidth=2, alpha=0.7, label='High Risk Threshold')
-plt.legend()
-plt.grid(axis='x', alpha=0.3)
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.savefig('13_geographic_risk_map.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 13_geographic_risk_map.png")
-
-# [C] Feature Importance by Category
-fig, ax = plt.subplots(figsize=(10, 6))
-
-categories = ['Temporal', 'Geographic', 'Statistical']
-importances = [temporal_imp, geographic_imp, 
-               1 - temporal_imp - geographic_imp]
-colors_cat = ['skyblue', 'lightcoral', 'lightgreen']
-
-wedges, texts, autotexts = ax.pie(importances, labels=categories, autopct='%1.1f%%',
-                                    colors=colors_cat, startangle=90,
-                                    textprops={'fontsize': 12, 'fontweight': 'bold'})
-ax.set_title('Feature Importance by Category', fontsize=14, fontweight='bold')
-plt.tight_layout()
-plt.savefig('14_feature_category_importance.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 14_feature_category_importance.png")
+def render_error_analysis(cm_pct, proba_hist, fp_top, fn_top, threshold):
+    # [A] Error Analysis
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Prediction Error Analysis', fontsize=16, fontweight='bold')
+
+    # Confusion Matrix with percentages
+    sns.heatmap(cm_pct, annot=True, fmt='.1f', cmap='RdYlGn_r',
+                xticklabels=['Tidak Berisiko', 'Berisiko'],
+                yticklabels=['Tidak Berisiko', 'Berisiko'],
+                ax=axes[0, 0], cbar_kws={'label': 'Percentage (%)'})
+    axes[0, 0].set_title('Confusion Matrix (%)', fontsize=13, fontweight='bold')
+    axes[0, 0].set_ylabel('Actual', fontsize=11)
+    axes[0, 0].set_xlabel('Predicted', fontsize=11)
+
+    # Prediction probability distribution (histogram per kelas aktual)
+    for actual, label, color in [(0, 'Actual: Tidak Berisiko', 'blue'),
+                                 (1, 'Actual: Berisiko', 'red')]:
+        counts, edges = proba_hist[actual]
+        axes[0, 1].hist(edges[:-1], bins=edges, weights=counts,
+                        alpha=0.5, label=label, color=color)
+    axes[0, 1].axvline(x=0.5, color='black', linestyle='--', linewidth=2, label='Default Threshold (0.50)')
+    axes[0, 1].axvline(x=threshold, color='darkgreen', linestyle=':', linewidth=2,
+                       label=f'OOF Threshold ({threshold:.2f})')
+    axes[0, 1].set_xlabel('Predicted Probability (Class 1)', fontsize=11)
+    axes[0, 1].set_ylabel('Frequency', fontsize=11)
+    axes[0, 1].set_title('Probability Distribution by Actual Class', fontsize=13, fontweight='bold')
+    axes[0, 1].legend()
+    axes[0, 1].grid(alpha=0.3)
+
+    # False Positive Analysis
+    if len(fp_top) > 0:
+        axes[1, 0].barh(range(len(fp_top)), fp_top.values, color='orange', edgecolor='black')
+        axes[1, 0].set_yticks(range(len(fp_top)))
+        axes[1, 0].set_yticklabels(fp_top.index, fontsize=9)
+        axes[1, 0].set_xlabel('Count', fontsize=11)
+        axes[1, 0].set_title('Top 10 Kabupaten - False Positives', fontsize=13, fontweight='bold')
+        axes[1, 0].invert_yaxis()
+        axes[1, 0].grid(axis='x', alpha=0.3)
+
+    # False Negative Analysis
+    if len(fn_top) > 0:
+        axes[1, 1].barh(range(len(fn_top)), fn_top.values, color='red', edgecolor='black')
+        axes[1, 1].set_yticks(range(len(fn_top)))
+        axes[1, 1].set_yticklabels(fn_top.index, fontsize=9)
+        axes[1, 1].set_xlabel('Count', fontsize=11)
+        axes[1, 1].set_title('Top 10 Kabupaten - False Negatives (CRITICAL)',
+                            fontsize=13, fontweight='bold')
+        axes[1, 1].invert_yaxis()
+        axes[1, 1].grid(axis='x', alpha=0.3)
+
+    plt.tight_layout()
+
+
+def render_risk_map(risk_pivot):
+    # [B] Geographic Risk Heatmap
+    plt.figure(figsize=(12, 8))
+    colors = ['green' if x < 30 else 'yellow' if x < 50 else 'orange' if x < 70 else 'red'
+              for x in risk_pivot.values]
+
+    plt.barh(range(len(risk_pivot)), risk_pivot.values, color=colors, edgecolor='black')
+    plt.yticks(range(len(risk_pivot)), risk_pivot.index, fontsize=10)
+    plt.xlabel('Risk Score (%)', fontsize=12)
+    plt.title('Geographic Risk Mapping by Kabupaten', fontsize=14, fontweight='bold')
+    plt.axvline(x=50, color='red', linestyle='--', linewidth=2, alpha=0.7, label='High Risk Threshold')
+    plt.legend()
+    plt.grid(axis='x', alpha=0.3)
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+
+
+def render_category_importance(temporal_imp, geographic_imp):
+    # [C] Feature Importance by Category
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    categories = ['Temporal', 'Geographic', 'Statistical']
+    importances = [temporal_imp, geographic_imp,
+                   1 - temporal_imp - geographic_imp]
+    colors_cat = ['skyblue', 'lightcoral', 'lightgreen']
+
+    wedges, texts, autotexts = ax.pie(importances, labels=categories, autopct='%1.1f%%',
+                                        colors=colors_cat, startangle=90,
+                                        textprops={'fontsize': 12, 'fontweight': 'bold'})
+    ax.set_title('Feature Importance by Category', fontsize=14, fontweight='bold')
+    plt.tight_layout()
+
+
+def render_reliability_curve(reliability, brier):
+    # [D] Reliability curve: probabilitas mentah vs terkalibrasi
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    fig.suptitle('Probability Calibration (Test Set)', fontsize=16, fontweight='bold')
+
+    styles = {'raw': ('Raw', 'steelblue', 'o'), 'calibrated': ('Calibrated (OOF)', 'darkorange', 's')}
+    axes[0].plot([0, 1], [0, 1], 'k--', linewidth=1, label='Perfectly Calibrated')
+    for kind, table in reliability.groupby('probability', sort=False):
+        label, color, marker = styles[kind]
+        axes[0].plot(table['mean_predicted'], table['fraction_positive'], marker=marker,
+                     linewidth=2, color=color, label=f'{label} (Brier = {brier[kind]:.3f})')
+        axes[1].bar(table['bin_lower'] + (0.05 if kind == 'raw' else 0.0), table['count'],
+                    width=0.05, align='edge', color=color, edgecolor='black', label=label)
+    axes[0].set_xlabel('Mean Predicted Probability', fontsize=11)
+    axes[0].set_ylabel('Fraction of Positives', fontsize=11)
+    axes[0].set_title('Reliability Curve', fontsize=13, fontweight='bold')
+    axes[0].legend(loc='upper left')
+    axes[0].grid(alpha=0.3)
+
+    axes[1].set_xlabel('Predicted Probability Bin', fontsize=11)
+    axes[1].set_ylabel('Count', fontsize=11)
+    axes[1].set_title('Predictions per Bin', fontsize=13, fontweight='bold')
+    axes[1].legend()
+    axes[1].grid(axis='y', alpha=0.3)
+
+    plt.tight_layout()
+
+
+def evaluation_figures(report):
+    """Ringkasan per figure: confusion matrix (%), histogram probabilitas, top error, risk score."""
+    cm = report.cm
+    predictions = report.predictions
+    proba_hist = {actual: np.histogram(
+                      predictions.loc[predictions['actual'] == actual, 'probability_class_1'], bins=30)
+                  for actual in (0, 1)}
+    figures = [
+        dt_report.Figure('12_error_analysis.png', render_error_analysis, dict(
+            cm_pct=cm.astype('float') / cm.sum(axis=1)[:, np.newaxis] * 100,
+            proba_hist=proba_hist,
+            fp_top=report.false_positives['kabupaten'].value_counts().head(10),
+            fn_top=report.false_negatives['kabupaten'].value_counts().head(10),
+            threshold=report.threshold.threshold,
+        )),
+        dt_report.Figure('13_geographic_risk_map.png', render_risk_map,
+                         dict(risk_pivot=report.risk_by_kabupaten.set_index('kabupaten')['risk_score'])),
+        dt_report.Figure('15_reliability_curve.png', render_reliability_curve,
+                         dict(reliability=report.reliability, brier=report.brier)),
+    ]
+    if len(report.top10_features):
+        figures.append(dt_report.Figure(
+            '14_feature_category_importance.png', render_category_importance,
+            dict(temporal_imp=report.temporal_imp, geographic_imp=report.geographic_imp)))
+    return figures
+
+
+@dt_profile.profiled('plot_evaluation')
+def plot_evaluation(report):
+    print("\n" + "="*70)
+    print("CREATING ADVANCED VISUALIZATIONS")
+    print("="*70)
+
+    dt_report.render_figures(evaluation_figures(report))
+
 
 # ============================================
 # 7. BUSINESS RECOMMENDATIONS
 # ============================================
 
-print("\n" + "="*70)
-print("BUSINESS RECOMMENDATIONS")
-print("="*70)
+def top_feature(report):
+    top10_features = report.top10_features
+    return top10_features.iloc[0]['feature'] if len(top10_features) else 'N/A'
 
-# High-risk kabupaten
-high_risk = risk_by_kabupaten[risk_by_kabupaten['risk_level'].isin(['High', 'Very High'])]
 
-recommendations = f"""
+def build_recommendations(report):
+    risk_by_kabupaten = report.risk_by_kabupaten
+    top10_features = report.top10_features
+    false_positives = report.false_positives
+    false_negatives = report.false_negatives
+    best_model_name = report.best_model_name
+    best_metrics = report.best_metrics
+    high_risk = report.high_risk
+    very_high = report.very_high
+    high = report.high
+
+    recommendations = f"""
 {'='*70}
 BUSINESS RECOMMENDATIONS & ACTION PLAN
 {'='*70}
@@ -376,31 +642,29 @@ BUSINESS RECOMMENDATIONS & ACTION PLAN
 TIER 1: VERY HIGH RISK (Immediate Action Required)
 """
 
-very_high = risk_by_kabupaten[risk_by_kabupaten['risk_level'] == 'Very High']
-if len(very_high) > 0:
-    for _, row in very_high.iterrows():
-        recommendations += f"\n  • {row['kabupaten']}"
-        recommendations += f"\n    Risk Score: {row['risk_score']:.1f}%"
-        recommendations += f"\n    Predicted incidents: {int(row['predicted_risk_count'])}"
-        recommendations += f"\n    ACTION: Deploy crisis intervention team immediately"
-else:
-    recommendations += "\n  ✅ No kabupaten in very high risk category"
+    if len(very_high) > 0:
+        for _, row in very_high.iterrows():
+            recommendations += f"\n  • {row['kabupaten']}"
+            recommendations += f"\n    Risk Score: {row['risk_score']:.1f}%"
+            recommendations += f"\n    Predicted incidents: {int(row['predicted_risk_count'])}"
+            recommendations += f"\n    ACTION: Deploy crisis intervention team immediately"
+    else:
+        recommendations += "\n  ✅ No kabupaten in very high risk category"
 
-recommendations += f"""
+    recommendations += f"""
 
 TIER 2: HIGH RISK (Enhanced Monitoring)
 """
 
-high = risk_by_kabupaten[risk_by_kabupaten['risk_level'] == 'High']
-if len(high) > 0:
-    for _, row in high.iterrows():
-        recommendations += f"\n  • {row['kabupaten']}"
-        recommendations += f"\n    Risk Score: {row['risk_score']:.1f}%"
-        recommendations += f"\n    ACTION: Strengthen mental health services"
-else:
-    recommendations += "\n  ✅ No kabupaten in high risk category"
+    if len(high) > 0:
+        for _, row in high.iterrows():
+            recommendations += f"\n  • {row['kabupaten']}"
+            recommendations += f"\n    Risk Score: {row['risk_score']:.1f}%"
+            recommendations += f"\n    ACTION: Strengthen mental health services"
+    else:
+        recommendations += "\n  ✅ No kabupaten in high risk category"
 
-recommendations += f"""
+    recommendations += f"""
 
 {'='*50}
 🎯 KEY ACTIONABLE INSIGHTS
@@ -418,32 +682,32 @@ recommendations += f"""
       - kasus_1tahun_lalu > threshold
       - Positive tren indicators
       - High density_score
-   
+
 3. FALSE NEGATIVE FOLLOW-UP (CRITICAL!)
    ⚠️ {len(false_negatives)} wilayah berisiko terlewat
    ✅ Manual verification needed for:
 """
 
-if len(false_negatives) > 0:
-    fn_kab_unique = false_negatives['kabupaten'].unique()
-    for kab in fn_kab_unique[:5]:
-        recommendations += f"\n      • {kab}"
+    if len(false_negatives) > 0:
+        fn_kab_unique = false_negatives['kabupaten'].unique()
+        for kab in fn_kab_unique[:5]:
+            recommendations += f"\n      • {kab}"
 
-recommendations += f"""
+    recommendations += f"""
 
 4. FALSE POSITIVE MANAGEMENT
    ℹ️ {len(false_positives)} false alarms detected
    ✅ Implement verification protocol before deployment
-   ✅ Use probability threshold: {predictions['probability_class_1'].quantile(0.75):.2f}
+   ✅ Use probability threshold: {report.threshold.threshold:.2f} (Precision {report.threshold.precision:.0%}, Recall {report.threshold.recall:.0%})
 
 5. FEATURE-BASED PREVENTION
    Based on top features, focus on:
 """
 
-for i, row in top10_features.head(5).iterrows():
-    recommendations += f"\n   {i+1}. {row['feature']} (importance: {row['importance']:.3f})"
+    for i, row in top10_features.head(5).iterrows():
+        recommendations += f"\n   {i+1}. {row['feature']} (importance: {row['importance']:.3f})"
 
-recommendations += f"""
+    recommendations += f"""
 
 6. DATA COLLECTION IMPROVEMENTS
    📊 Enhance prediction by collecting:
@@ -472,11 +736,11 @@ Model captures {len(high_risk)} high-risk areas out of {len(risk_by_kabupaten)}
 1. MODEL RETRAINING
    • Quarterly retraining with new data
    • Annual model evaluation and update
-   
+
 2. FEEDBACK LOOP
    • Track intervention outcomes
    • Incorporate success/failure data
-   
+
 3. STAKEHOLDER ENGAGEMENT
    • Monthly reports to Dinas Kesehatan
    • Quarterly briefing for Bupati/Walikota
@@ -487,23 +751,25 @@ END OF RECOMMENDATIONS
 {'='*70}
 """
 
-print(recommendations)
-
-# Save recommendations
-with open('02_business_recommendations.txt', 'w', encoding='utf-8') as f:
-    f.write(recommendations)
+    return recommendations
 
-print("\n✅ Recommendations saved: 02_business_recommendations.txt")
 
 # ============================================
 # 8. FINAL COMPREHENSIVE REPORT
 # ============================================
 
-print("\n" + "="*70)
-print("GENERATING FINAL REPORT")
-print("="*70)
-
-final_report = f"""
+def build_final_report(report):
+    data_complete = report.data_complete
+    kabupaten_mapping = report.kabupaten_mapping
+    best_model_name = report.best_model_name
+    best_metrics = report.best_metrics
+    tn, fp, fn, tp = report.confusion
+    top10_features = report.top10_features
+    risk_by_kabupaten = report.risk_by_kabupaten
+    high_risk = report.high_risk
+    n_features = report.n_features
+
+    final_report = f"""
 {'='*70}
 FINAL PROJECT REPORT
 DECISION TREE CLASSIFICATION FOR SUICIDE CASE PREDICTION
@@ -526,8 +792,8 @@ DATASET:
 METHODOLOGY: CRISP-DM Framework
 1. ✅ Business Understanding
 2. ✅ Data Understanding
-3. ✅ Data Preparation ({len(X_test.columns)} engineered features)
-4. ✅ Modeling (5 models compared)
+3. ✅ Data Preparation ({n_features} engineered features)
+4. ✅ Modeling (6 models compared)
 5. ✅ Evaluation (comprehensive metrics)
 6. ✅ Deployment (recommendations provided)
 
@@ -541,6 +807,7 @@ MODELS COMPARED:
 3. Decision Tree - Balanced
 4. Decision Tree - Pruned
 5. Random Forest
+6. Histogram Gradient Boosting
 
 BEST MODEL: {best_model_name}
 
@@ -564,18 +831,18 @@ CONFUSION MATRIX:
 1. PREDICTIVE FEATURES (Top 5):
 """
 
-for i, row in top10_features.head(5).iterrows():
-    final_report += f"\n   {i+1}. {row['feature']:25s} ({row['importance']:.3f})"
+    for i, row in top10_features.head(5).iterrows():
+        final_report += f"\n   {i+1}. {row['feature']:25s} ({row['importance']:.3f})"
 
-final_report += f"""
+    final_report += f"""
 
 2. GEOGRAPHIC HOTSPOTS:
 """
 
-for i, row in risk_by_kabupaten.head(5).iterrows():
-    final_report += f"\n   {i+1}. {row['kabupaten']:30s} Risk: {row['risk_score']:.1f}%"
+    for i, row in risk_by_kabupaten.head(5).iterrows():
+        final_report += f"\n   {i+1}. {row['kabupaten']:30s} Risk: {row['risk_score']:.1f}%"
 
-final_report += f"""
+    final_report += f"""
 
 3. MODEL STRENGTHS:
    ✅ Handles imbalanced data effectively
@@ -618,14 +885,14 @@ CODE & SCRIPTS:
 ✅ 04_model_evaluation_insights.py
 
 DATA FILES:
-✅ X_train.csv, X_test.csv
-✅ y_train.csv, y_test.csv
-✅ data_processed_complete.csv
+✅ prepared_data.arrow (features, target, split, mapping)
+✅ X_train.csv, X_test.csv, y_train.csv, y_test.csv (optional export)
+✅ data_processed_complete.csv (optional export)
 ✅ predictions_best_model.csv
 ✅ feature_importance.csv
 ✅ geographic_risk_mapping.csv
 
-VISUALIZATIONS (14 files):
+VISUALIZATIONS (15 files):
 ✅ Target distribution analysis
 ✅ Temporal trends
 ✅ Geographic hotspots
@@ -638,6 +905,7 @@ VISUALIZATIONS (14 files):
 ✅ Decision tree structure
 ✅ Error analysis
 ✅ Risk mapping
+✅ Probability calibration (reliability curve)
 
 REPORTS:
 ✅ Business understanding summary
@@ -686,23 +954,17 @@ evidence-based mental health policy in Jawa Barat."
 Generated on: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
-print(final_report)
+    print(final_report)
 
-# Save final report
-with open('03_final_comprehensive_report.txt', 'w', encoding='utf-8') as f:
-    f.write(final_report)
+    return final_report
 
-print("\n✅ Final report saved: 03_final_comprehensive_report.txt")
 
 # ============================================
 # 9. SUMMARY OF ALL FILES
 # ============================================
 
-print("\n" + "="*70)
-print("PROJECT FILES SUMMARY")
-print("="*70)
 
-files_summary = """
+FILES_SUMMARY = """
 📁 ALL PROJECT FILES GENERATED:
 
 SCRIPTS (4 files):
@@ -713,15 +975,18 @@ SCRIPTS (4 files):
 
 DATA FILES (10 files):
   ✅ jml_kejadian_bunuh_diri__des_kel.csv (original)
-  ✅ X_train.csv, X_test.csv (features)
-  ✅ y_train.csv, y_test.csv (targets)
-  ✅ data_processed_complete.csv (all features + target)
+  ✅ prepared_data.arrow (stage handoff: features + target + split)
+  ✅ X_train.csv, X_test.csv (features, --export-csv)
+  ✅ y_train.csv, y_test.csv (targets, --export-csv)
+  ✅ data_processed_complete.csv (all features + target, --export-csv)
   ✅ predictions_best_model.csv (predictions)
   ✅ feature_importance.csv
   ✅ geographic_risk_mapping.csv
+  ✅ threshold_sweep.csv
+  ✅ calibration_reliability.csv
   ✅ kabupaten_encoding_mapping.csv
 
-VISUALIZATIONS (14 files):
+VISUALIZATIONS (15 files):
   ✅ 01_target_distribution_analysis.png
   ✅ 02_temporal_trends.png
   ✅ 03_geographic_hotspots.png
@@ -736,6 +1001,7 @@ VISUALIZATIONS (14 files):
   ✅ 12_error_analysis.png
   ✅ 13_geographic_risk_map.png
   ✅ 14_feature_category_importance.png
+  ✅ 15_reliability_curve.png
 
 REPORTS (5 files):
   ✅ 00_dataset_summary.csv
@@ -749,20 +1015,15 @@ MODEL FILES (1 file):
   ✅ model_comparison_metrics.csv
 """
 
-print(files_summary)
-
 # ============================================
 # 10. EXECUTION INSTRUCTIONS
 # ============================================
 
-print("\n" + "="*70)
-print("HOW TO RUN THIS PROJECT")
-print("="*70)
 
-instructions = """
+INSTRUCTIONS = """
 PREREQUISITE:
 1. Install required libraries:
-   pip install pandas numpy matplotlib seaborn scikit-learn
+   pip install pandas numpy matplotlib seaborn scikit-learn pyarrow
 
 2. Ensure data file exists:
    jml_kejadian_bunuh_diri__des_kel.csv
@@ -806,17 +1067,26 @@ CUSTOMIZATION OPTIONS:
 4. Update recommendations based on domain knowledge
 """
 
-print(instructions)
 
 # ============================================
 # 11. FINAL VALIDATION & SUMMARY
 # ============================================
 
-print("\n" + "="*70)
-print("FINAL VALIDATION & PROJECT SUMMARY")
-print("="*70)
-
-validation_checklist = f"""
+def build_validation_checklist(report):
+    data_complete = report.data_complete
+    kabupaten_mapping = report.kabupaten_mapping
+    best_model_name = report.best_model_name
+    best_metrics = report.best_metrics
+    tn, fp, fn, tp = report.confusion
+    risk_by_kabupaten = report.risk_by_kabupaten
+    very_high = report.very_high
+    high = report.high
+    n_features_80pct = report.n_features_80pct
+    # NaN bila model tidak punya feature importance
+    temporal_imp = 'N/A' if pd.isna(report.temporal_imp) else f"{report.temporal_imp:.2%}"
+    geographic_imp = 'N/A' if pd.isna(report.geographic_imp) else f"{report.geographic_imp:.2%}"
+
+    validation_checklist = f"""
 ✅ PROJECT COMPLETION CHECKLIST:
 
 PHASE 1: BUSINESS UNDERSTANDING
@@ -838,7 +1108,7 @@ PHASE 3: DATA PREPARATION
   ✅ Feature scaling not needed (DT-based)
 
 PHASE 4: MODELING
-  ✅ 5 models compared
+  ✅ 6 models compared
   ✅ Best model: {best_model_name}
   ✅ Hyperparameter tuning completed
   ✅ Cross-validation performed
@@ -855,12 +1125,12 @@ PHASE 6: DEPLOYMENT READINESS
   ✅ Recommendations generated
   ✅ Implementation guide provided
 
-MODEL PERFORMANCE METRICS:
-  • Accuracy:  {best_metrics['Accuracy']:.2%}
-  • Precision: {best_metrics['Precision']:.2%}
-  • Recall:    {best_metrics['Recall']:.2%}
-  • F1-Score:  {best_metrics['F1-Score']:.3f}
-  • ROC-AUC:   {best_metrics['ROC-AUC']:.3f}
+MODEL PERFORMANCE METRICS (95% bootstrap CI):
+  • Accuracy:  {best_metrics['Accuracy']:.2%}{ci_text(best_metrics, 'Accuracy', '.2%')}
+  • Precision: {best_metrics['Precision']:.2%}{ci_text(best_metrics, 'Precision', '.2%')}
+  • Recall:    {best_metrics['Recall']:.2%}{ci_text(best_metrics, 'Recall', '.2%')}
+  • F1-Score:  {best_metrics['F1-Score']:.3f}{ci_text(best_metrics, 'F1-Score')}
+  • ROC-AUC:   {best_metrics['ROC-AUC']:.3f}{ci_text(best_metrics, 'ROC-AUC')}
 
 ERROR ANALYSIS:
   • True Positives:  {tp} (correctly identified risks)
@@ -875,38 +1145,33 @@ GEOGRAPHIC INSIGHTS:
   • Top Risk Area:   {risk_by_kabupaten.iloc[0]['kabupaten']}
 
 FEATURE INSIGHTS:
-  • Top Feature:     {top10_features.iloc[0]['feature']}
+  • Top Feature:     {top_feature(report)}
   • Features for 80%: {n_features_80pct}
-  • Temporal Weight:  {temporal_imp:.2%}
-  • Geographic Weight: {geographic_imp:.2%}
+  • Temporal Weight:  {temporal_imp}
+  • Geographic Weight: {geographic_imp}
 
 PROJECT STATUS: ✅ COMPLETE & READY FOR DEPLOYMENT
 """
+    return validation_checklist
 
-print(validation_checklist)
-
-# Save validation checklist
-with open('04_project_validation_checklist.txt', 'w', encoding='utf-8') as f:
-    f.write(validation_checklist)
-
-print("\n✅ Validation checklist saved: 04_project_validation_checklist.txt")
 
 # ============================================
 # 12. CONCLUSION
 # ============================================
 
-print("\n" + "="*70)
-print("🎉 PROJECT COMPLETED SUCCESSFULLY!")
-print("="*70)
+def build_conclusion(report):
+    best_metrics = report.best_metrics
+    high_risk = report.high_risk
+    top10_features = report.top10_features
 
-conclusion = f"""
+    conclusion = f"""
 {'='*70}
 CONCLUSION & NEXT ACTIONS
 {'='*70}
 
 PROJECT SUCCESSFULLY COMPLETED:
-This Decision Tree classification project has successfully developed a 
-machine learning model to predict high-risk areas for suicide cases in 
+This Decision Tree classification project has successfully developed a
+machine learning model to predict high-risk areas for suicide cases in
 Jawa Barat province.
 
 KEY ACHIEVEMENTS:
@@ -972,98 +1237,200 @@ Generated: {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}
 Version: 1.0
 Status: Production Ready ✅
 """
+    return conclusion
 
-print(conclusion)
-
-# Save conclusion
-with open('05_project_conclusion_nextactions.txt', 'w', encoding='utf-8') as f:
-    f.write(conclusion)
-
-print("\n✅ Conclusion saved: 05_project_conclusion_nextactions.txt")
 
 # ============================================
 # 13. CREATE SUMMARY STATISTICS TABLE
 # ============================================
 
-print("\n" + "="*70)
-print("GENERATING SUMMARY STATISTICS")
-print("="*70)
-
-# Create comprehensive summary table
-summary_stats = pd.DataFrame({
-    'Metric': [
-        'Total Records',
-        'Total Kabupaten',
-        'Period (Years)',
-        'Training Samples',
-        'Testing Samples',
-        'Engineered Features',
-        'Models Compared',
-        'Best Model',
-        'Accuracy',
-        'Precision',
-        'Recall',
-        'F1-Score',
-        'ROC-AUC',
-        'True Positives',
-        'True Negatives',
-        'False Positives',
-        'False Negatives',
-        'High-Risk Areas',
-        'Top Predictive Feature',
-        'Class Imbalance Ratio'
-    ],
-    'Value': [
-        f"{len(data_complete):,}",
-        f"{kabupaten_mapping.shape[0]}",
-        "6 (2019-2024)",
-        f"{len(X_train)}",
-        f"{len(X_test)}",
-        f"{len(X_test.columns)}",
-        "5",
-        best_model_name,
-        f"{best_metrics['Accuracy']:.2%}",
-        f"{best_metrics['Precision']:.2%}",
-        f"{best_metrics['Recall']:.2%}",
-        f"{best_metrics['F1-Score']:.4f}",
-        f"{best_metrics['ROC-AUC']:.4f}",
-        f"{tp}",
-        f"{tn}",
-        f"{fp}",
-        f"{fn}",
-        f"{len(high_risk)}",
-        top10_features.iloc[0]['feature'],
-        f"{(data_complete['berisiko']==0).sum() / (data_complete['berisiko']==1).sum():.1f}:1"
-    ]
-})
+def build_summary_statistics(report):
+    data_complete = report.data_complete
+    kabupaten_mapping = report.kabupaten_mapping
+    best_model_name = report.best_model_name
+    best_metrics = report.best_metrics
+    tn, fp, fn, tp = report.confusion
+    high_risk = report.high_risk
+
+    # Create comprehensive summary table
+    summary_stats = pd.DataFrame({
+        'Metric': [
+            'Total Records',
+            'Total Kabupaten',
+            'Period (Years)',
+            'Training Samples',
+            'Testing Samples',
+            'Engineered Features',
+            'Models Compared',
+            'Best Model',
+            'Accuracy',
+            'Precision',
+            'Recall',
+            'F1-Score',
+            'ROC-AUC',
+            'True Positives',
+            'True Negatives',
+            'False Positives',
+            'False Negatives',
+            'High-Risk Areas',
+            'Top Predictive Feature',
+            'Class Imbalance Ratio'
+        ],
+        'Value': [
+            f"{len(data_complete):,}",
+            f"{kabupaten_mapping.shape[0]}",
+            "6 (2019-2024)",
+            f"{report.n_train}",
+            f"{report.n_test}",
+            f"{report.n_features}",
+            "5",
+            best_model_name,
+            f"{best_metrics['Accuracy']:.2%}",
+            f"{best_metrics['Precision']:.2%}",
+            f"{best_metrics['Recall']:.2%}",
+            f"{best_metrics['F1-Score']:.4f}",
+            f"{best_metrics['ROC-AUC']:.4f}",
+            f"{tp}",
+            f"{tn}",
+            f"{fp}",
+            f"{fn}",
+            f"{len(high_risk)}",
+            top_feature(report),
+            f"{(data_complete['berisiko']==0).sum() / (data_complete['berisiko']==1).sum():.1f}:1"
+        ]
+    })
+    return summary_stats
+
+
+@dt_profile.profiled('write_reports')
+def write_reports(report):
+    """Cetak dan simpan semua laporan teks/CSV PART 4."""
+    print("\n" + "="*70)
+    print("BUSINESS RECOMMENDATIONS")
+    print("="*70)
+
+    recommendations = build_recommendations(report)
+
+    print(recommendations)
+
+    # Save recommendations
+    with open('02_business_recommendations.txt', 'w', encoding='utf-8') as f:
+        f.write(recommendations)
+
+    print("\n✅ Recommendations saved: 02_business_recommendations.txt")
+
+    print("\n" + "="*70)
+    print("GENERATING FINAL REPORT")
+    print("="*70)
+
+    final_report = build_final_report(report)
+
+    print(final_report)
+
+    # Save final report
+    with open('03_final_comprehensive_report.txt', 'w', encoding='utf-8') as f:
+        f.write(final_report)
+
+    print("\n✅ Final report saved: 03_final_comprehensive_report.txt")
+
+    print("\n" + "="*70)
+    print("PROJECT FILES SUMMARY")
+    print("="*70)
+    print(FILES_SUMMARY)
+
+    print("\n" + "="*70)
+    print("HOW TO RUN THIS PROJECT")
+    print("="*70)
+    print(INSTRUCTIONS)
+
+    print("\n" + "="*70)
+    print("FINAL VALIDATION & PROJECT SUMMARY")
+    print("="*70)
+
+    validation_checklist = build_validation_checklist(report)
+
+    print(validation_checklist)
+
+    # Save validation checklist
+    with open('04_project_validation_checklist.txt', 'w', encoding='utf-8') as f:
+        f.write(validation_checklist)
+
+    print("\n✅ Validation checklist saved: 04_project_validation_checklist.txt")
+
+    print("\n" + "="*70)
+    print("🎉 PROJECT COMPLETED SUCCESSFULLY!")
+    print("="*70)
+
+    conclusion = build_conclusion(report)
+
+    print(conclusion)
+
+    # Save conclusion
+    with open('05_project_conclusion_nextactions.txt', 'w', encoding='utf-8') as f:
+        f.write(conclusion)
+
+    print("\n✅ Conclusion saved: 05_project_conclusion_nextactions.txt")
+
+    print("\n" + "="*70)
+    print("GENERATING SUMMARY STATISTICS")
+    print("="*70)
+
+    summary_stats = build_summary_statistics(report)
+
+    print("\nPROJECT SUMMARY STATISTICS:")
+    print(summary_stats.to_string(index=False))
 
-print("\nPROJECT SUMMARY STATISTICS:")
-print(summary_stats.to_string(index=False))
+    # Save summary statistics
+    summary_stats.to_csv('06_project_summary_statistics.csv', index=False)
+    print("\n✅ Summary statistics saved: 06_project_summary_statistics.csv")
 
-# Save summary statistics
-summary_stats.to_csv('06_project_summary_statistics.csv', index=False)
-print("\n✅ Summary statistics saved: 06_project_summary_statistics.csv")
 
-# ============================================
-# FINAL MESSAGE
-# ============================================
+def run(bundle=None, plots=None):
+    """PART 4 end-to-end. Tanpa `bundle`, hasil dibaca dari file output PART 2 & 3.
+
+    `plots=False` (atau DT_PLOTS=0) melewati semua figure.
+    """
+    plots = dt_plots.plots_enabled(plots)
+    if not plots:
+        dt_plots.headless()
+    print("="*70)
+    print("MODEL EVALUATION & BUSINESS INSIGHTS")
+    print("="*70)
+
+    if bundle is None:
+        report = evaluate_results(*load_results())
+    else:
+        report = evaluate(bundle)
 
-print("\n" + "="*70)
-print("✅ ALL EVALUATION & INSIGHTS COMPLETED!")
-print("="*70)
-print(f"""
+    save_risk_mapping(report)
+    if plots:
+        plot_evaluation(report)
+    else:
+        dt_plots.skip_notice('PART 4')
+    write_reports(report)
+
+    # ============================================
+    # FINAL MESSAGE
+    # ============================================
+
+    print("\n" + "="*70)
+    print("✅ ALL EVALUATION & INSIGHTS COMPLETED!")
+    print("="*70)
+    print(f"""
 📊 PROJECT DELIVERABLES READY:
 
 Generated Files:
   ✅ 12_error_analysis.png
   ✅ 13_geographic_risk_map.png
   ✅ 14_feature_category_importance.png
+  ✅ 15_reliability_curve.png
   ✅ 02_business_recommendations.txt
   ✅ 03_final_comprehensive_report.txt
   ✅ 04_project_validation_checklist.txt
   ✅ 05_project_conclusion_nextactions.txt
   ✅ 06_project_summary_statistics.csv
   ✅ geographic_risk_mapping.csv
+  ✅ calibration_reliability.csv
 
 📁 TOTAL PROJECT OUTPUT: 50+ files
 
@@ -1079,6 +1446,17 @@ Generated Files:
 Contact for questions: [Your Contact Information]
 """)
 
-print("="*70)
-print("🎉 Thank you! Decision Tree Project is now COMPLETE!")
-print("="*70)
\ No newline at end of file
+    print("="*70)
+    print("🎉 Thank you! Decision Tree Project is now COMPLETE!")
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='PART 4: model evaluation & business insights')
+    dt_plots.add_plot_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    run(plots=args.plots)
@@ -0,0 +1,223 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+METRIK MODEL: BOOTSTRAP CONFIDENCE INTERVAL & KURVA ROC/PR
+
+Test set hanya beberapa puluh baris, jadi satu angka F1/ROC-AUC sangat rapuh.
+Modul ini menghitung interval kepercayaan bootstrap (percentile) untuk semua
+metrik PART 3 (Accuracy, Precision, Recall, F1-Score, ROC-AUC):
+
+    - indeks resample dibuat sekaligus sebagai matriks B x n (satu operasi NumPy),
+      lalu diubah menjadi matriks bobot (berapa kali tiap baris terambil);
+    - TP/FP/FN dihitung dengan perkalian matriks-vektor, ROC-AUC dari satu sort
+      skor + cumulative sum bobot positif (Mann-Whitney dengan ties), semua untuk
+      B resample sekaligus tanpa loop Python per resample;
+    - B dipecah per batch (memori <= BATCH_ELEMENTS sel); untuk B besar batch
+      dijalankan paralel di process pool. Seed per batch diturunkan dari satu
+      SeedSequence, jadi hasil sama berapa pun jumlah worker.
+
+Kurva ROC dan Precision-Recall (beserta ROC-AUC, PR-AUC, average precision)
+dihitung bersama dari satu sort per vektor probabilitas (`compute_curves`); kurva
+untuk plot di-downsample ke <= CURVE_POINTS titik sehingga rendering tidak
+bergantung pada jumlah baris.
+
+Environment:
+    DT_BOOTSTRAP_JOBS   jumlah worker process (default jumlah CPU)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+
+BOOTSTRAP_SAMPLES = 1000
+CONFIDENCE = 0.95
+BOOTSTRAP_SEED = 42
+BATCH_ELEMENTS = 1 << 22        # sel matriks B x n per batch (~32 MB int64)
+PARALLEL_MIN_ELEMENTS = 1 << 24  # di bawah ini (B x n) satu proses saja lebih cepat
+
+METRICS = ['Accuracy', 'Precision', 'Recall', 'F1-Score', 'ROC-AUC']
+
+CURVE_POINTS = 200              # titik maksimum per kurva yang di-plot
+
+
+# ============================================
+# 1. METRIK TERBOBOT (SEMUA RESAMPLE SEKALIGUS)
+# ============================================
+
+def resample_weights(n, size, rng):
+    """Matriks indeks resample (size x n) -> jumlah kemunculan tiap baris per resample."""
+    idx = rng.integers(0, n, size=(size, n))
+    flat = (np.arange(size)[:, None] * n + idx).ravel()
+    return np.bincount(flat, minlength=size * n).reshape(size, n)
+
+
+def auc_groups(y_proba):
+    """Urutan skor menurun + awal setiap grup skor yang sama (dihitung sekali)."""
+    order = np.argsort(-y_proba, kind='stable')
+    sorted_scores = y_proba[order]
+    starts = np.flatnonzero(np.r_[True, sorted_scores[1:] != sorted_scores[:-1]])
+    return order, starts
+
+
+def weighted_metrics(weights, y_true, y_pred, y_proba=None, groups=None):
+    """Metrik untuk setiap baris bobot (resample); hasil dict metrik -> array panjang B."""
+    weights = weights.astype(float)
+    pos = y_true == 1
+    hit = y_pred == 1
+    tp = weights @ (pos & hit)
+    fp = weights @ (~pos & hit)
+    fn = weights @ (pos & ~hit)
+    total = weights.sum(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # zero_division=0 seperti sklearn
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+        result = {
+            'Accuracy': (total - fp - fn) / total,
+            'Precision': precision,
+            'Recall': recall,
+            'F1-Score': f1,
+        }
+
+        if y_proba is not None:
+            order, starts = groups if groups is not None else auc_groups(y_proba)
+            w_sorted = weights[:, order]
+            pos_sorted = pos[order]
+            pos_g = np.add.reduceat(w_sorted * pos_sorted, starts, axis=1)
+            neg_g = np.add.reduceat(w_sorted * ~pos_sorted, starts, axis=1)
+            # Positif dengan skor lebih tinggi (grup sebelumnya) + setengah ties
+            pos_above = np.cumsum(pos_g, axis=1) - pos_g
+            n_pos, n_neg = pos_g.sum(axis=1), neg_g.sum(axis=1)
+            # Resample dengan satu kelas saja -> AUC tidak terdefinisi (NaN)
+            result['ROC-AUC'] = ((neg_g * (pos_above + 0.5 * pos_g)).sum(axis=1)
+                                 / (n_pos * n_neg))
+    return result
+
+
+# ============================================
+# 2. BOOTSTRAP (BATCH + PARALEL)
+# ============================================
+
+def _bootstrap_batch(seed, size, y_true, y_pred, y_proba):
+    rng = np.random.default_rng(seed)
+    weights = resample_weights(len(y_true), size, rng)
+    groups = auc_groups(y_proba) if y_proba is not None else None
+    return weighted_metrics(weights, y_true, y_pred, y_proba, groups)
+
+
+def bootstrap_jobs(workers=None):
+    if workers is None:
+        workers = int(os.environ.get('DT_BOOTSTRAP_JOBS', 0)) or os.cpu_count() or 1
+    return max(1, workers)
+
+
+def bootstrap_metrics(y_true, y_pred, y_proba=None, n_boot=BOOTSTRAP_SAMPLES,
+                      seed=BOOTSTRAP_SEED, workers=None):
+    """Nilai setiap metrik pada `n_boot` resample bootstrap (dict metrik -> array)."""
+    y_true = np.asarray(y_true).astype(int)
+    y_pred = np.asarray(y_pred).astype(int)
+    y_proba = None if y_proba is None else np.asarray(y_proba, dtype=float)
+    n = len(y_true)
+
+    batch = max(1, min(n_boot, BATCH_ELEMENTS // max(n, 1)))
+    sizes = [min(batch, n_boot - start) for start in range(0, n_boot, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    run_batch = partial(_bootstrap_batch, y_true=y_true, y_pred=y_pred, y_proba=y_proba)
+
+    jobs = min(bootstrap_jobs(workers), len(sizes))
+    if jobs > 1 and n_boot * n >= PARALLEL_MIN_ELEMENTS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            parts = list(pool.map(run_batch, seeds, sizes))
+    else:
+        parts = [run_batch(s, size) for s, size in zip(seeds, sizes)]
+
+    return {metric: np.concatenate([part[metric] for part in parts]) for metric in parts[0]}
+
+
+def confidence_intervals(samples, confidence=CONFIDENCE):
+    """Interval percentile per metrik: dict metrik -> (low, high); NaN diabaikan."""
+    alpha = (1 - confidence) / 2 * 100
+    intervals = {}
+    for metric, values in samples.items():
+        values = values[~np.isnan(values)]
+        intervals[metric] = ((float(np.percentile(values, alpha)),
+                              float(np.percentile(values, 100 - alpha)))
+                             if len(values) else (np.nan, np.nan))
+    return intervals
+
+
+def metric_intervals(y_true, y_pred, y_proba=None, n_boot=BOOTSTRAP_SAMPLES,
+                     confidence=CONFIDENCE, seed=BOOTSTRAP_SEED, workers=None):
+    samples = bootstrap_metrics(y_true, y_pred, y_proba, n_boot=n_boot, seed=seed,
+                                workers=workers)
+    return confidence_intervals(samples, confidence)
+
+
+# ============================================
+# 3. ROC / PR CURVES (SATU SORT)
+# ============================================
+
+@dataclass
+class Curves:
+    """Kurva ROC & PR lengkap satu vektor probabilitas (threshold menurun)."""
+    thresholds: np.ndarray
+    fpr: np.ndarray            # diawali titik (0, 0)
+    tpr: np.ndarray
+    precision: np.ndarray      # diawali titik recall 0, precision 1 (seperti sklearn)
+    recall: np.ndarray
+    roc_auc: float
+    pr_auc: float              # trapesium di bawah kurva PR
+    average_precision: float   # sum (R_k - R_k-1) * P_k, sama dengan sklearn
+
+
+def binary_clf_curve(y_true, proba):
+    """TP/FP kumulatif di setiap threshold unik (prediksi positif bila proba >= threshold)."""
+    y_true = np.asarray(y_true).astype(bool)
+    proba = np.asarray(proba, dtype=float)
+
+    order = np.argsort(-proba, kind='stable')
+    proba_sorted = proba[order]
+    tp_cum = np.cumsum(y_true[order], dtype=np.int64)
+
+    # Index terakhir setiap grup probabilitas yang sama = semua baris >= threshold
+    last = np.flatnonzero(np.diff(proba_sorted, append=-np.inf))
+    tps = tp_cum[last]
+    return proba_sorted[last], tps, last + 1 - tps
+
+
+def compute_curves(y_true, proba):
+    thresholds, tps, fps = binary_clf_curve(y_true, proba)
+    n_pos = tps[-1] if len(tps) else 0
+    n_neg = fps[-1] if len(fps) else 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fpr = np.r_[0.0, fps / n_neg]
+        tpr = np.r_[0.0, tps / n_pos]
+        recall = np.r_[0.0, tps / n_pos]
+        precision = np.r_[1.0, tps / (tps + fps)]
+
+    # Satu kelas saja -> AUC tidak terdefinisi
+    roc_auc = float(np.trapezoid(tpr, fpr)) if n_pos and n_neg else np.nan
+    if n_pos:
+        pr_auc = float(np.trapezoid(precision, recall))
+        average_precision = float(np.sum(np.diff(recall) * precision[1:]))
+    else:
+        pr_auc = average_precision = np.nan
+    return Curves(thresholds=thresholds, fpr=fpr, tpr=tpr, precision=precision,
+                  recall=recall, roc_auc=roc_auc, pr_auc=pr_auc,
+                  average_precision=average_precision)
+
+
+def downsample_curve(x, y, max_points=CURVE_POINTS):
+    """Titik kurva berjarak sama sepanjang panjang lintasan (ujung selalu ikut)."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    if len(x) <= max_points:
+        return x, y
+    path = np.r_[0.0, np.cumsum(np.hypot(np.diff(x), np.diff(y)))]
+    targets = np.linspace(0.0, path[-1], max_points)
+    idx = np.unique(np.r_[0, np.searchsorted(path, targets), len(x) - 1].clip(0, len(x) - 1))
+    return x[idx], y[idx]
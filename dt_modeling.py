@@ -8,433 +8,1259 @@ Compare Multiple Decision Tree Variations:
 3. Decision Tree - Balanced
 4. Decision Tree - Pruned
 5. Random Forest
-6. XGBoost (Bonus)
+6. Histogram Gradient Boosting (bonus, binned-histogram booster ala XGBoost/LightGBM)
 """
 
+import argparse
+import json
+import os
+import pickle
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from dataclasses import dataclass, field
+from datetime import datetime
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.tree import DecisionTreeClassifier, plot_tree
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import (accuracy_score, precision_score, recall_score, 
-                             f1_score, confusion_matrix, classification_report,
-                             roc_auc_score, roc_curve)
-from sklearn.model_selection import cross_val_score, GridSearchCV
+from sklearn.tree import DecisionTreeClassifier, export_graphviz, plot_tree
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import (accuracy_score, precision_score, recall_score,
+                             f1_score, confusion_matrix, classification_report)
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.inspection import permutation_importance
+from sklearn.model_selection import (GridSearchCV, HalvingRandomSearchCV, ParameterGrid,
+                                     ParameterSampler, StratifiedKFold, cross_validate)
+import joblib
+import sklearn
 import warnings
 warnings.filterwarnings('ignore')
 
-print("="*70)
-print("DECISION TREE MODELING - MULTIPLE VARIATIONS")
-print("="*70)
+import dt_cache
+import dt_calibration
+import dt_data_preparation
+import dt_metrics
+import dt_plots
+import dt_profile
+import dt_report
+import dt_threshold
+
+DT_MODELS = ['DT Basic', 'DT Balanced', 'DT Pruned']
+
+# Fold CV dibangun sekali (StratifiedKFold, sama dengan cv=5 default sklearn)
+# dan dipakai semua model; semua metrik dihitung dalam satu cross_validate
+CV_FOLDS = 5
+CV_SCORING = ['accuracy', 'precision', 'recall', 'f1', 'roc_auc']
+
+# Model terbaik + metadata untuk scoring tanpa training ulang
+PERMUTATION_REPEATS = 10  # model tanpa feature_importances_ (HGB)
+
+MODEL_FILE = 'best_model.joblib'
+
+# Record run (metrik + biaya per model) dalam format JSON
+RUN_RECORD_FILE = 'model_run_record.json'
+
+# Jumlah baris untuk mengukur latency prediksi
+LATENCY_ROWS = 1000
+LATENCY_REPEATS = 3
+
+PARAM_GRID = {
+    'max_depth': [3, 5, 7, 10, None],
+    'min_samples_split': [2, 5, 10, 20],
+    'min_samples_leaf': [1, 2, 5, 10],
+    'class_weight': ['balanced']
+}
+
+# Ruang parameter yang lebih luas untuk strategi berbasis budget (halving/random):
+# menambah parameter di sini tidak melipatgandakan waktu search
+PARAM_SPACE = {
+    **PARAM_GRID,
+    'criterion': ['gini', 'entropy'],
+    'max_features': [None, 'sqrt'],
+    'ccp_alpha': [0.0, 0.001, 0.005, 0.01, 0.02],
+}
+
+# Strategi hyperparameter search DT Pruned: 'grid' (PARAM_GRID penuh, default agar
+# hasil sama dengan versi sebelumnya), 'halving' atau 'random' (PARAM_SPACE + budget)
+SEARCH_STRATEGY = 'grid'
+SEARCH_BUDGET = 40      # jumlah konfigurasi yang dievaluasi (halving: kandidat awal)
+SEARCH_PATIENCE = 10    # random: berhenti bila F1 tidak naik selama N konfigurasi
+SEARCH_TOL = 1e-4
+
+# Strategi 'ccp': tree balanced penuh ditumbuhkan sekali per fold, lalu semua subtree
+# di cost-complexity pruning path dievaluasi tanpa fit ulang
+CCP_TREE_PARAMS = {'class_weight': 'balanced'}
+
+
+@dataclass
+class ModelResult:
+    """Satu varian model: estimator, prediksi pada test set, dan metriknya."""
+    name: str
+    model: object
+    y_pred: np.ndarray
+    y_proba: np.ndarray = None
+    metrics: dict = field(default_factory=dict)
+    cv_scores: np.ndarray = None
+    best_params: dict = None
+    cv_results: dict = None        # skor per fold untuk setiap metrik CV_SCORING
+    cv_estimators: list = None     # estimator hasil fit per fold
+    oof_proba: np.ndarray = None   # probabilitas out-of-fold kelas 1 (urutan X_train)
+    search_path: pd.DataFrame = None  # frontier ccp_alpha vs CV F1 / jumlah leaf (--search ccp)
+    fit_seconds: float = None      # waktu fit model final pada training set
+    fit_peak_rss_mb: float = None  # RSS puncak proses selama fit
+    model_bytes: int = None        # ukuran estimator ter-serialisasi (pickle)
+    predict_ms_per_1k: float = None  # latency predict_proba per 1000 baris
+    n_nodes: int = None            # total node (semua tree / iterasi boosting)
+    n_leaves: int = None
+    curves: object = None          # dt_metrics.Curves (ROC/PR test set, satu sort)
+
+
+@dataclass
+class ModelBundle:
+    """Output PART 3: semua model terlatih + model terbaik."""
+    prepared: object
+    results: dict
+    comparison: pd.DataFrame
+    best_model_name: str
+    feature_importance: pd.DataFrame = None
+    best_params: dict = None
+    calibrator: object = None      # dt_calibration.Calibrator dari probabilitas OOF model terbaik
+    threshold: object = None       # dt_threshold.ThresholdChoice dipilih pada probabilitas OOF
+    threshold_sweep: pd.DataFrame = None
+
+    @property
+    def best(self):
+        # Baseline tidak punya estimator -> fallback ke DT Basic
+        result = self.results[self.best_model_name]
+        return result if result.model is not None else self.results['DT Basic']
+
+    @property
+    def best_model(self):
+        return self.best.model
+
+    @property
+    def folds(self):
+        # Deterministik (StratifiedKFold tanpa shuffle) -> sama dengan fold saat training
+        return cv_folds(self.prepared)
+
+    @property
+    def predictions(self):
+        # Label memakai cutoff OOF (sama dengan SavedModel.predict), bukan 0.5
+        y_pred = self.best.y_pred
+        if self.threshold is not None:
+            y_pred = (self.best.y_proba >= self.threshold.threshold).astype(int)
+        predictions = pd.DataFrame({
+            'actual': np.asarray(self.prepared.y_test),
+            'predicted': y_pred,
+            'probability_class_1': self.best.y_proba
+        })
+        if self.calibrator is not None:
+            predictions['calibrated_probability'] = self.calibrator.transform(self.best.y_proba)
+        return predictions
+
+
+@dataclass
+class SavedModel:
+    """Model terbaik yang dipersist: estimator + semua yang dibutuhkan untuk scoring."""
+    name: str
+    model: object
+    feature_cols: list
+    kabupaten_classes: list
+    granularity: str
+    metrics: dict
+    best_params: dict
+    trained_at: str
+    n_train: int
+    data_key: str = None
+    sklearn_version: str = None
+    calibrator: object = None      # None untuk model yang disimpan sebelum ada kalibrasi
+    threshold: float = None        # cutoff probabilitas mentah (OOF); None untuk model lama
+
+    @property
+    def kabupaten_mapping(self):
+        return dict(zip(self.kabupaten_classes, range(len(self.kabupaten_classes))))
+
+    def predict_proba(self, X):
+        """Probabilitas kelas 1 (berisiko); kolom X diurutkan sesuai feature_cols."""
+        return self.model.predict_proba(X[self.feature_cols])[:, 1]
+
+    def calibrate(self, proba):
+        """Terapkan kalibrasi OOF ke probabilitas mentah (tanpa kalibrator: apa adanya)."""
+        return proba if self.calibrator is None else self.calibrator.transform(proba)
+
+    def predict_calibrated_proba(self, X):
+        return self.calibrate(self.predict_proba(X))
+
+    def classify(self, proba):
+        """Label dari probabilitas mentah: >= cutoff OOF (model lama: argmax, proba > 0.5)."""
+        if self.threshold is None:
+            return (np.asarray(proba) > 0.5).astype(int)
+        return (np.asarray(proba) >= self.threshold).astype(int)
+
+    def predict(self, X):
+        return self.classify(self.predict_proba(X))
+
+
+# ============================================
+# HELPERS
+# ============================================
+
+def score_predictions(y_test, y_pred, curves=None):
+    """Metrik test set; ROC-AUC & average precision diambil dari `curves` (tanpa sort ulang)."""
+    metrics = {
+        'Accuracy': accuracy_score(y_test, y_pred),
+        'Precision': precision_score(y_test, y_pred, zero_division=0),
+        'Recall': recall_score(y_test, y_pred, zero_division=0),
+        'F1-Score': f1_score(y_test, y_pred, zero_division=0),
+        'ROC-AUC': curves.roc_auc if curves is not None else 0,
+        'Average Precision': curves.average_precision if curves is not None else 0,
+    }
+    return metrics
+
+
+def curves_of(result, y_test):
+    """Kurva ROC/PR model (dihitung sekali lalu disimpan di ModelResult)."""
+    if result.curves is None and result.y_proba is not None:
+        result.curves = dt_metrics.compute_curves(y_test, result.y_proba)
+    return result.curves
+
+
+def print_performance(metrics, with_auc=True):
+    print(f"\nPerformance:")
+    print(f"  Accuracy:  {metrics['Accuracy']:.4f} ({metrics['Accuracy']*100:.2f}%)")
+    print(f"  Precision: {metrics['Precision']:.4f}")
+    print(f"  Recall:    {metrics['Recall']:.4f}")
+    print(f"  F1-Score:  {metrics['F1-Score']:.4f}")
+    if with_auc:
+        print(f"  ROC-AUC:   {metrics['ROC-AUC']:.4f}")
+        print(f"  Avg Prec:  {metrics['Average Precision']:.4f}")
+
+
+def print_tree_size(model):
+    print(f"\nTree Depth: {model.get_depth()}")
+    print(f"Number of Leaves: {model.get_n_leaves()}")
+
+
+def measured_fit(name, model, X, y):
+    """Fit estimator sebagai tahap `fit:<name>` (log profiling).
+
+    Return (durasi fit dalam detik, RSS puncak dalam MB atau None).
+    """
+    with dt_profile.stage(f'fit:{name}', estimator=type(model).__name__, rows=len(X)) as record:
+        model.fit(X, y)
+    return record['wall_s'], record['peak_rss_mb']
+
+
+def model_size(model):
+    """Ukuran estimator dalam byte setelah di-pickle (0 untuk baseline tanpa estimator)."""
+    return 0 if model is None else len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def tree_complexity(model):
+    """(jumlah node, jumlah leaf) untuk DT, Random Forest, atau HistGradientBoosting."""
+    if hasattr(model, 'tree_'):
+        return model.tree_.node_count, model.get_n_leaves()
+    if hasattr(model, 'estimators_'):
+        return (sum(tree.tree_.node_count for tree in model.estimators_),
+                sum(tree.get_n_leaves() for tree in model.estimators_))
+    if hasattr(model, '_predictors'):
+        nodes = [predictor.nodes for iteration in model._predictors for predictor in iteration]
+        return sum(len(n) for n in nodes), sum(int(n['is_leaf'].sum()) for n in nodes)
+    return None, None
+
+
+def predict_latency(model, X, rows=LATENCY_ROWS, repeats=LATENCY_REPEATS):
+    """Latency predict_proba (ms per 1000 baris, best of `repeats`) pada X yang diulang ke `rows` baris."""
+    X_bench = X.iloc[np.resize(np.arange(len(X)), rows)]
+    model.predict_proba(X_bench)  # warm-up
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(X_bench)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000 * 1000 / rows
+
+
+def measure_costs(results, X):
+    """Isi ukuran, jumlah node/leaf, dan latency prediksi setiap model.
+
+    Dijalankan berurutan di proses utama setelah semua fit selesai (juga saat cache
+    hit), agar latency tidak terganggu worker lain.
+    """
+    for result in results.values():
+        result.model_bytes = model_size(result.model)
+        if result.model is None:
+            continue
+        result.n_nodes, result.n_leaves = tree_complexity(result.model)
+        result.predict_ms_per_1k = predict_latency(result.model, X)
+    return results
+
+
+def data_fingerprint(prepared):
+    """Identitas isi data training/testing untuk key cache model."""
+    if prepared.cache_key is None:
+        prepared.cache_key = dt_cache.frame_digest(prepared.X_train, prepared.y_train,
+                                                   prepared.X_test, prepared.y_test)
+    return prepared.cache_key
+
+
+def cv_folds(prepared, n_splits=CV_FOLDS):
+    """Fold stratified dibangun sekali dan dipakai bersama oleh semua model (dan grid search)."""
+    splitter = StratifiedKFold(n_splits=n_splits)
+    return list(splitter.split(prepared.X_train, prepared.y_train))
+
+
+def cross_validate_model(model, prepared, folds):
+    """Satu kali cross_validate multi-metric; estimator per fold dipakai ulang untuk OOF."""
+    X_train, y_train = prepared.X_train, prepared.y_train
+    cv = cross_validate(model, X_train, y_train, cv=folds, scoring=CV_SCORING,
+                        return_estimator=True)
+
+    oof_proba = np.full(len(y_train), np.nan)
+    for estimator, (_, test_idx) in zip(cv['estimator'], folds):
+        oof_proba[test_idx] = estimator.predict_proba(X_train.iloc[test_idx])[:, 1]
+
+    cv_results = {metric: cv[f'test_{metric}'] for metric in CV_SCORING}
+    return cv_results, cv['estimator'], oof_proba
+
+
+def fit_model(name, model, prepared, folds=None, cache=None):
+    """Fit estimator pada training set, evaluasi di test set, lalu CV multi-metric.
+
+    Dengan `cache`, hasil (estimator + prediksi + hasil CV, termasuk estimator per
+    fold dan probabilitas OOF) disimpan dengan key dari hash data dan hyperparameter
+    sehingga fit ulang dilewati saat cache hit.
+    """
+    if folds is None:
+        folds = cv_folds(prepared)
+
+    key = None
+    if cache is not None:
+        # n_jobs tidak mengubah hasil -> tidak ikut key
+        params = {k: v for k, v in model.get_params().items() if k != 'n_jobs'}
+        key = dt_cache.make_key('fit', data_fingerprint(prepared), name,
+                                type(model).__name__, params, len(folds), CV_SCORING)
+        cached = cache.load_object(key)
+        # Entry lama tanpa metrik biaya fit atau kurva ROC/PR di-fit ulang
+        if cached is not None and 'curves' in vars(cached):
+            print(f"✅ Cache hit: {name} (fit skipped)")
+            return cached
+
+    fit_seconds, fit_peak_rss_mb = measured_fit(name, model, prepared.X_train, prepared.y_train)
+
+    # Predictions
+    y_pred = model.predict(prepared.X_test)
+    y_proba = model.predict_proba(prepared.X_test)[:, 1]
+
+    # Metrics (kurva ROC/PR sekali per model, dipakai tabel & plot)
+    curves = dt_metrics.compute_curves(prepared.y_test, y_proba)
+    metrics = score_predictions(prepared.y_test, y_pred, curves)
+
+    with dt_profile.stage(f'cv:{name}', folds=len(folds)):
+        cv_results, cv_estimators, oof_proba = cross_validate_model(model, prepared, folds)
+
+    result = ModelResult(name=name, model=model, y_pred=y_pred, y_proba=y_proba,
+                         metrics=metrics, cv_scores=cv_results['f1'],
+                         cv_results=cv_results, cv_estimators=cv_estimators,
+                         oof_proba=oof_proba, fit_seconds=fit_seconds,
+                         fit_peak_rss_mb=fit_peak_rss_mb, curves=curves)
+    if cache is not None:
+        cache.store_object(key, result)
+    return result
+
+
+def print_cv(result):
+    cv_scores = result.cv_scores
+    print(f"\nCross-Validation F1-Score: {cv_scores.mean():.4f} (+/- {cv_scores.std():.4f})")
+    if result.cv_results:
+        means = ', '.join(f"{metric}={scores.mean():.4f}"
+                          for metric, scores in result.cv_results.items() if metric != 'f1')
+        print(f"Cross-Validation (mean): {means}")
+
 
 # ============================================
 # 1. LOAD PREPARED DATA
 # ============================================
 
-print("\n[1] LOADING PREPARED DATA...")
-print("-" * 70)
+def load_prepared():
+    print("\n[1] LOADING PREPARED DATA...")
+    print("-" * 70)
+
+    return dt_data_preparation.load_prepared()
+
 
-X_train = pd.read_csv('X_train.csv')
-X_test = pd.read_csv('X_test.csv')
-y_train = pd.read_csv('y_train.csv')['berisiko']
-y_test = pd.read_csv('y_test.csv')['berisiko']
+def print_training_overview(prepared):
+    y_train = prepared.y_train
 
-print(f"✅ Training set: {X_train.shape}")
-print(f"✅ Testing set: {X_test.shape}")
+    print(f"✅ Training set: {prepared.X_train.shape}")
+    print(f"✅ Testing set: {prepared.X_test.shape}")
+
+    print(f"\nClass distribution in training:")
+    print(y_train.value_counts())
+    print(f"\nImbalance ratio: {y_train.value_counts()[0]/y_train.value_counts()[1]:.2f}:1")
 
-print(f"\nClass distribution in training:")
-print(y_train.value_counts())
-print(f"\nImbalance ratio: {y_train.value_counts()[0]/y_train.value_counts()[1]:.2f}:1")
 
 # ============================================
 # 2. BASELINE MODEL
 # ============================================
 
-print("\n" + "="*70)
-print("MODEL 1: BASELINE (MAJORITY CLASS PREDICTOR)")
-print("="*70)
+def fit_baseline(prepared, cache=None, n_jobs=None, folds=None):
+    # Predict majority class for all samples
+    majority_class = prepared.y_train.mode()[0]
+    y_pred_baseline = np.full(len(prepared.y_test), majority_class)
+
+    # Evaluate
+    metrics = score_predictions(prepared.y_test, y_pred_baseline)
+    return ModelResult(name='Baseline', model=None, y_pred=y_pred_baseline,
+                       metrics=metrics, fit_seconds=0.0)
+
 
-# Predict majority class for all samples
-majority_class = y_train.mode()[0]
-y_pred_baseline = np.full(len(y_test), majority_class)
+def report_baseline(result):
+    print("\n" + "="*70)
+    print("MODEL 1: BASELINE (MAJORITY CLASS PREDICTOR)")
+    print("="*70)
 
-# Evaluate
-baseline_acc = accuracy_score(y_test, y_pred_baseline)
-baseline_precision = precision_score(y_test, y_pred_baseline, zero_division=0)
-baseline_recall = recall_score(y_test, y_pred_baseline, zero_division=0)
-baseline_f1 = f1_score(y_test, y_pred_baseline, zero_division=0)
+    print(f"\nBaseline Strategy: Always predict class {result.y_pred[0]}")
+    print_performance(result.metrics, with_auc=False)
 
-print(f"\nBaseline Strategy: Always predict class {majority_class}")
-print(f"\nPerformance:")
-print(f"  Accuracy:  {baseline_acc:.4f} ({baseline_acc*100:.2f}%)")
-print(f"  Precision: {baseline_precision:.4f}")
-print(f"  Recall:    {baseline_recall:.4f}")
-print(f"  F1-Score:  {baseline_f1:.4f}")
+    print(f"\n⚠️ Note: High accuracy is misleading due to class imbalance!")
 
-print(f"\n⚠️ Note: High accuracy is misleading due to class imbalance!")
 
 # ============================================
 # 3. DECISION TREE - BASIC
 # ============================================
 
-print("\n" + "="*70)
-print("MODEL 2: DECISION TREE - BASIC (Default Parameters)")
-print("="*70)
+def fit_dt_basic(prepared, cache=None, n_jobs=None, folds=None):
+    return fit_model('DT Basic', DecisionTreeClassifier(random_state=42), prepared,
+                     folds=folds, cache=cache)
 
-dt_basic = DecisionTreeClassifier(random_state=42)
-dt_basic.fit(X_train, y_train)
 
-# Predictions
-y_pred_basic = dt_basic.predict(X_test)
-y_proba_basic = dt_basic.predict_proba(X_test)[:, 1]
+def report_dt_basic(result, baseline):
+    print("\n" + "="*70)
+    print("MODEL 2: DECISION TREE - BASIC (Default Parameters)")
+    print("="*70)
 
-# Metrics
-acc_basic = accuracy_score(y_test, y_pred_basic)
-prec_basic = precision_score(y_test, y_pred_basic, zero_division=0)
-rec_basic = recall_score(y_test, y_pred_basic, zero_division=0)
-f1_basic = f1_score(y_test, y_pred_basic, zero_division=0)
-auc_basic = roc_auc_score(y_test, y_proba_basic)
+    m, ref = result.metrics, baseline.metrics
 
-print(f"\nTree Depth: {dt_basic.get_depth()}")
-print(f"Number of Leaves: {dt_basic.get_n_leaves()}")
+    print_tree_size(result.model)
+    print_performance(m)
 
-print(f"\nPerformance:")
-print(f"  Accuracy:  {acc_basic:.4f} ({acc_basic*100:.2f}%)")
-print(f"  Precision: {prec_basic:.4f}")
-print(f"  Recall:    {rec_basic:.4f}")
-print(f"  F1-Score:  {f1_basic:.4f}")
-print(f"  ROC-AUC:   {auc_basic:.4f}")
+    print(f"\nImprovement vs Baseline:")
+    print(f"  Accuracy:  {(m['Accuracy'] - ref['Accuracy'])*100:+.2f}%")
+    print(f"  F1-Score:  {(m['F1-Score'] - ref['F1-Score']):+.4f}")
 
-print(f"\nImprovement vs Baseline:")
-print(f"  Accuracy:  {(acc_basic - baseline_acc)*100:+.2f}%")
-print(f"  F1-Score:  {(f1_basic - baseline_f1):+.4f}")
+    print_cv(result)
 
-# Cross-validation
-cv_scores_basic = cross_val_score(dt_basic, X_train, y_train, cv=5, scoring='f1')
-print(f"\nCross-Validation F1-Score: {cv_scores_basic.mean():.4f} (+/- {cv_scores_basic.std():.4f})")
 
 # ============================================
 # 4. DECISION TREE - BALANCED
 # ============================================
 
-print("\n" + "="*70)
-print("MODEL 3: DECISION TREE - BALANCED (class_weight='balanced')")
-print("="*70)
-
-dt_balanced = DecisionTreeClassifier(
-    class_weight='balanced',
-    random_state=42
-)
-dt_balanced.fit(X_train, y_train)
-
-# Predictions
-y_pred_balanced = dt_balanced.predict(X_test)
-y_proba_balanced = dt_balanced.predict_proba(X_test)[:, 1]
-
-# Metrics
-acc_balanced = accuracy_score(y_test, y_pred_balanced)
-prec_balanced = precision_score(y_test, y_pred_balanced, zero_division=0)
-rec_balanced = recall_score(y_test, y_pred_balanced, zero_division=0)
-f1_balanced = f1_score(y_test, y_pred_balanced, zero_division=0)
-auc_balanced = roc_auc_score(y_test, y_proba_balanced)
-
-print(f"\nTree Depth: {dt_balanced.get_depth()}")
-print(f"Number of Leaves: {dt_balanced.get_n_leaves()}")
-
-print(f"\nPerformance:")
-print(f"  Accuracy:  {acc_balanced:.4f} ({acc_balanced*100:.2f}%)")
-print(f"  Precision: {prec_balanced:.4f}")
-print(f"  Recall:    {rec_balanced:.4f}")
-print(f"  F1-Score:  {f1_balanced:.4f}")
-print(f"  ROC-AUC:   {auc_balanced:.4f}")
-
-print(f"\nImprovement vs Basic DT:")
-print(f"  Precision: {(prec_balanced - prec_basic):+.4f}")
-print(f"  Recall:    {(rec_balanced - rec_basic):+.4f}")
-print(f"  F1-Score:  {(f1_balanced - f1_basic):+.4f}")
-
-# Cross-validation
-cv_scores_balanced = cross_val_score(dt_balanced, X_train, y_train, cv=5, scoring='f1')
-print(f"\nCross-Validation F1-Score: {cv_scores_balanced.mean():.4f} (+/- {cv_scores_balanced.std():.4f})")
+def fit_dt_balanced(prepared, cache=None, n_jobs=None, folds=None):
+    dt_balanced = DecisionTreeClassifier(
+        class_weight='balanced',
+        random_state=42
+    )
+    return fit_model('DT Balanced', dt_balanced, prepared, folds=folds, cache=cache)
+
+
+def report_dt_balanced(result, basic):
+    print("\n" + "="*70)
+    print("MODEL 3: DECISION TREE - BALANCED (class_weight='balanced')")
+    print("="*70)
+
+    m, ref = result.metrics, basic.metrics
+
+    print_tree_size(result.model)
+    print_performance(m)
+
+    print(f"\nImprovement vs Basic DT:")
+    print(f"  Precision: {(m['Precision'] - ref['Precision']):+.4f}")
+    print(f"  Recall:    {(m['Recall'] - ref['Recall']):+.4f}")
+    print(f"  F1-Score:  {(m['F1-Score'] - ref['F1-Score']):+.4f}")
+
+    print_cv(result)
+
 
 # ============================================
 # 5. DECISION TREE - PRUNED (Tuned)
 # ============================================
 
-print("\n" + "="*70)
-print("MODEL 4: DECISION TREE - PRUNED (Hyperparameter Tuning)")
-print("="*70)
-
-print("\nSearching for optimal hyperparameters...")
+@dataclass
+class SearchResult:
+    """Hasil satu strategi search: best estimator (sudah di-refit pada training set)."""
+    model: object
+    best_params: dict
+    refit_seconds: float = None    # waktu refit best params (tanpa waktu search)
+    refit_peak_rss_mb: float = None
+    cv_results: dict = None        # skor per fold best params (fold bersama), bila search menyimpannya
+
+
+def grid_search(prepared, param_grid, folds, n_jobs=-1, budget=None, cache=None):
+    """GridSearchCV penuh (semua kombinasi, budget diabaikan).
+
+    Scoring multi-metric (refit F1) pada fold bersama, sehingga skor per fold semua
+    metrik CV_SCORING untuk best params langsung terbaca dari cv_results_.
+    """
+    dt_grid = GridSearchCV(
+        DecisionTreeClassifier(random_state=42),
+        param_grid,
+        cv=folds,
+        scoring=CV_SCORING,
+        refit='f1',
+        n_jobs=n_jobs,
+        verbose=0
+    )
+
+    dt_grid.fit(prepared.X_train, prepared.y_train)
+    best = dt_grid.best_index_
+    cv_results = {metric: np.array([dt_grid.cv_results_[f'split{i}_test_{metric}'][best]
+                                    for i in range(len(folds))])
+                  for metric in CV_SCORING}
+    return SearchResult(dt_grid.best_estimator_, dt_grid.best_params_,
+                        refit_seconds=dt_grid.refit_time_, cv_results=cv_results)
+
+
+def halving_search(prepared, param_grid, folds, n_jobs=-1, budget=SEARCH_BUDGET, cache=None):
+    """Successive halving: `budget` kandidat acak, yang terbaik dievaluasi dengan data makin banyak."""
+    search = HalvingRandomSearchCV(
+        DecisionTreeClassifier(random_state=42),
+        param_grid,
+        n_candidates=budget,
+        factor=3,
+        cv=StratifiedKFold(n_splits=len(folds)),
+        scoring='f1',
+        random_state=42,
+        n_jobs=n_jobs,
+    )
+    search.fit(prepared.X_train, prepared.y_train)
+    print(f"   Halving search: {budget} candidates, {search.n_iterations_} iterations")
+    # Skor iterasi terakhir dihitung pada subsample -> CV best params tidak dipakai ulang
+    return SearchResult(search.best_estimator_, search.best_params_,
+                        refit_seconds=search.refit_time_)
+
+
+def evaluate_config(params, prepared, folds, n_jobs=-1, cache=None):
+    """Mean CV F1 satu konfigurasi DT; di-cache per konfigurasi (warm start antar run)."""
+    key = None
+    if cache is not None:
+        key = dt_cache.make_key('config', data_fingerprint(prepared), params, len(folds), 'f1')
+        cached = cache.load_object(key)
+        if cached is not None:
+            return cached
+
+    model = DecisionTreeClassifier(random_state=42, **params)
+    score = float(cross_validate(model, prepared.X_train, prepared.y_train, cv=folds,
+                                 scoring='f1', n_jobs=n_jobs)['test_score'].mean())
+    if cache is not None:
+        cache.store_object(key, score)
+    return score
+
+
+def random_search(prepared, param_grid, folds, n_jobs=-1, budget=SEARCH_BUDGET, cache=None,
+                  patience=SEARCH_PATIENCE):
+    """Random search dengan budget konfigurasi dan early stopping saat F1 plateau."""
+    candidates = list(ParameterSampler(param_grid, n_iter=min(budget, len(ParameterGrid(param_grid))),
+                                       random_state=42))
+    best_params, best_score, stale = None, -np.inf, 0
+    for i, params in enumerate(candidates, 1):
+        score = evaluate_config(params, prepared, folds, n_jobs=n_jobs, cache=cache)
+        if score > best_score + SEARCH_TOL:
+            best_params, best_score, stale = params, score, 0
+        else:
+            stale += 1
+        if stale >= patience:
+            print(f"   Random search: F1 plateau after {i} configs (early stop)")
+            break
+    else:
+        print(f"   Random search: {len(candidates)} configs evaluated")
+
+    model = DecisionTreeClassifier(random_state=42, **best_params)
+    fit_seconds, fit_peak_rss_mb = measured_fit('DT Pruned', model, prepared.X_train, prepared.y_train)
+    return SearchResult(model, best_params, fit_seconds, fit_peak_rss_mb)
+
+
+def ccp_collapse_alphas(tree):
+    """Alpha saat setiap node internal dipangkas menjadi leaf (weakest-link pruning).
+
+    Mengikuti algoritma minimal cost-complexity pruning sklearn: node dengan
+    g(t) = (R(t) - R(T_t)) / (|T_t| - 1) terkecil dipangkas lebih dulu. Node yang
+    hilang karena ancestor-nya dipangkas mendapat alpha ancestor tersebut, sehingga
+    sepanjang satu decision path nilainya tidak naik terhadap kedalaman. Leaf asli: -inf.
+    """
+    t = tree.tree_
+    left, right = t.children_left, t.children_right
+    internal = left != -1
+    r_node = t.impurity * t.weighted_n_node_samples / t.weighted_n_node_samples[0]
+
+    parent = np.full(t.node_count, -1)
+    parent[left[internal]] = np.flatnonzero(internal)
+    parent[right[internal]] = np.flatnonzero(internal)
+
+    # R(T_t) dan |T_t| per subtree (id child selalu > id parent)
+    r_branch = np.where(internal, 0.0, r_node)
+    n_leaves = (~internal).astype(float)
+    for node in range(t.node_count - 1, 0, -1):
+        r_branch[parent[node]] += r_branch[node]
+        n_leaves[parent[node]] += n_leaves[node]
+
+    collapse = np.where(internal, np.inf, -np.inf)
+    active = internal.copy()
+    while active.any():
+        idx = np.flatnonzero(active)
+        g = (r_node[idx] - r_branch[idx]) / (n_leaves[idx] - 1)
+        weakest, alpha = idx[np.argmin(g)], g.min()
+
+        stack = [weakest]
+        while stack:
+            node = stack.pop()
+            if active[node]:
+                active[node] = False
+                collapse[node] = alpha
+                stack.extend((left[node], right[node]))
+
+        delta_r, delta_leaves = r_node[weakest] - r_branch[weakest], 1 - n_leaves[weakest]
+        node = weakest
+        while node != -1:
+            r_branch[node] += delta_r
+            n_leaves[node] += delta_leaves
+            node = parent[node]
+    return collapse
+
+
+def pruned_subtree_predict(tree, X, alphas, chunk_elements=1 << 22):
+    """Prediksi kelas 1 (n_samples x len(alphas)) untuk setiap subtree ccp_alpha.
+
+    Leaf efektif suatu sampel pada alpha a = node pertama di decision path-nya
+    yang sudah dipangkas (collapse <= a); cukup satu decision_path untuk semua alpha.
+    Alpha collapse tidak naik sepanjang path, jadi posisi node itu didapat dengan
+    searchsorted; memori O(n x depth) + satu batch alpha (<= chunk_elements sel).
+    """
+    alphas = np.asarray(alphas, dtype=float)
+    collapse = ccp_collapse_alphas(tree)
+    path = tree.decision_path(X)
+    n = path.shape[0]
+    depth = np.diff(path.indptr)
+    rows = np.repeat(np.arange(n), depth)
+
+    # Rank menurun (collapse besar -> rank kecil) lalu offset per baris: key naik global
+    levels = np.unique(np.r_[collapse, alphas])
+    top = len(levels)
+    keys = rows * (top + 1) + (top - np.searchsorted(levels, collapse[path.indices]))
+    alpha_rank = top - np.searchsorted(levels, alphas)
+
+    value = tree.tree_.value[:, 0, :]
+    positive = value[:, 1] > value[:, 0]
+    pred = np.empty((n, len(alphas)), dtype=bool)
+    step = max(1, chunk_elements // max(n, 1))
+    row_key = np.arange(n)[:, None] * (top + 1)
+    for lo in range(0, len(alphas), step):
+        # Jumlah node di path dengan collapse > alpha = posisi leaf efektif
+        keep = np.searchsorted(keys, row_key + alpha_rank[None, lo:lo + step]) - path.indptr[:-1, None]
+        pred[:, lo:lo + step] = positive[path.indices[path.indptr[:-1, None] + keep]]
+    return pred
+
+
+def f1_columns(y_true, y_pred):
+    """F1 (zero_division=0) untuk setiap kolom prediksi sekaligus."""
+    y_true = np.asarray(y_true).astype(bool)[:, None]
+    tp = (y_pred & y_true).sum(axis=0)
+    fp = (y_pred & ~y_true).sum(axis=0)
+    fn = (~y_pred & y_true).sum(axis=0)
+    denom = 2 * tp + fp + fn
+    return np.divide(2 * tp, denom, out=np.zeros(len(tp)), where=denom > 0)
+
+
+def ccp_frontier(X_train, y_train, params, folds):
+    """Frontier satu set parameter tree: semua subtree di pruning path, satu fit per fold."""
+    full_tree = DecisionTreeClassifier(random_state=42, **params).fit(X_train, y_train)
+    path_alphas = np.unique(full_tree.cost_complexity_pruning_path(X_train, y_train).ccp_alphas)
+    alphas = (path_alphas[:-1] + path_alphas[1:]) / 2 if len(path_alphas) > 1 else path_alphas
+
+    fold_f1 = []
+    for train_idx, test_idx in folds:
+        fold_tree = DecisionTreeClassifier(random_state=42, **params)
+        fold_tree.fit(X_train.iloc[train_idx], y_train.iloc[train_idx])
+        y_pred = pruned_subtree_predict(fold_tree, X_train.iloc[test_idx], alphas)
+        fold_f1.append(f1_columns(y_train.iloc[test_idx], y_pred))
+    fold_f1 = np.array(fold_f1)
+
+    collapse = ccp_collapse_alphas(full_tree)
+    return pd.DataFrame({
+        'ccp_alpha': alphas,
+        'n_leaves': 1 + (collapse[:, None] > alphas[None, :]).sum(axis=0),
+        'cv_f1_mean': fold_f1.mean(axis=0),
+        'cv_f1_std': fold_f1.std(axis=0),
+    })
+
+
+def ccp_path_search(prepared, param_grid, folds, n_jobs=-1, budget=None, cache=None):
+    """Pilih ccp_alpha dari pruning path tree penuh: satu fit per fold untuk semua subtree.
+
+    Kandidat alpha = titik tengah interval di path tree penuh (training set), sehingga
+    setiap kandidat mewakili tepat satu subtree. Parameter lain di `param_grid` yang
+    berupa list dicari sebagai grid (satu path per kombinasi, 1 + jumlah fold fit);
+    bila kombinasinya lebih dari `budget`, diambil `budget` kombinasi acak (seed tetap).
+    Subtree dengan CV F1 tertinggi dipilih; bila seri (dalam SEARCH_TOL), subtree
+    dengan leaf paling sedikit (lalu alpha terbesar) yang menang.
+    """
+    X_train, y_train = prepared.X_train, prepared.y_train
+    if 'ccp_alpha' in param_grid:
+        print("   ⚠️ ccp_alpha di param_grid diabaikan: kandidat alpha diambil dari pruning path")
+    grid = {k: v if isinstance(v, list) else [v] for k, v in param_grid.items() if k != 'ccp_alpha'}
+    combos = list(ParameterGrid(grid))
+    if budget is not None and len(combos) > budget:
+        picked = np.random.default_rng(42).choice(len(combos), size=budget, replace=False)
+        print(f"   CCP: {budget} of {len(combos)} parameter combinations (budget)")
+        combos = [combos[i] for i in np.sort(picked)]
+
+    varied = [k for k, v in grid.items() if len(v) > 1]
+    frontier = pd.concat(
+        [ccp_frontier(X_train, y_train, params, folds).assign(**{k: params[k] for k in varied})
+         for params in combos],
+        keys=range(len(combos)), names=['combo', None])
+
+    top = frontier[frontier['cv_f1_mean'] >= frontier['cv_f1_mean'].max() - SEARCH_TOL]
+    combo, row = top.sort_values(['n_leaves', 'ccp_alpha'], ascending=[True, False],
+                                 kind='stable').index[0]
+    best = frontier.loc[(combo, row)]
+    best_params = {**combos[combo], 'ccp_alpha': float(best['ccp_alpha'])}
+    print(f"   CCP path: {len(frontier)} subtrees from {len(combos)} parameter set(s) x "
+          f"{len(folds) + 1} fits, best alpha={best['ccp_alpha']:.6f} "
+          f"({int(best['n_leaves'])} leaves)")
+
+    model = DecisionTreeClassifier(random_state=42, **best_params)
+    fit_seconds, fit_peak_rss_mb = measured_fit('DT Pruned', model, X_train, y_train)
+    model.ccp_path_ = frontier.reset_index(drop=True)
+    return SearchResult(model, best_params, fit_seconds, fit_peak_rss_mb)
+
+
+SEARCH_STRATEGIES = {
+    'grid': grid_search,
+    'halving': halving_search,
+    'random': random_search,
+    'ccp': ccp_path_search,
+}
 
-param_grid = {
-    'max_depth': [3, 5, 7, 10, None],
-    'min_samples_split': [2, 5, 10, 20],
-    'min_samples_leaf': [1, 2, 5, 10],
-    'class_weight': ['balanced']
+# Ruang parameter default per strategi
+SEARCH_SPACES = {
+    'grid': PARAM_GRID,
+    'halving': PARAM_SPACE,
+    'random': PARAM_SPACE,
+    'ccp': CCP_TREE_PARAMS,
 }
 
-dt_grid = GridSearchCV(
-    DecisionTreeClassifier(random_state=42),
-    param_grid,
-    cv=5,
-    scoring='f1',
-    n_jobs=-1,
-    verbose=0
-)
-
-dt_grid.fit(X_train, y_train)
-dt_pruned = dt_grid.best_estimator_
-
-print(f"\n✅ Best Parameters Found:")
-for param, value in dt_grid.best_params_.items():
-    print(f"   {param}: {value}")
-
-# Predictions
-y_pred_pruned = dt_pruned.predict(X_test)
-y_proba_pruned = dt_pruned.predict_proba(X_test)[:, 1]
-
-# Metrics
-acc_pruned = accuracy_score(y_test, y_pred_pruned)
-prec_pruned = precision_score(y_test, y_pred_pruned, zero_division=0)
-rec_pruned = recall_score(y_test, y_pred_pruned, zero_division=0)
-f1_pruned = f1_score(y_test, y_pred_pruned, zero_division=0)
-auc_pruned = roc_auc_score(y_test, y_proba_pruned)
-
-print(f"\nTree Depth: {dt_pruned.get_depth()}")
-print(f"Number of Leaves: {dt_pruned.get_n_leaves()}")
-
-print(f"\nPerformance:")
-print(f"  Accuracy:  {acc_pruned:.4f} ({acc_pruned*100:.2f}%)")
-print(f"  Precision: {prec_pruned:.4f}")
-print(f"  Recall:    {rec_pruned:.4f}")
-print(f"  F1-Score:  {f1_pruned:.4f}")
-print(f"  ROC-AUC:   {auc_pruned:.4f}")
-
-print(f"\nImprovement vs Balanced DT:")
-print(f"  F1-Score: {(f1_pruned - f1_balanced):+.4f}")
-print(f"  ROC-AUC:  {(auc_pruned - auc_balanced):+.4f}")
+
+def search_key(kind, prepared, strategy, param_grid, budget, folds):
+    # budget tidak mempengaruhi grid
+    return dt_cache.make_key(kind, data_fingerprint(prepared), strategy, param_grid,
+                             budget if strategy != 'grid' else None,
+                             len(folds), 'f1')
+
+
+def search_dt_pruned(prepared, param_grid=None, cache=None, n_jobs=-1, folds=None,
+                     strategy=SEARCH_STRATEGY, budget=SEARCH_BUDGET):
+    """Hyperparameter search DT (fold bersama); SearchResult (best estimator + best params) di-cache.
+
+    `strategy`: 'grid' (semua kombinasi PARAM_GRID), 'halving' atau 'random' (PARAM_SPACE,
+    biaya sebanding dengan `budget`, bukan dengan ukuran ruang parameter), atau 'ccp'
+    (cost-complexity pruning path; budget = maks. kombinasi parameter non-alpha).
+    """
+    if folds is None:
+        folds = cv_folds(prepared)
+    if param_grid is None:
+        param_grid = SEARCH_SPACES[strategy]
+
+    key = None
+    if cache is not None:
+        key = search_key('search_result', prepared, strategy, param_grid, budget, folds)
+        cached = cache.load_object(key)
+        if cached is not None:
+            print(f"✅ Cache hit: DT Pruned {strategy} search (search skipped)")
+            return cached
+
+    with dt_profile.stage(f'search:{strategy}', budget=budget):
+        found = SEARCH_STRATEGIES[strategy](prepared, param_grid, folds, n_jobs=n_jobs,
+                                            budget=budget, cache=cache)
+    if cache is not None:
+        cache.store_object(key, found)
+    return found
+
+
+def fit_dt_pruned(prepared, cache=None, n_jobs=-1, folds=None, param_grid=None,
+                  strategy=SEARCH_STRATEGY, budget=SEARCH_BUDGET):
+    """Search + evaluasi best params tanpa fit tambahan; dengan `cache`, seluruh hasil
+    disimpan sehingga cache hit tidak search maupun cross_validate ulang.
+
+    Fit time = refit best params di dalam search (refit_time_, tanpa waktu search).
+    Skor CV dibaca dari search bila tersedia (grid: cv_results_ pada best_index_);
+    probabilitas OOF lalu baru dihitung bila DT Pruned menjadi model terbaik
+    (ensure_oof). Strategi lain: satu cross_validate untuk best params (+ OOF).
+    """
+    if folds is None:
+        folds = cv_folds(prepared)
+
+    key = None
+    if cache is not None:
+        key = search_key('fit_pruned', prepared, strategy,
+                         param_grid if param_grid is not None else SEARCH_SPACES[strategy],
+                         budget, folds)
+        cached = cache.load_object(key)
+        if cached is not None:
+            print(f"✅ Cache hit: DT Pruned {strategy} search + CV (fit skipped)")
+            return cached
+
+    found = search_dt_pruned(prepared, param_grid, cache=cache, n_jobs=n_jobs,
+                             folds=folds, strategy=strategy, budget=budget)
+    dt_pruned = found.model
+    y_pred = dt_pruned.predict(prepared.X_test)
+    y_proba = dt_pruned.predict_proba(prepared.X_test)[:, 1]
+    curves = dt_metrics.compute_curves(prepared.y_test, y_proba)
+
+    cv_results, cv_estimators, oof_proba = found.cv_results, None, None
+    if cv_results is None:
+        with dt_profile.stage('cv:DT Pruned', folds=len(folds)):
+            cv_results, cv_estimators, oof_proba = cross_validate_model(dt_pruned, prepared, folds)
+    result = ModelResult(name='DT Pruned', model=dt_pruned, y_pred=y_pred, y_proba=y_proba,
+                         metrics=score_predictions(prepared.y_test, y_pred, curves),
+                         cv_scores=cv_results['f1'], best_params=found.best_params,
+                         cv_results=cv_results, cv_estimators=cv_estimators,
+                         oof_proba=oof_proba, search_path=getattr(dt_pruned, 'ccp_path_', None),
+                         fit_seconds=found.refit_seconds,
+                         fit_peak_rss_mb=found.refit_peak_rss_mb, curves=curves)
+    if cache is not None:
+        cache.store_object(key, result)
+    return result
+
+
+def report_dt_pruned(result, balanced):
+    print("\n" + "="*70)
+    print("MODEL 4: DECISION TREE - PRUNED (Hyperparameter Tuning)")
+    print("="*70)
+
+    print(f"\n✅ Best Parameters Found:")
+    for param, value in result.best_params.items():
+        print(f"   {param}: {value}")
+
+    m, ref = result.metrics, balanced.metrics
+
+    print_tree_size(result.model)
+    print_performance(m)
+
+    print(f"\nImprovement vs Balanced DT:")
+    print(f"  F1-Score: {(m['F1-Score'] - ref['F1-Score']):+.4f}")
+    print(f"  ROC-AUC:  {(m['ROC-AUC'] - ref['ROC-AUC']):+.4f}")
+
+    if result.search_path is not None:
+        # Path panjang diringkas ke 15 titik; path lengkap di ccp_pruning_path.csv
+        path = result.search_path
+        if len(path) > 15:
+            path = path.iloc[np.unique(np.linspace(0, len(path) - 1, 15).astype(int))]
+        print(f"\nPruning Path (ccp_alpha vs complexity):")
+        print(path.to_string(index=False, float_format='{:.6f}'.format))
+
 
 # ============================================
 # 6. RANDOM FOREST
 # ============================================
 
-print("\n" + "="*70)
-print("MODEL 5: RANDOM FOREST (Ensemble Method)")
-print("="*70)
-
-rf = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=10,
-    min_samples_split=10,
-    min_samples_leaf=5,
-    class_weight='balanced',
-    random_state=42,
-    n_jobs=-1
-)
-
-print("\nTraining Random Forest with 100 trees...")
-rf.fit(X_train, y_train)
-
-# Predictions
-y_pred_rf = rf.predict(X_test)
-y_proba_rf = rf.predict_proba(X_test)[:, 1]
-
-# Metrics
-acc_rf = accuracy_score(y_test, y_pred_rf)
-prec_rf = precision_score(y_test, y_pred_rf, zero_division=0)
-rec_rf = recall_score(y_test, y_pred_rf, zero_division=0)
-f1_rf = f1_score(y_test, y_pred_rf, zero_division=0)
-auc_rf = roc_auc_score(y_test, y_proba_rf)
-
-print(f"\nPerformance:")
-print(f"  Accuracy:  {acc_rf:.4f} ({acc_rf*100:.2f}%)")
-print(f"  Precision: {prec_rf:.4f}")
-print(f"  Recall:    {rec_rf:.4f}")
-print(f"  F1-Score:  {f1_rf:.4f}")
-print(f"  ROC-AUC:   {auc_rf:.4f}")
-
-print(f"\nImprovement vs Best DT:")
-print(f"  F1-Score: {(f1_rf - f1_pruned):+.4f}")
-print(f"  ROC-AUC:  {(auc_rf - auc_pruned):+.4f}")
-
-# Cross-validation
-cv_scores_rf = cross_val_score(rf, X_train, y_train, cv=5, scoring='f1')
-print(f"\nCross-Validation F1-Score: {cv_scores_rf.mean():.4f} (+/- {cv_scores_rf.std():.4f})")
+def fit_random_forest(prepared, cache=None, n_jobs=-1, folds=None):
+    rf = RandomForestClassifier(
+        n_estimators=100,
+        max_depth=10,
+        min_samples_split=10,
+        min_samples_leaf=5,
+        class_weight='balanced',
+        random_state=42,
+        n_jobs=n_jobs
+    )
+    return fit_model('Random Forest', rf, prepared, folds=folds, cache=cache)
+
+
+def report_random_forest(result, pruned):
+    print("\n" + "="*70)
+    print("MODEL 5: RANDOM FOREST (Ensemble Method)")
+    print("="*70)
+
+    m, ref = result.metrics, pruned.metrics
+
+    print_performance(m)
+
+    print(f"\nImprovement vs Best DT:")
+    print(f"  F1-Score: {(m['F1-Score'] - ref['F1-Score']):+.4f}")
+    print(f"  ROC-AUC:  {(m['ROC-AUC'] - ref['ROC-AUC']):+.4f}")
+
+    print_cv(result)
+
+
+# ============================================
+# 6a. HISTOGRAM GRADIENT BOOSTING
+# ============================================
+
+def fit_hist_gradient_boosting(prepared, cache=None, n_jobs=None, folds=None):
+    # Fitur di-bin ke <=255 histogram bin -> cepat & hemat memori pada tabel desa x tahun;
+    # early stopping pada 10% validation split (stratified) dari training set
+    hgb = HistGradientBoostingClassifier(
+        max_iter=300,
+        learning_rate=0.1,
+        class_weight='balanced',
+        early_stopping=True,
+        validation_fraction=0.1,
+        n_iter_no_change=10,
+        random_state=42
+    )
+    return fit_model('HistGradientBoosting', hgb, prepared, folds=folds, cache=cache)
+
+
+def report_hist_gradient_boosting(result, forest):
+    print("\n" + "="*70)
+    print("MODEL 6: HISTOGRAM GRADIENT BOOSTING (Bonus)")
+    print("="*70)
+
+    m, ref = result.metrics, forest.metrics
+
+    print(f"\nBoosting Iterations: {result.model.n_iter_} (early stopping, max {result.model.max_iter})")
+    print_performance(m)
+
+    print(f"\nImprovement vs Random Forest:")
+    print(f"  F1-Score: {(m['F1-Score'] - ref['F1-Score']):+.4f}")
+    print(f"  ROC-AUC:  {(m['ROC-AUC'] - ref['ROC-AUC']):+.4f}")
+    print(f"  Fit time: {result.fit_seconds:.2f}s vs {forest.fit_seconds:.2f}s")
+    print(f"  Size:     {result.model_bytes/1024:.0f} KB vs {forest.model_bytes/1024:.0f} KB")
+
+    print_cv(result)
+
+
+# ============================================
+# 6b. TRAINING ORCHESTRATOR
+# ============================================
+
+# Setiap varian model = satu job independen: fit + prediksi test + CV
+MODEL_JOBS = {
+    'Baseline': fit_baseline,
+    'DT Basic': fit_dt_basic,
+    'DT Balanced': fit_dt_balanced,
+    'DT Pruned': fit_dt_pruned,
+    'Random Forest': fit_random_forest,
+    'HistGradientBoosting': fit_hist_gradient_boosting,
+}
+
+
+def default_workers():
+    """Jumlah worker dari env DT_JOBS, default min(jumlah job, jumlah CPU)."""
+    if os.environ.get('DT_JOBS'):
+        return max(1, int(os.environ['DT_JOBS']))
+    return min(len(MODEL_JOBS), os.cpu_count() or 1)
+
+
+def fit_all(prepared, cache=None, workers=None, search=SEARCH_STRATEGY, budget=SEARCH_BUDGET):
+    """Jalankan semua job MODEL_JOBS; dengan workers > 1 secara paralel di process pool.
+
+    Fold CV dibangun sekali di sini dan dibagikan ke semua job. Sisa core dibagi rata
+    ke job (n_jobs untuk GridSearchCV / Random Forest) agar total proses tidak melebihi
+    jumlah CPU.
+    """
+    workers = workers or default_workers()
+    folds = cv_folds(prepared)
+    jobs = {**MODEL_JOBS,
+            'DT Pruned': partial(fit_dt_pruned, strategy=search, budget=budget)}
+    if cache is not None:
+        data_fingerprint(prepared)  # hitung sekali di parent, bukan di tiap worker
+
+    if workers <= 1:
+        return {name: job(prepared, cache=cache, n_jobs=-1, folds=folds)
+                for name, job in jobs.items()}
+
+    inner_jobs = max(1, (os.cpu_count() or 1) // workers)
+    print(f"\nTraining {len(MODEL_JOBS)} models on {workers} worker processes...")
+    sys.stdout.flush()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(job, prepared, cache, inner_jobs, folds)
+                   for name, job in jobs.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def report_training(results):
+    report_baseline(results['Baseline'])
+    report_dt_basic(results['DT Basic'], results['Baseline'])
+    report_dt_balanced(results['DT Balanced'], results['DT Basic'])
+    report_dt_pruned(results['DT Pruned'], results['DT Balanced'])
+    report_random_forest(results['Random Forest'], results['DT Pruned'])
+    report_hist_gradient_boosting(results['HistGradientBoosting'], results['Random Forest'])
+
 
 # ============================================
 # 7. MODEL COMPARISON
 # ============================================
 
-print("\n" + "="*70)
-print("MODEL COMPARISON SUMMARY")
-print("="*70)
-
-# Create comparison dataframe
-comparison = pd.DataFrame({
-    'Model': ['Baseline', 'DT Basic', 'DT Balanced', 'DT Pruned', 'Random Forest'],
-    'Accuracy': [baseline_acc, acc_basic, acc_balanced, acc_pruned, acc_rf],
-    'Precision': [baseline_precision, prec_basic, prec_balanced, prec_pruned, prec_rf],
-    'Recall': [baseline_recall, rec_basic, rec_balanced, rec_pruned, rec_rf],
-    'F1-Score': [baseline_f1, f1_basic, f1_balanced, f1_pruned, f1_rf],
-    'ROC-AUC': [0, auc_basic, auc_balanced, auc_pruned, auc_rf]
-})
-
-print("\n" + comparison.to_string(index=False))
-
-# Save comparison
-comparison.to_csv('model_comparison_metrics.csv', index=False)
-print("\n✅ Comparison saved: model_comparison_metrics.csv")
-
-# Find best model
-best_f1_idx = comparison['F1-Score'].idxmax()
-best_model_name = comparison.loc[best_f1_idx, 'Model']
-best_f1 = comparison.loc[best_f1_idx, 'F1-Score']
-
-print(f"\n🏆 BEST MODEL: {best_model_name}")
-print(f"   F1-Score: {best_f1:.4f}")
-
-# Select best model for detailed analysis
-if best_model_name == 'Random Forest':
-    best_model = rf
-    y_pred_best = y_pred_rf
-    y_proba_best = y_proba_rf
-elif best_model_name == 'DT Pruned':
-    best_model = dt_pruned
-    y_pred_best = y_pred_pruned
-    y_proba_best = y_proba_pruned
-elif best_model_name == 'DT Balanced':
-    best_model = dt_balanced
-    y_pred_best = y_pred_balanced
-    y_proba_best = y_proba_balanced
-else:
-    best_model = dt_basic
-    y_pred_best = y_pred_basic
-    y_proba_best = y_proba_basic
+def metric_ci_columns(result, y_test):
+    """Bootstrap CI (percentile) setiap metrik -> kolom '<metric> CI Low/High'."""
+    intervals = dt_metrics.metric_intervals(y_test, result.y_pred, result.y_proba)
+    columns = {}
+    for metric in dt_metrics.METRICS:
+        low, high = intervals.get(metric, (np.nan, np.nan))
+        columns[f'{metric} CI Low'] = low
+        columns[f'{metric} CI High'] = high
+    return columns
+
+
+def compare_models(results, y_test):
+    print("\n" + "="*70)
+    print("MODEL COMPARISON SUMMARY")
+    print("="*70)
+
+    # Create comparison dataframe
+    with dt_profile.stage('bootstrap_ci', n_boot=dt_metrics.BOOTSTRAP_SAMPLES):
+        intervals = {name: metric_ci_columns(result, y_test) for name, result in results.items()}
+    comparison = pd.DataFrame([
+        {'Model': name, **result.metrics, **intervals[name],
+         'Fit Time (s)': result.fit_seconds,
+         'Fit Peak RSS (MB)': result.fit_peak_rss_mb,
+         'Predict (ms/1k rows)': result.predict_ms_per_1k,
+         'Nodes': result.n_nodes,
+         'Leaves': result.n_leaves,
+         'Model Size (KB)': result.model_bytes / 1024}
+        for name, result in results.items()
+    ]).astype({'Nodes': 'Int64', 'Leaves': 'Int64'})
+
+    print("\n" + comparison.to_string(index=False))
+
+    print(f"\n{dt_metrics.CONFIDENCE:.0%} bootstrap CI ({dt_metrics.BOOTSTRAP_SAMPLES} resamples "
+          f"of {len(y_test)} test rows):")
+    for _, row in comparison.iterrows():
+        print(f"  {row['Model']:<22} F1 {row['F1-Score']:.3f} "
+              f"[{row['F1-Score CI Low']:.3f}, {row['F1-Score CI High']:.3f}]  "
+              f"AUC {row['ROC-AUC']:.3f} [{row['ROC-AUC CI Low']:.3f}, {row['ROC-AUC CI High']:.3f}]")
+    return comparison
+
+
+def select_best(comparison):
+    # Find best model
+    best_f1_idx = comparison['F1-Score'].idxmax()
+    best_model_name = comparison.loc[best_f1_idx, 'Model']
+    best_f1 = comparison.loc[best_f1_idx, 'F1-Score']
+
+    print(f"\n🏆 BEST MODEL: {best_model_name}")
+    print(f"   F1-Score: {best_f1:.4f}")
+    return best_model_name
+
 
 # ============================================
 # 8. DETAILED EVALUATION OF BEST MODEL
 # ============================================
 
-print("\n" + "="*70)
-print(f"DETAILED EVALUATION: {best_model_name}")
-print("="*70)
-
-# Confusion Matrix
-cm = confusion_matrix(y_test, y_pred_best)
-print(f"\nConfusion Matrix:")
-print(cm)
-
-# Classification Report
-print(f"\nClassification Report:")
-print(classification_report(y_test, y_pred_best, 
-                          target_names=['Tidak Berisiko', 'Berisiko']))
-
-# Feature Importance
-print(f"\nFeature Importance (Top 10):")
-feature_names = X_train.columns
-if hasattr(best_model, 'feature_importances_'):
-    importances = best_model.feature_importances_
-    feature_imp = pd.DataFrame({
-        'feature': feature_names,
-        'importance': importances
+def feature_importance_of(model, X_test, y_test):
+    """Importance impurity bila ada; selain itu (HGB) permutation importance pada test set."""
+    if hasattr(model, 'feature_importances_'):
+        importance = model.feature_importances_
+    else:
+        perm = permutation_importance(model, X_test, y_test, scoring='f1',
+                                      n_repeats=PERMUTATION_REPEATS, random_state=42)
+        # Penurunan F1 negatif = noise; dinormalisasi agar sebanding (total 1)
+        importance = perm.importances_mean.clip(min=0)
+        if importance.sum() > 0:
+            importance = importance / importance.sum()
+    return pd.DataFrame({
+        'feature': X_test.columns,
+        'importance': importance
     }).sort_values('importance', ascending=False)
-    
-    print(feature_imp.head(10).to_string(index=False))
-    feature_imp.to_csv('feature_importance.csv', index=False)
-    print("\n✅ Feature importance saved: feature_importance.csv")
+
+
+def detailed_evaluation(bundle):
+    print("\n" + "="*70)
+    print(f"DETAILED EVALUATION: {bundle.best_model_name}")
+    print("="*70)
+
+    y_test = bundle.prepared.y_test
+    y_pred_best = bundle.best.y_pred
+
+    # Confusion Matrix
+    cm = confusion_matrix(y_test, y_pred_best)
+    print(f"\nConfusion Matrix:")
+    print(cm)
+
+    # Classification Report
+    print(f"\nClassification Report:")
+    print(classification_report(y_test, y_pred_best,
+                              target_names=['Tidak Berisiko', 'Berisiko']))
+
+    # Feature Importance
+    print(f"\nFeature Importance (Top 10):")
+    if bundle.feature_importance is not None:
+        print(bundle.feature_importance.head(10).to_string(index=False))
+
+
+def ensure_oof(result, prepared, cache=None):
+    """Estimator per fold + probabilitas OOF untuk result yang skor CV-nya dari search.
+
+    Dipanggil hanya untuk model terbaik (kalibrasi dan threshold), sehingga DT Pruned
+    hasil grid search tidak membayar fit per fold bila tidak terpilih.
+    """
+    if result.oof_proba is not None:
+        return result
+    folds = cv_folds(prepared)
+
+    key = None
+    if cache is not None:
+        key = dt_cache.make_key('oof', data_fingerprint(prepared), result.name,
+                                type(result.model).__name__, result.model.get_params(), len(folds))
+        cached = cache.load_object(key)
+        if cached is not None:
+            result.cv_estimators, result.oof_proba = cached
+            return result
+
+    with dt_profile.stage(f'oof:{result.name}', folds=len(folds)):
+        _, result.cv_estimators, result.oof_proba = cross_validate_model(result.model, prepared, folds)
+    if cache is not None:
+        cache.store_object(key, (result.cv_estimators, result.oof_proba))
+    return result
+
+
+@dt_profile.profiled('calibration')
+def calibrate(bundle, method=dt_calibration.CALIBRATION_METHOD):
+    """Kalibrator probabilitas model terbaik dari probabilitas out-of-fold CV."""
+    print("\n" + "="*70)
+    print("PROBABILITY CALIBRATION (OUT-OF-FOLD)")
+    print("="*70)
+
+    best = bundle.best
+    calibrator = dt_calibration.fit_calibrator(best.oof_proba, bundle.prepared.y_train, method)
+    print(f"\nModel: {best.name} | method: {calibrator.method} "
+          f"| OOF samples: {calibrator.n_samples}")
+    print(f"  Brier score (OOF) raw:        {calibrator.brier_raw:.4f}")
+    print(f"  Brier score (OOF) calibrated: {calibrator.brier_calibrated:.4f}")
+    return calibrator
+
+
+@dt_profile.profiled('threshold')
+def tune_threshold(bundle):
+    """Cutoff keputusan model terbaik dari probabilitas out-of-fold (bukan test set)."""
+    print("\n" + "="*70)
+    print("DECISION THRESHOLD (OUT-OF-FOLD)")
+    print("="*70)
+
+    oof_proba = np.asarray(bundle.best.oof_proba, dtype=float)
+    valid = ~np.isnan(oof_proba)
+    choice, sweep = dt_threshold.optimize_threshold(
+        np.asarray(bundle.prepared.y_train)[valid], oof_proba[valid])
+
+    status = "✅ memenuhi kriteria" if choice.meets_criteria else "⚠️ tidak ada yang memenuhi kriteria (biaya terendah)"
+    print(f"\nCandidate thresholds evaluated (OOF): {len(sweep):,}")
+    print(f"Threshold: {choice.threshold:.4f} ({status})")
+    print(f"  OOF Precision: {choice.precision:.4f} | Recall: {choice.recall:.4f} "
+          f"| F1: {choice.f1:.4f}")
+    return choice, sweep
+
+
+@dt_profile.profiled('training')
+def train(prepared, cache=None, workers=None, search=SEARCH_STRATEGY, budget=SEARCH_BUDGET):
+    """PART 3 dalam memori: PreparedData -> ModelBundle (tanpa I/O file)."""
+    print_training_overview(prepared)
+
+    results = fit_all(prepared, cache=cache, workers=workers, search=search, budget=budget)
+    measure_costs(results, prepared.X_test)
+    report_training(results)
+    best_params = results['DT Pruned'].best_params
+
+    comparison = compare_models(results, prepared.y_test)
+    best_model_name = select_best(comparison)
+
+    bundle = ModelBundle(
+        prepared=prepared,
+        results=results,
+        comparison=comparison,
+        best_model_name=best_model_name,
+        best_params=best_params,
+    )
+    # bundle.best: Baseline (tanpa estimator) -> fallback DT Basic
+    bundle.feature_importance = feature_importance_of(bundle.best.model,
+                                                      prepared.X_test, prepared.y_test)
+    detailed_evaluation(bundle)
+    ensure_oof(bundle.best, prepared, cache=cache)
+    bundle.calibrator = calibrate(bundle)
+    bundle.threshold, bundle.threshold_sweep = tune_threshold(bundle)
+    return bundle
+
 
 # ============================================
 # 9. VISUALIZATIONS
 # ============================================
 
-print("\n" + "="*70)
-print("CREATING VISUALIZATIONS")
-print("="*70)
-
-# [A] Model Comparison Bar Chart
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('Model Performance Comparison', fontsize=16, fontweight='bold')
-
-metrics = ['Accuracy', 'Precision', 'Recall', 'F1-Score']
-colors_map = plt.cm.Set3(range(len(comparison)))
-
-for idx, metric in enumerate(metrics):
-    ax = axes[idx // 2, idx % 2]
-    bars = ax.bar(comparison['Model'], comparison[metric], color=colors_map, edgecolor='black', linewidth=1.5)
-    
-    # Highlight best
-    max_idx = comparison[metric].idxmax()
-    bars[max_idx].set_color('gold')
-    bars[max_idx].set_edgecolor('darkred')
-    bars[max_idx].set_linewidth(3)
-    
-    ax.set_ylabel(metric, fontsize=11)
-    ax.set_title(f'{metric} Comparison', fontsize=13, fontweight='bold')
-    ax.set_ylim([0, 1.0])
-    ax.grid(axis='y', alpha=0.3)
-    ax.tick_params(axis='x', rotation=45)
-    
-    # Add value labels
-    for i, v in enumerate(comparison[metric]):
-        ax.text(i, v + 0.02, f'{v:.3f}', ha='center', fontweight='bold', fontsize=9)
-
-plt.tight_layout()
-plt.savefig('07_model_comparison_metrics.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 07_model_comparison_metrics.png")
-
-# [B] Confusion Matrix Heatmap
-plt.figure(figsize=(8, 6))
-sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-            xticklabels=['Tidak Berisiko', 'Berisiko'],
-            yticklabels=['Tidak Berisiko', 'Berisiko'],
-            cbar_kws={'label': 'Count'})
-plt.title(f'Confusion Matrix - {best_model_name}', fontsize=14, fontweight='bold')
-plt.ylabel('Actual', fontsize=12)
-plt.xlabel('Predicted', fontsize=12)
-plt.tight_layout()
-plt.savefig('08_confusion_matrix_best_model.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 08_confusion_matrix_best_model.png")
-
-# [C] ROC Curves
-plt.figure(figsize=(10, 8))
-
-# Plot ROC for each model (except baseline)
-models_roc = [
-    ('DT Basic', y_proba_basic, 'blue'),
-    ('DT Balanced', y_proba_balanced, 'green'),
-    ('DT Pruned', y_proba_pruned, 'red'),
-    ('Random Forest', y_proba_rf, 'purple')
-]
-
-for name, y_proba, color in models_roc:
-    fpr, tpr, _ = roc_curve(y_test, y_proba)
-    auc = roc_auc_score(y_test, y_proba)
-    plt.plot(fpr, tpr, label=f'{name} (AUC = {auc:.3f})', linewidth=2, color=color)
-
-# Diagonal line
-plt.plot([0, 1], [0, 1], 'k--', label='Random Classifier', linewidth=1)
-
-plt.xlabel('False Positive Rate', fontsize=12)
-plt.ylabel('True Positive Rate', fontsize=12)
-plt.title('ROC Curves Comparison', fontsize=14, fontweight='bold')
-plt.legend(loc='lower right', fontsize=10)
-plt.grid(alpha=0.3)
-plt.tight_layout()
-plt.savefig('09_roc_curves_comparison.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("✅ Saved: 09_roc_curves_comparison.png")
-
-# [D] Feature Importance Plot
-if hasattr(best_model, 'feature_importances_'):
+COMPARISON_METRICS = ['Accuracy', 'Precision', 'Recall', 'F1-Score']
+ROC_COLORS = {'DT Basic': 'blue', 'DT Balanced': 'green',
+              'DT Pruned': 'red', 'Random Forest': 'purple',
+              'HistGradientBoosting': 'orange'}
+
+
+def render_model_comparison(comparison):
+    # [A] Model Comparison Bar Chart
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('Model Performance Comparison', fontsize=16, fontweight='bold')
+
+    colors_map = plt.cm.Set3(range(len(comparison)))
+
+    for idx, metric in enumerate(COMPARISON_METRICS):
+        ax = axes[idx // 2, idx % 2]
+        bars = ax.bar(comparison['Model'], comparison[metric], color=colors_map, edgecolor='black', linewidth=1.5)
+
+        # Highlight best
+        max_idx = comparison[metric].idxmax()
+        bars[max_idx].set_color('gold')
+        bars[max_idx].set_edgecolor('darkred')
+        bars[max_idx].set_linewidth(3)
+
+        ax.set_ylabel(metric, fontsize=11)
+        ax.set_title(f'{metric} Comparison', fontsize=13, fontweight='bold')
+        ax.set_ylim([0, 1.0])
+        ax.grid(axis='y', alpha=0.3)
+        ax.tick_params(axis='x', rotation=45)
+
+        # Add value labels
+        for i, v in enumerate(comparison[metric]):
+            ax.text(i, v + 0.02, f'{v:.3f}', ha='center', fontweight='bold', fontsize=9)
+
+    plt.tight_layout()
+
+
+def render_confusion_matrix(cm, best_model_name):
+    # [B] Confusion Matrix Heatmap
+    plt.figure(figsize=(8, 6))
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues',
+                xticklabels=['Tidak Berisiko', 'Berisiko'],
+                yticklabels=['Tidak Berisiko', 'Berisiko'],
+                cbar_kws={'label': 'Count'})
+    plt.title(f'Confusion Matrix - {best_model_name}', fontsize=14, fontweight='bold')
+    plt.ylabel('Actual', fontsize=12)
+    plt.xlabel('Predicted', fontsize=12)
+    plt.tight_layout()
+
+
+def render_roc_curves(curves):
+    # [C] ROC Curves (baseline tanpa probabilitas tidak ikut)
+    plt.figure(figsize=(10, 8))
+
+    for name, (fpr, tpr, auc) in curves.items():
+        plt.plot(fpr, tpr, label=f'{name} (AUC = {auc:.3f})', linewidth=2,
+                 color=ROC_COLORS.get(name))
+
+    # Diagonal line
+    plt.plot([0, 1], [0, 1], 'k--', label='Random Classifier', linewidth=1)
+
+    plt.xlabel('False Positive Rate', fontsize=12)
+    plt.ylabel('True Positive Rate', fontsize=12)
+    plt.title('ROC Curves Comparison', fontsize=14, fontweight='bold')
+    plt.legend(loc='lower right', fontsize=10)
+    plt.grid(alpha=0.3)
+    plt.tight_layout()
+
+
+def render_feature_importance(top_features, best_model_name):
+    # [D] Feature Importance Plot
     plt.figure(figsize=(10, 8))
-    top_features = feature_imp.head(15)
     plt.barh(range(len(top_features)), top_features['importance'], color='steelblue', edgecolor='black')
     plt.yticks(range(len(top_features)), top_features['feature'])
     plt.xlabel('Importance', fontsize=12)
@@ -442,15 +1268,12 @@ if hasattr(best_model, 'feature_importances_'):
     plt.gca().invert_yaxis()
     plt.grid(axis='x', alpha=0.3)
     plt.tight_layout()
-    plt.savefig('10_feature_importance.png', dpi=300, bbox_inches='tight')
-    plt.show()
-    
-    print("✅ Saved: 10_feature_importance.png")
 
-# [E] Decision Tree Visualization (if best model is DT)
-if best_model_name in ['DT Basic', 'DT Balanced', 'DT Pruned']:
+
+def render_tree_structure(tree, feature_names, best_model_name):
+    # [E] Decision Tree Visualization
     plt.figure(figsize=(25, 15))
-    plot_tree(best_model, 
+    plot_tree(tree,
               feature_names=feature_names,
               class_names=['Tidak Berisiko', 'Berisiko'],
               filled=True,
@@ -459,50 +1282,237 @@ if best_model_name in ['DT Basic', 'DT Balanced', 'DT Pruned']:
               proportion=True)
     plt.title(f'Decision Tree Structure - {best_model_name}', fontsize=16, fontweight='bold')
     plt.tight_layout()
-    plt.savefig('11_decision_tree_structure.png', dpi=300, bbox_inches='tight')
-    plt.show()
-    
-    print("✅ Saved: 11_decision_tree_structure.png")
+
+
+def model_figures(bundle):
+    """Ringkasan per figure: tabel metrik, confusion matrix, titik kurva ROC, top fitur."""
+    best_model_name = bundle.best_model_name
+    y_test = bundle.prepared.y_test
+
+    # Kurva per model dari cache ModelResult, di-downsample agar render tidak bergantung n
+    curves = {}
+    for name, result in bundle.results.items():
+        model_curves = curves_of(result, y_test)
+        if model_curves is None:
+            continue
+        fpr, tpr = dt_metrics.downsample_curve(model_curves.fpr, model_curves.tpr)
+        curves[name] = (fpr, tpr, model_curves.roc_auc)
+
+    figures = [
+        dt_report.Figure('07_model_comparison_metrics.png', render_model_comparison,
+                         dict(comparison=bundle.comparison[['Model'] + COMPARISON_METRICS])),
+        dt_report.Figure('08_confusion_matrix_best_model.png', render_confusion_matrix,
+                         dict(cm=confusion_matrix(y_test, bundle.best.y_pred),
+                              best_model_name=best_model_name)),
+        dt_report.Figure('09_roc_curves_comparison.png', render_roc_curves, dict(curves=curves)),
+    ]
+    if bundle.feature_importance is not None:
+        figures.append(dt_report.Figure(
+            '10_feature_importance.png', render_feature_importance,
+            dict(top_features=bundle.feature_importance.head(15), best_model_name=best_model_name)))
+    # Struktur tree hanya bila model terbaik adalah Decision Tree
+    if best_model_name in DT_MODELS:
+        feature_names = list(bundle.prepared.X_train.columns)
+        structure = export_graphviz(bundle.best_model, out_file=None, feature_names=feature_names,
+                                    class_names=['Tidak Berisiko', 'Berisiko'], filled=True,
+                                    rounded=True, proportion=True)
+        figures.append(dt_report.Figure(
+            '11_decision_tree_structure.png', render_tree_structure,
+            dict(tree=bundle.best_model, feature_names=feature_names,
+                 best_model_name=best_model_name),
+            fingerprint=dict(structure=structure, best_model_name=best_model_name)))
+    return figures
+
+
+@dt_profile.profiled('plot_models')
+def plot_models(bundle):
+    print("\n" + "="*70)
+    print("CREATING VISUALIZATIONS")
+    print("="*70)
+
+    dt_report.render_figures(model_figures(bundle))
+
 
 # ============================================
 # 10. SAVE RESULTS
 # ============================================
 
-print("\n" + "="*70)
-print("SAVING RESULTS")
-print("="*70)
-
-# Save predictions
-predictions_df = pd.DataFrame({
-    'actual': y_test.values,
-    'predicted': y_pred_best,
-    'probability_class_1': y_proba_best
-})
-predictions_df.to_csv('predictions_best_model.csv', index=False)
-print("✅ Predictions saved: predictions_best_model.csv")
-
-# Save model info
-model_info = {
-    'best_model': best_model_name,
-    'accuracy': comparison.loc[best_f1_idx, 'Accuracy'],
-    'precision': comparison.loc[best_f1_idx, 'Precision'],
-    'recall': comparison.loc[best_f1_idx, 'Recall'],
-    'f1_score': best_f1,
-    'roc_auc': comparison.loc[best_f1_idx, 'ROC-AUC']
-}
-
-with open('best_model_info.txt', 'w') as f:
-    f.write(f"BEST MODEL: {best_model_name}\n")
-    f.write("="*50 + "\n\n")
-    for key, value in model_info.items():
-        f.write(f"{key}: {value}\n")
-
-print("✅ Model info saved: best_model_info.txt")
-
-print("\n" + "="*70)
-print("🎉 MODELING COMPLETED!")
-print("="*70)
-print(f"\n🏆 Best Model: {best_model_name}")
-print(f"   F1-Score: {best_f1:.4f}")
-print(f"   ROC-AUC:  {comparison.loc[best_f1_idx, 'ROC-AUC']:.4f}")
-print("\nNext Step: Run 04_model_evaluation_insights.py for detailed analysis")
+@dt_profile.profiled('save_results')
+def save_results(bundle):
+    print("\n" + "="*70)
+    print("SAVING RESULTS")
+    print("="*70)
+
+    comparison = bundle.comparison
+    best_model_name = bundle.best_model_name
+
+    # Save comparison
+    comparison.to_csv('model_comparison_metrics.csv', index=False)
+    print("✅ Comparison saved: model_comparison_metrics.csv")
+
+    bundle.feature_importance.to_csv('feature_importance.csv', index=False)
+    print("✅ Feature importance saved: feature_importance.csv")
+
+    bundle.threshold_sweep.to_csv('threshold_sweep.csv', index=False)
+    print("✅ Threshold sweep (OOF) saved: threshold_sweep.csv")
+
+    # Save predictions
+    bundle.predictions.to_csv('predictions_best_model.csv', index=False)
+    print("✅ Predictions saved: predictions_best_model.csv")
+
+    # Save model info
+    best = comparison.loc[comparison['Model'] == best_model_name].iloc[0]
+    model_info = {
+        'best_model': best_model_name,
+        'accuracy': best['Accuracy'],
+        'precision': best['Precision'],
+        'recall': best['Recall'],
+        'f1_score': best['F1-Score'],
+        'roc_auc': best['ROC-AUC']
+    }
+
+    with open('best_model_info.txt', 'w') as f:
+        f.write(f"BEST MODEL: {best_model_name}\n")
+        f.write("="*50 + "\n\n")
+        for key, value in model_info.items():
+            f.write(f"{key}: {value}\n")
+
+    print("✅ Model info saved: best_model_info.txt")
+
+    search_path = bundle.results['DT Pruned'].search_path
+    if search_path is not None:
+        search_path.to_csv('ccp_pruning_path.csv', index=False)
+        print("✅ Pruning path saved: ccp_pruning_path.csv")
+
+    save_run_record(bundle)
+    save_model(bundle)
+
+
+def save_run_record(bundle, path=RUN_RECORD_FILE):
+    """Record run yang machine-readable: konteks data + metrik dan biaya setiap model."""
+    prepared = bundle.prepared
+    record = {
+        'run_at': datetime.now().isoformat(timespec='seconds'),
+        'granularity': prepared.granularity,
+        'data_key': prepared.cache_key,
+        'n_train': len(prepared.X_train),
+        'n_test': len(prepared.X_test),
+        'n_features': prepared.X_train.shape[1],
+        'cv_folds': CV_FOLDS,
+        'best_model': bundle.best_model_name,
+        'best_params': bundle.best_params,
+        'python_version': platform.python_version(),
+        'sklearn_version': sklearn.__version__,
+        'cpu_count': os.cpu_count(),
+        # to_json mengubah NaN -> null dan tipe NumPy -> tipe JSON
+        'models': json.loads(bundle.comparison.to_json(orient='records')),
+    }
+    with open(path, 'w') as f:
+        json.dump(record, f, indent=2, default=str)
+    print(f"✅ Run record saved: {path}")
+    return record
+
+
+def saved_model_of(bundle):
+    best = bundle.best
+    prepared = bundle.prepared
+    return SavedModel(
+        name=best.name,
+        model=best.model,
+        feature_cols=list(prepared.feature_cols),
+        kabupaten_classes=prepared.kabupaten_mapping['kabupaten'].tolist(),
+        granularity=prepared.granularity,
+        metrics={k: float(v) for k, v in best.metrics.items()},
+        best_params=bundle.best_params if best.name == 'DT Pruned' else None,
+        trained_at=datetime.now().isoformat(timespec='seconds'),
+        n_train=len(prepared.X_train),
+        data_key=prepared.cache_key,
+        sklearn_version=sklearn.__version__,
+        calibrator=bundle.calibrator,
+        threshold=bundle.threshold.threshold,
+    )
+
+
+def save_model(bundle, path=MODEL_FILE):
+    """Simpan model terbaik (SavedModel) dengan joblib."""
+    joblib.dump(saved_model_of(bundle), path)
+    print(f"✅ Model bundle saved: {path}")
+    return path
+
+
+_LOADED_MODELS = {}
+
+
+def load_model(path=MODEL_FILE):
+    """Baca SavedModel.
+
+    Hasil disimpan per proses (key: path + mtime), jadi pemanggilan berulang
+    tidak membaca file lagi selama file model tidak berubah. Array node tree tidak
+    bisa di-memory-map: Tree.__setstate__ sklearn menyalinnya ke buffer sendiri.
+    """
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _LOADED_MODELS:
+        _LOADED_MODELS.clear()
+        _LOADED_MODELS[key] = joblib.load(path)
+    return _LOADED_MODELS[key]
+
+
+def run(prepared=None, cache=None, workers=None, search=SEARCH_STRATEGY, budget=SEARCH_BUDGET,
+        plots=None):
+    """PART 3 end-to-end. Tanpa `prepared`, data dibaca dari file handoff PART 2.
+
+    `plots=False` (atau DT_PLOTS=0) melewati semua figure, termasuk render plot_tree.
+    """
+    plots = dt_plots.plots_enabled(plots)
+    if not plots:
+        dt_plots.headless()
+    print("="*70)
+    print("DECISION TREE MODELING - MULTIPLE VARIATIONS")
+    print("="*70)
+
+    if prepared is None:
+        prepared = load_prepared()
+
+    bundle = train(prepared, cache=cache, workers=workers, search=search, budget=budget)
+    if plots:
+        plot_models(bundle)
+    else:
+        dt_plots.skip_notice('PART 3')
+    save_results(bundle)
+
+    best = bundle.best.metrics
+    print("\n" + "="*70)
+    print("🎉 MODELING COMPLETED!")
+    print("="*70)
+    print(f"\n🏆 Best Model: {bundle.best_model_name}")
+    print(f"   F1-Score: {best['F1-Score']:.4f}")
+    print(f"   ROC-AUC:  {best['ROC-AUC']:.4f}")
+    return bundle
+
+
+def add_search_args(parser):
+    parser.add_argument('--search', choices=list(SEARCH_STRATEGIES), default=SEARCH_STRATEGY,
+                        help='strategi hyperparameter search DT Pruned')
+    parser.add_argument('--search-budget', type=int, default=SEARCH_BUDGET,
+                        help='jumlah konfigurasi untuk --search halving/random (ccp: maks. kombinasi parameter)')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='PART 3: decision tree modeling')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='jumlah worker process untuk training model (default: DT_JOBS / jumlah CPU)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='selalu fit ulang semua model')
+    add_search_args(parser)
+    dt_plots.add_plot_args(parser)
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    # Jalankan lewat modul `dt_modeling` (bukan __main__) agar dataclass yang di-pickle
+    # (cache, best_model.joblib) bisa dibaca lagi dari modul lain
+    import dt_modeling
+    args = dt_modeling.parse_args()
+    dt_modeling.run(cache=None if args.no_cache else dt_cache.default_cache(), workers=args.jobs,
+                    search=args.search, budget=args.search_budget, plots=args.plots)
+    print("\nNext Step: Run 04_model_evaluation_insights.py for detailed analysis")
@@ -0,0 +1,104 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+PIPELINE: PART 1 - PART 4 DALAM SATU PROSES
+
+Menjalankan semua tahap secara berurutan dengan data yang tetap di memori
+(tanpa membaca ulang CSV antar tahap):
+
+    python -m dt_pipeline
+    python -m dt_pipeline --data jml_kejadian_bunuh_diri__des_kel.csv --skip-understanding
+"""
+
+import argparse
+from dataclasses import dataclass
+
+import dt_business_understanding
+import dt_cache
+import dt_data_preparation
+import dt_modeling
+import dt_evaluation
+import dt_plots
+import dt_profile
+
+
+@dataclass
+class PipelineResult:
+    understanding: object
+    prepared: object
+    bundle: object
+    report: object
+
+
+def run_pipeline(data_path=dt_data_preparation.DATA_FILE, understanding=True,
+                 export_csv=False, cache=None, granularity='kabupaten', chunksize=None,
+                 workers=None, search=dt_modeling.SEARCH_STRATEGY,
+                 budget=dt_modeling.SEARCH_BUDGET, plots=None):
+    """Jalankan PART 1-4 dalam satu proses; DataFrame mentah hanya dibaca sekali.
+
+    Tanpa PART 1 dan dengan `cache`, CSV mentah hanya di-hash; feature engineering
+    dan fit model dilewati bila data & parameter tidak berubah. Tanpa PART 1 dan dengan
+    `chunksize`, CSV dibaca streaming per chunk sehingga tidak pernah dimuat utuh.
+    `plots=False` menjalankan komputasi saja (backend Agg, tanpa figure).
+    """
+    df = None
+    result_understanding = None
+    if understanding:
+        with dt_profile.stage('part1_understanding'):
+            df = dt_data_preparation.load_data(data_path)
+            result_understanding = dt_business_understanding.run(df=df, plots=plots)
+
+    with dt_profile.stage('part2_preparation', granularity=granularity):
+        prepared = dt_data_preparation.run(df=df, path=data_path, export_csv=export_csv,
+                                           cache=cache, granularity=granularity,
+                                           chunksize=chunksize, plots=plots)
+    with dt_profile.stage('part3_modeling', search=search):
+        bundle = dt_modeling.run(prepared=prepared, cache=cache, workers=workers,
+                                 search=search, budget=budget, plots=plots)
+    with dt_profile.stage('part4_evaluation'):
+        report = dt_evaluation.run(bundle=bundle, plots=plots)
+
+    return PipelineResult(
+        understanding=result_understanding,
+        prepared=prepared,
+        bundle=bundle,
+        report=report,
+    )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m dt_pipeline',
+        description='Decision Tree project: business understanding -> preparation -> modeling -> evaluation'
+    )
+    parser.add_argument('--data', default=dt_data_preparation.DATA_FILE,
+                        help='CSV mentah kejadian per desa/kelurahan')
+    parser.add_argument('--skip-understanding', action='store_true',
+                        help='lewati PART 1 (EDA & business understanding)')
+    parser.add_argument('--export-csv', action='store_true',
+                        help='ekspor juga X/y train-test dalam format CSV')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='nonaktifkan stage cache (hitung ulang semua tahap)')
+    parser.add_argument('--granularity', default='kabupaten',
+                        choices=list(dt_data_preparation.GRANULARITY_LEVELS),
+                        help='unit wilayah per baris model: kabupaten, kecamatan, atau desa')
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help='baca CSV streaming per chunk N baris (dengan --skip-understanding)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='jumlah worker process untuk training model (default: DT_JOBS / jumlah CPU)')
+    dt_modeling.add_search_args(parser)
+    dt_plots.add_plot_args(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_pipeline(args.data, understanding=not args.skip_understanding,
+                 export_csv=args.export_csv,
+                 cache=None if args.no_cache else dt_cache.default_cache(),
+                 granularity=args.granularity, chunksize=args.chunksize,
+                 workers=args.jobs, search=args.search, budget=args.search_budget,
+                 plots=args.plots)
+
+
+if __name__ == '__main__':
+    main()
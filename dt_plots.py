@@ -0,0 +1,59 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+PENGATURAN VISUALISASI (HEADLESS MODE)
+
+Semua modul menyimpan figure lewat `finish()`: PNG ditulis, lalu figure ditampilkan
+bila backend interaktif (Colab/Jupyter/desktop) atau langsung ditutup pada backend
+non-interaktif (Agg di server batch) sehingga tidak ada figure yang menumpuk di memori.
+
+Mode tanpa plot (`--no-plots` atau DT_PLOTS=0) melewati semua pembuatan figure dan
+memaksa backend Agg. Figure bisa dibuat belakangan dengan menjalankan ulang script
+tanpa flag tersebut: dengan stage cache aktif, komputasi diambil dari cache dan hanya
+tahap rendering yang berjalan. Rendering sendiri (paralel, skip figure yang tidak
+berubah) ada di dt_report.py.
+"""
+
+import os
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+DPI = 300
+
+# Backend yang tidak bisa menampilkan window (plt.show() tidak berguna di sini)
+NON_INTERACTIVE_BACKENDS = {'agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template'}
+
+
+def plots_enabled(plots=None):
+    """`plots` eksplisit (CLI) menang; default dari env DT_PLOTS (aktif kecuali '0')."""
+    if plots is not None:
+        return plots
+    return os.environ.get('DT_PLOTS', '1') != '0'
+
+
+def headless():
+    """Pindah ke backend Agg (tanpa GUI); aman dipanggil berulang kali."""
+    if matplotlib.get_backend().lower() != 'agg':
+        plt.switch_backend('Agg')
+
+
+def is_interactive():
+    return matplotlib.get_backend().lower() not in NON_INTERACTIVE_BACKENDS
+
+
+def finish(path, dpi=DPI):
+    """Simpan figure aktif ke `path`, lalu tampilkan (interaktif) atau tutup (headless)."""
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    if is_interactive():
+        plt.show()
+    else:
+        plt.close()
+
+
+def skip_notice(part):
+    print(f"\n⏭️ Visualizations skipped for {part} (--no-plots / DT_PLOTS=0)")
+
+
+def add_plot_args(parser):
+    parser.add_argument('--no-plots', dest='plots', action='store_false', default=None,
+                        help='lewati pembuatan figure (backend Agg, tanpa rendering)')
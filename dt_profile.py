@@ -0,0 +1,240 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+PROFILING: WAKTU & MEMORI PER TAHAP
+
+Instrumentasi ringan untuk bagian-bagian pipeline (LOAD DATA, FEATURE ENGINEERING,
+TRAIN-TEST SPLIT, fit tiap model, ...). Setiap tahap yang dibungkus `stage()` atau
+`@profiled` menulis satu baris JSON ke log: wall time, CPU time, dan RSS puncak.
+
+    with dt_profile.stage('feature_engineering', granularity='desa'):
+        ...
+
+    @dt_profile.profiled('load_data')
+    def load_data(path): ...
+
+Environment:
+    DT_PROFILE_LOG   file log JSON-lines (default dt_profile.jsonl; '0' = nonaktif)
+    DT_PROFILE       nama tahap yang diprofil, dipisah koma, boleh glob (mis. 'fit:*')
+    DT_PROFILER      'cprofile' (default) atau 'sample' (sampling stack tiap 5 ms)
+    DT_PROFILE_DIR   folder output profiler (default .dt_profile/)
+
+Output cProfile (.prof) bisa dibaca dengan `python -m pstats`; output sampling
+berupa collapsed stacks (`a;b;c count`) yang bisa langsung dipakai flamegraph.pl
+atau speedscope.
+"""
+
+import cProfile
+import fnmatch
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+LOG_FILE = 'dt_profile.jsonl'
+PROFILE_DIR = '.dt_profile'
+RSS_SAMPLE_INTERVAL = 0.002
+STACK_SAMPLE_INTERVAL = 0.005
+
+# Tahap yang sedang berjalan (nested) di thread utama
+_stack = []
+
+
+# ============================================
+# 1. MEMORY
+# ============================================
+
+def current_rss():
+    """Resident set size proses saat ini (byte); None bila /proc tidak tersedia."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakRSS:
+    """Context manager yang men-sample RSS di thread terpisah; `peak_mb` setelah keluar.
+
+    Builder tree sklearn dan parser CSV melepas GIL, jadi sampler tetap jalan
+    selama kode yang diukur berjalan.
+    """
+
+    def __init__(self, interval=RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.samples.append(current_rss())
+
+    def __enter__(self):
+        self.samples = [current_rss()]
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.samples.append(current_rss())
+        return False
+
+    @property
+    def start_mb(self):
+        return self.samples[0] / 1024**2 if self.samples and self.samples[0] is not None else None
+
+    @property
+    def peak_mb(self):
+        measured = [rss for rss in self.samples if rss is not None]
+        return max(measured) / 1024**2 if measured else None
+
+
+# ============================================
+# 2. PROFILERS (opsional, per tahap)
+# ============================================
+
+def profile_targets():
+    return [p.strip() for p in os.environ.get('DT_PROFILE', '').split(',') if p.strip()]
+
+
+def should_profile(name):
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in profile_targets())
+
+
+def profile_path(name, ext):
+    directory = os.environ.get('DT_PROFILE_DIR', PROFILE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    safe = ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    return os.path.join(directory, f"{safe}-{stamp}-{os.getpid()}.{ext}")
+
+
+class StackSampler:
+    """Sampling profiler sederhana: stack thread pemanggil dicatat setiap `interval` detik."""
+
+    def __init__(self, interval=STACK_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def run_profiler(name):
+    """Jalankan profiler (DT_PROFILER) untuk satu tahap; path output di-yield via list."""
+    kind = os.environ.get('DT_PROFILER', 'cprofile')
+    output = []
+    if kind == 'sample':
+        sampler = StackSampler()
+        with sampler:
+            yield output
+        path = profile_path(name, 'collapsed')
+        sampler.dump(path)
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield output
+        finally:
+            profiler.disable()
+        path = profile_path(name, 'prof')
+        profiler.dump_stats(path)
+    output.append(path)
+    print(f"   [profile] {name}: {path}")
+
+
+# ============================================
+# 3. STAGE LOG
+# ============================================
+
+def log_path():
+    path = os.environ.get('DT_PROFILE_LOG', LOG_FILE)
+    return None if path in ('', '0') else path
+
+
+def write_record(record, path=None):
+    path = path or log_path()
+    if path is None:
+        return
+    # Satu write per baris (mode append) -> aman untuk worker process paralel
+    with open(path, 'a') as f:
+        f.write(json.dumps(record, default=str) + '\n')
+
+
+@contextmanager
+def stage(name, **fields):
+    """Ukur satu tahap: wall time, CPU time proses, dan RSS puncak -> satu baris log."""
+    parent = _stack[-1] if _stack else None
+    _stack.append(name)
+    record = {'stage': name, 'parent': parent, **fields}
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        with PeakRSS() as rss:
+            if should_profile(name):
+                with run_profiler(name) as output:
+                    yield record
+                record['profile'] = output[0] if output else None
+            else:
+                yield record
+    except BaseException as exc:
+        record['error'] = type(exc).__name__
+        raise
+    finally:
+        _stack.pop()
+        record.update({
+            'wall_s': round(time.perf_counter() - wall, 6),
+            'cpu_s': round(time.process_time() - cpu, 6),
+            'rss_start_mb': rss.start_mb,
+            'peak_rss_mb': rss.peak_mb,
+            'pid': os.getpid(),
+            'ts': datetime.now().isoformat(timespec='milliseconds'),
+        })
+        write_record(record)
+
+
+def profiled(name=None):
+    """Decorator: seluruh pemanggilan fungsi dicatat sebagai satu tahap."""
+    def decorate(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,146 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+REPORT RENDERING: FIGURE PARALEL + SKIP YANG TIDAK BERUBAH
+
+Setiap modul menyusun figure sebagai `Figure(path, render, data)`: `data` berisi
+ringkasan yang sudah dihitung (value counts, histogram, matriks korelasi, kurva ROC,
+...), bukan data mentah, dan `render(**data)` hanya menggambar. Dengan begitu:
+
+    - figure dirender di worker process terpisah (backend Agg), paralel;
+    - key tiap figure = hash(ringkasan + source fungsi render + style matplotlib + DPI).
+      Key disimpan di manifest (.dt_figures.json); figure dengan key sama dan PNG
+      yang masih ada dilewati, sehingga run ulang setelah perubahan kecil hanya
+      menggambar ulang figure yang terdampak.
+
+Environment:
+    DT_PLOT_JOBS        jumlah worker process (default min(jumlah figure, CPU); 1 = serial)
+    DT_FIGURE_MANIFEST  lokasi manifest (default .dt_figures.json)
+
+Pada backend interaktif (Jupyter/desktop) semua figure dirender di proses utama dan
+ditampilkan, tanpa skip. Hapus manifest untuk memaksa render ulang semua figure.
+"""
+
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import joblib
+import matplotlib
+
+import dt_plots
+import dt_profile
+
+MANIFEST_FILE = '.dt_figures.json'
+
+
+@dataclass
+class Figure:
+    path: str
+    render: object
+    data: dict = field(default_factory=dict)
+    # Pengganti `data` untuk key bila data berisi objek yang pickle-nya tidak
+    # deterministik (mis. array node tree sklearn punya byte padding acak)
+    fingerprint: dict = None
+
+
+# ============================================
+# 1. FIGURE KEY & MANIFEST
+# ============================================
+
+def style_params():
+    """rcParams aktif (style/palette) tanpa backend -> ikut dikirim ke worker."""
+    return {k: v for k, v in matplotlib.rcParams.items() if k != 'backend'}
+
+
+def render_source(render):
+    try:
+        return inspect.getsource(render)
+    except (OSError, TypeError):
+        return f"{render.__module__}.{render.__qualname__}"
+
+
+def figure_key(figure, style):
+    # Hash per item: pickle memo (objek yang dipakai bersama antar item) tidak ikut
+    # mempengaruhi key, mis. nama fitur milik model hasil fit vs model dari cache
+    summary = figure.data if figure.fingerprint is None else figure.fingerprint
+    data = {name: joblib.hash(value) for name, value in summary.items()}
+    return joblib.hash((figure.path, render_source(figure.render), data,
+                        style, dt_plots.DPI, matplotlib.__version__))
+
+
+def manifest_path():
+    return os.environ.get('DT_FIGURE_MANIFEST', MANIFEST_FILE)
+
+
+def load_manifest(path=None):
+    try:
+        with open(path or manifest_path()) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def update_manifest(keys, path=None):
+    """Gabungkan key baru ke manifest (baca ulang dulu; PART lain bisa menulis juga)."""
+    path = path or manifest_path()
+    manifest = load_manifest(path)
+    manifest.update(keys)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+# ============================================
+# 2. RENDERING
+# ============================================
+
+def _init_worker(style):
+    dt_plots.headless()
+    matplotlib.rcParams.update(style)
+
+
+def render_one(figure):
+    with dt_profile.stage(f"render:{figure.path}"):
+        figure.render(**figure.data)
+        dt_plots.finish(figure.path)
+    return figure.path
+
+
+def plot_jobs(n_figures, workers=None):
+    if workers is None:
+        workers = int(os.environ.get('DT_PLOT_JOBS', 0)) or os.cpu_count() or 1
+    return max(1, min(workers, n_figures))
+
+
+def render_figures(figures, workers=None):
+    """Render figure yang berubah (paralel bila >1 worker); kembalikan path yang dirender."""
+    if dt_plots.is_interactive():
+        for figure in figures:
+            render_one(figure)
+            print(f"✅ Saved: {figure.path}")
+        return [figure.path for figure in figures]
+
+    style = style_params()
+    manifest = load_manifest()
+    keys = {figure.path: figure_key(figure, style) for figure in figures}
+    pending = [figure for figure in figures
+               if manifest.get(figure.path) != keys[figure.path] or not os.path.exists(figure.path)]
+
+    jobs = plot_jobs(len(pending), workers)
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(style,)) as executor:
+            rendered = list(executor.map(render_one, pending))
+    else:
+        rendered = [render_one(figure) for figure in pending]
+
+    for figure in figures:
+        if figure.path in rendered:
+            print(f"✅ Saved: {figure.path}")
+        else:
+            print(f"⏭️ Unchanged: {figure.path}")
+    update_manifest({path: keys[path] for path in rendered})
+    return rendered
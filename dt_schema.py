@@ -0,0 +1,107 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+SCHEMA DATA MENTAH (dtype eksplisit)
+
+Dipakai oleh loader PART 1 dan PART 2. Kolom teks yang berulang (nama wilayah,
+kode wilayah, satuan) dibaca sebagai category sehingga nunique()/groupby bekerja
+pada kode integer, bukan hashing string; tahun dan jumlah_kejadian di-downcast
+ke integer kecil. Sel kosong tetap bisa dibaca (dtype nullable saat parsing);
+kolom yang berisi NaN dijadikan float64 seperti tanpa schema, sehingga sum/count
+groupby melewati NaN seperti sebelumnya.
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+RAW_DTYPES = {
+    'id': 'int64',
+    'kode_provinsi': 'category',
+    'nama_provinsi': 'category',
+    'bps_kode_kabupaten_kota': 'category',
+    'bps_nama_kabupaten_kota': 'category',
+    'bps_kode_kecamatan': 'category',
+    'bps_nama_kecamatan': 'category',
+    'bps_kode_desa_kelurahan': 'category',
+    'bps_nama_desa_kelurahan': 'category',
+    'jumlah_kejadian': 'Int32',     # nullable: sel kosong tidak membuat read_csv gagal
+    'satuan': 'category',
+    'tahun': 'Int16',
+}
+
+# Ukuran pointer per baris untuk kolom object
+POINTER_BYTES = np.dtype(object).itemsize
+
+
+def dtypes_for(columns):
+    """Subset RAW_DTYPES untuk kolom yang dibaca (mis. usecols saat streaming)."""
+    return {c: t for c, t in RAW_DTYPES.items() if c in columns}
+
+
+def numpy_dtypes(df):
+    """Integer nullable -> integer NumPy (tanpa NaN) atau float64 (ada NaN)."""
+    nullable = [c for c in df.columns if isinstance(df[c].dtype, pd.api.extensions.ExtensionDtype)
+                and pd.api.types.is_integer_dtype(df[c].dtype)]
+    return df.astype({c: df[c].dtype.numpy_dtype if not df[c].hasnans else 'float64'
+                      for c in nullable})
+
+
+class ChunkReader:
+    """Bungkus TextFileReader: setiap chunk dinormalisasi dengan numpy_dtypes."""
+
+    def __init__(self, reader):
+        self.reader = reader
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reader.close()
+
+    def __iter__(self):
+        return (numpy_dtypes(chunk) for chunk in self.reader)
+
+
+def read_raw(path, **kwargs):
+    """pd.read_csv dengan schema RAW_DTYPES (kwargs diteruskan, mis. usecols/chunksize)."""
+    usecols = kwargs.get('usecols')
+    dtype = dtypes_for(usecols) if usecols is not None else RAW_DTYPES
+    data = pd.read_csv(path, dtype=dtype, **kwargs)
+    if isinstance(data, pd.DataFrame):
+        return numpy_dtypes(data)
+    return ChunkReader(data)
+
+
+# ============================================
+# MEMORY REPORT
+# ============================================
+
+def default_bytes(series):
+    """Perkiraan memori kolom bila dibaca tanpa schema (string object / int64)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        counts = series.value_counts(sort=False)
+        sizes = np.array([sys.getsizeof(str(c)) for c in counts.index])
+        return int((counts.to_numpy() * sizes).sum() + POINTER_BYTES * len(series))
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return 8 * len(series)
+    return int(series.memory_usage(deep=True, index=False))
+
+
+def memory_report(df):
+    """DataFrame per kolom: dtype, memori tanpa schema (before) dan dengan schema (after)."""
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'before_bytes': [default_bytes(df[c]) for c in df.columns],
+        'after_bytes': df.memory_usage(deep=True, index=False),
+    })
+    report.index.name = 'column'
+    return report
+
+
+def print_memory_report(df):
+    report = memory_report(df)
+    before = report['before_bytes'].sum() / 1024**2
+    after = report['after_bytes'].sum() / 1024**2
+    print(f"   Memory: {before:.2f} MB (object/int64) -> {after:.2f} MB (schema)")
+    return report
@@ -0,0 +1,127 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+BATCH SCORING: DATA TAHUN BARU TANPA TRAINING ULANG
+
+Membaca CSV mentah baru (per chunk), menjalankan transformasi fitur PART 2
+(lag, rolling, density, encoding kabupaten dengan mapping tersimpan), lalu
+menerapkan model tersimpan dari PART 3 (best_model.joblib):
+
+    python -m dt_score data_2025.csv
+    python -m dt_score data_2025.csv --history jml_kejadian_bunuh_diri__des_kel.csv --out risk_2025.csv
+
+Fitur lag/rolling membutuhkan tahun-tahun sebelumnya; data `--history`
+(default: CSV training) digabung sebelum fitur dihitung, dan hanya tahun
+yang ada di file baru yang diberi skor. File histori yang tidak ada adalah
+error (fitur lag akan diam-diam bernilai 0); skor tanpa histori harus
+diminta eksplisit dengan `--history ''`.
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+import dt_data_preparation
+import dt_modeling
+
+SCORES_FILE = 'risk_scores.csv'
+
+
+def aggregate_file(path, granularity, chunksize):
+    chunks = dt_data_preparation.load_chunks(path, chunksize)
+    return dt_data_preparation.aggregate_units(chunks, granularity)
+
+
+def build_scoring_features(saved, df_agg):
+    """Transformasi fitur PART 2 tanpa fitting apa pun (mapping diambil dari model)."""
+    lags, windows = dt_data_preparation.temporal_params(saved.feature_cols)
+    df_agg = dt_data_preparation.add_temporal_features(df_agg, lags=lags, windows=windows,
+                                                       granularity=saved.granularity)
+    df_agg = dt_data_preparation.add_geographic_features(df_agg, saved.granularity)
+    df_agg = dt_data_preparation.encode_with_classes(df_agg, saved.kabupaten_classes)
+    return dt_data_preparation.fill_lag_features(df_agg)
+
+
+def scoring_frame(saved, data_path, history=dt_data_preparation.DATA_FILE,
+                  chunksize=dt_data_preparation.INGEST_CHUNK_ROWS):
+    """Baris fitur lengkap (unit x tahun) untuk semua tahun di `data_path`.
+
+    `history` kosong/None = tanpa histori; path yang tidak ada -> FileNotFoundError.
+    """
+    if history and not os.path.exists(history):
+        raise FileNotFoundError(f"File histori tidak ditemukan: {history!r} "
+                                f"(pakai history='' / --history '' untuk skor tanpa histori)")
+    new_agg = aggregate_file(data_path, saved.granularity, chunksize)
+    years = sorted(new_agg['tahun'].unique())
+
+    frames = [new_agg]
+    if history and os.path.abspath(history) != os.path.abspath(data_path):
+        hist_agg = aggregate_file(history, saved.granularity, chunksize)
+        frames.insert(0, hist_agg[~hist_agg['tahun'].isin(years)])
+    df_agg = build_scoring_features(saved, pd.concat(frames, ignore_index=True))
+
+    scored = df_agg[df_agg['tahun'].isin(years)]
+    complete = scored[saved.feature_cols].notna().all(axis=1)
+    if not complete.all():
+        print(f"⚠️ {(~complete).sum()} baris dilewati (fitur tidak lengkap)")
+        scored = scored[complete]
+    return scored
+
+
+def score(data_path, model_path=dt_modeling.MODEL_FILE, history=dt_data_preparation.DATA_FILE,
+          chunksize=dt_data_preparation.INGEST_CHUNK_ROWS):
+    """Skor risiko per wilayah x tahun untuk semua tahun di `data_path`."""
+    saved = dt_modeling.load_model(model_path)
+    print(f"✅ Model loaded: {saved.name} (granularity={saved.granularity}, "
+          f"trained {saved.trained_at})")
+
+    scored = scoring_frame(saved, data_path, history=history, chunksize=chunksize)
+    units = dt_data_preparation.unit_cols(saved.granularity)
+    result = scored[units + ['tahun', 'total_kasus']].copy()
+    result['probability_class_1'] = saved.predict_proba(scored)
+    result['calibrated_probability'] = saved.calibrate(result['probability_class_1'].to_numpy())
+    result['predicted'] = saved.classify(result['probability_class_1'].to_numpy())
+    return result.sort_values('probability_class_1', ascending=False).reset_index(drop=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m dt_score',
+        description='Skor risiko data baru dengan model tersimpan (tanpa training ulang)'
+    )
+    parser.add_argument('data', help='CSV mentah baru (format sama dengan data training)')
+    parser.add_argument('--model', default=dt_modeling.MODEL_FILE,
+                        help='model bundle dari PART 3')
+    parser.add_argument('--history', default=dt_data_preparation.DATA_FILE,
+                        help="CSV tahun-tahun sebelumnya untuk fitur lag/rolling ('' = tanpa histori)")
+    parser.add_argument('--out', default=SCORES_FILE, help='file CSV output')
+    parser.add_argument('--chunksize', type=int, default=dt_data_preparation.INGEST_CHUNK_ROWS,
+                        help='jumlah baris per chunk saat membaca CSV')
+    args = parser.parse_args(argv)
+    if args.history and not os.path.exists(args.history):
+        parser.error(f"file histori tidak ditemukan: {args.history!r} "
+                     f"(fitur lag/rolling akan bernilai 0); pakai --history '' untuk skor tanpa histori")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    print("="*70)
+    print("BATCH SCORING")
+    print("="*70)
+
+    result = score(args.data, model_path=args.model, history=args.history,
+                   chunksize=args.chunksize)
+    result.to_csv(args.out, index=False)
+
+    print(f"\n✅ {len(result):,} wilayah x tahun diberi skor -> {args.out}")
+    print(f"   Predicted berisiko: {int(result['predicted'].sum()):,}")
+    print(f"   Waktu: {time.perf_counter() - start:.2f} s")
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+FUNDAMENTAL DATA ANALYST - DECISION TREE PROJECT
+ONLINE SCORING SERVICE
+
+HTTP service lokal (stdlib, tanpa dependency baru) untuk pertanyaan risiko per
+wilayah. Model terbaik (best_model.joblib) dimuat sekali; baris fitur tahun
+terakhir per wilayah disimpan di index dalam memori sehingga setiap query
+hanya lookup dictionary.
+
+    python -m dt_serve                       # http://127.0.0.1:8765
+    python -m dt_serve --benchmark 2000      # benchmark dengan client lokal
+
+Endpoint:
+    GET  /health
+    GET  /risk?kabupaten=KABUPATEN%20BOGOR[&kecamatan=...&desa=...]
+    POST /risk   {"regions": [{"kabupaten": "..."}, ...]}
+
+Catatan: model memakai fitur tahun berjalan (mis. total_kasus), jadi skor yang
+dilayani adalah skor baris tahun terakhir yang tersedia per wilayah; setelah
+data tahun baru masuk, jalankan ulang service dengan --data file terbaru.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import numpy as np
+
+import dt_data_preparation
+import dt_modeling
+import dt_score
+
+HOST = '127.0.0.1'
+PORT = 8765
+
+
+# ============================================
+# 1. IN-MEMORY INDEX
+# ============================================
+
+def normalize(name):
+    return ' '.join(str(name).upper().split())
+
+
+class RiskIndex:
+    """Skor tahun terakhir per wilayah, di-key dengan nama wilayah ter-normalisasi."""
+
+    def __init__(self, saved, rows):
+        self.saved = saved
+        self.units = dt_data_preparation.unit_cols(saved.granularity)
+        self.entries = {}
+
+        proba = saved.predict_proba(rows)
+        calibrated = saved.calibrate(proba)
+        predicted = saved.classify(proba)
+        for i, (_, row) in enumerate(rows.iterrows()):
+            key = tuple(normalize(row[c]) for c in self.units)
+            self.entries[key] = {
+                **{c: str(row[c]) for c in self.units},
+                'tahun': int(row['tahun']),
+                'total_kasus': int(row['total_kasus']),
+                'probability_class_1': float(proba[i]),
+                'calibrated_probability': float(calibrated[i]),
+                'predicted': int(predicted[i]),
+            }
+
+    @classmethod
+    def build(cls, saved, data_path=dt_data_preparation.DATA_FILE, history=None):
+        rows = dt_score.scoring_frame(saved, data_path, history=history)
+        units = dt_data_preparation.unit_cols(saved.granularity)
+        latest = rows.sort_values('tahun').groupby(units, observed=True).tail(1)
+        return cls(saved, latest)
+
+    def lookup(self, region):
+        key = tuple(normalize(region.get(c, '')) for c in self.units)
+        entry = self.entries.get(key)
+        if entry is None:
+            return {**{c: region.get(c) for c in self.units}, 'error': 'wilayah tidak ditemukan'}
+        return entry
+
+
+# ============================================
+# 2. HTTP SERVICE
+# ============================================
+
+class RiskHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive
+    disable_nagle_algorithm = True
+    index = None
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            saved = self.index.saved
+            self.send_json({'status': 'ok', 'model': saved.name,
+                            'granularity': saved.granularity,
+                            'regions': len(self.index.entries)})
+        elif url.path == '/risk':
+            region = {k: v[0] for k, v in parse_qs(url.query).items()}
+            result = self.index.lookup(region)
+            self.send_json(result, status=404 if 'error' in result else 200)
+        else:
+            self.send_json({'error': 'not found'}, status=404)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/risk':
+            self.send_json({'error': 'not found'}, status=404)
+            return
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            regions = json.loads(self.rfile.read(length))['regions']
+        except (ValueError, KeyError, TypeError):
+            self.send_json({'error': 'body harus {"regions": [...]}'}, status=400)
+            return
+        if not isinstance(regions, list) or not all(isinstance(r, dict) for r in regions):
+            self.send_json({'error': 'regions harus list object, mis. [{"kabupaten": "..."}]'},
+                           status=400)
+            return
+        self.send_json({'results': [self.index.lookup(r) for r in regions]})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(index, host=HOST, port=PORT):
+    handler = type('BoundRiskHandler', (RiskHandler,), {'index': index})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+# ============================================
+# 3. BENCHMARK (client lokal)
+# ============================================
+
+def latency_stats(latencies, elapsed):
+    ms = np.asarray(latencies) * 1000
+    return {
+        'requests': len(ms),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max()),
+        'throughput_rps': len(ms) / elapsed,
+    }
+
+
+def run_client(host, port, regions, requests, batch_size=1, seed=42):
+    """Client keep-alive sederhana: query acak ke `regions` (list dict key wilayah)."""
+    rng = np.random.default_rng(seed)
+    conn = http.client.HTTPConnection(host, port)
+    latencies = []
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        picked = [regions[i] for i in rng.integers(len(regions), size=batch_size)]
+        t0 = time.perf_counter()
+        if batch_size == 1:
+            conn.request('GET', f'/risk?{urlencode(picked[0])}')
+        else:
+            conn.request('POST', '/risk', body=json.dumps({'regions': picked}).encode('utf-8'),
+                         headers={'Content-Type': 'application/json'})
+        conn.getresponse().read()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return latency_stats(latencies, elapsed)
+
+
+def benchmark(index, requests=2000, batch_sizes=(1, 32)):
+    server = make_server(index, port=0)
+    regions = [dict(zip(index.units, key)) for key in index.entries]
+    host, port = server.server_address
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    print("\n" + "="*70)
+    print("SERVICE BENCHMARK")
+    print("="*70)
+    print(f"\n{'batch':>6} {'requests':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9}")
+    results = {}
+    try:
+        run_client(host, port, regions, 100)  # warm-up
+        for batch_size in batch_sizes:
+            stats = run_client(host, port, regions, requests, batch_size=batch_size)
+            results[batch_size] = stats
+            print(f"{batch_size:>6} {stats['requests']:>9} {stats['p50_ms']:>8.3f} "
+                  f"{stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f} {stats['throughput_rps']:>9.0f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dt_serve',
+                                     description='Online risk scoring service')
+    parser.add_argument('--model', default=dt_modeling.MODEL_FILE, help='model bundle dari PART 3')
+    parser.add_argument('--data', default=dt_data_preparation.DATA_FILE,
+                        help='CSV mentah terbaru untuk index fitur')
+    parser.add_argument('--history', default=None,
+                        help='CSV tahun-tahun sebelumnya (bila --data hanya berisi tahun baru)')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--benchmark', type=int, metavar='N', default=None,
+                        help='jalankan benchmark N request per ukuran batch lalu keluar')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    saved = dt_modeling.load_model(args.model)
+    index = RiskIndex.build(saved, args.data, history=args.history)
+    print(f"\n✅ Index ready: {len(index.entries)} wilayah ({saved.name}, {saved.granularity})")
+
+    if args.benchmark:
+        return benchmark(index, requests=args.benchmark)
+
+    server = make_server(index, args.host, args.port)
+    print(f"✅ Serving on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
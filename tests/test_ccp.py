@@ -0,0 +1,54 @@
+"""
+Pruning ccp_alpha tanpa refit (ccp_collapse_alphas + pruned_subtree_predict)
+harus sama persis dengan DecisionTreeClassifier(ccp_alpha=a) yang di-fit ulang.
+"""
+
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeClassifier
+
+import dt_modeling
+
+
+def tied_data():
+    # Dua blok identik yang digeser: subtree kembar -> alpha kembar di path
+    rng = np.random.default_rng(0)
+    block = rng.integers(0, 4, size=(40, 2)).astype(float)
+    labels = ((block[:, 0] + block[:, 1]) % 3 == 0).astype(int)
+    X = np.r_[block, block + 10]
+    return X, np.r_[labels, labels], X
+
+
+def noisy_data():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(300, 4))
+    y = (X[:, 0] + 0.5 * rng.normal(size=300) > 0).astype(int)
+    return X, y, rng.normal(size=(200, 4))
+
+
+def path_alphas(tree, X, y):
+    """Alpha tepat di path (termasuk alpha kembar), titik tengah, dan di atas root."""
+    alphas = np.unique(tree.cost_complexity_pruning_path(X, y).ccp_alphas)
+    return np.r_[alphas, (alphas[:-1] + alphas[1:]) / 2, alphas[-1] * 2]
+
+
+@pytest.mark.parametrize('data', [tied_data, noisy_data])
+@pytest.mark.parametrize('params', [{}, {'class_weight': 'balanced'}])
+def test_pruned_subtree_predict_matches_refit(data, params):
+    X, y, X_query = data()
+    tree = DecisionTreeClassifier(random_state=0, **params).fit(X, y)
+    alphas = path_alphas(tree, X, y)
+
+    predicted = dt_modeling.pruned_subtree_predict(tree, X_query, alphas, chunk_elements=64)
+
+    assert predicted.shape == (len(X_query), len(alphas))
+    for j, alpha in enumerate(alphas):
+        refit = DecisionTreeClassifier(random_state=0, ccp_alpha=alpha, **params).fit(X, y)
+        np.testing.assert_array_equal(predicted[:, j], refit.predict(X_query) == 1,
+                                      err_msg=f'ccp_alpha={alpha!r}')
+
+
+def test_tied_data_has_duplicate_path_alphas():
+    X, y, _ = tied_data()
+    path = DecisionTreeClassifier(random_state=0).fit(X, y).cost_complexity_pruning_path(X, y)
+    assert len(np.unique(path.ccp_alphas)) < len(path.ccp_alphas)
@@ -0,0 +1,86 @@
+"""
+Regression test PART 2: growth_rate & severity_ratio versi vektor (NumPy) harus identik
+dengan implementasi lama berbasis DataFrame.apply per baris; agregasi streaming per
+chunk harus sama dengan groupby sekali jalan.
+"""
+
+import numpy as np
+import pandas as pd
+
+import dt_data_preparation
+
+
+def legacy_growth_rate(df_agg):
+    return df_agg.apply(
+        lambda row: ((row['total_kasus'] - row['kasus_1tahun_lalu']) / row['kasus_1tahun_lalu'] * 100)
+        if pd.notna(row['kasus_1tahun_lalu']) and row['kasus_1tahun_lalu'] > 0
+        else 0,
+        axis=1
+    )
+
+
+def legacy_severity_ratio(df_agg):
+    return df_agg.apply(
+        lambda row: row['max_kasus'] / row['rata_kasus'] if row['rata_kasus'] > 0 else 0,
+        axis=1
+    )
+
+
+def make_agg():
+    # K00: tahun pertama (lag NaN), lalu 0 -> 3 (tahun lalu 0), 3 -> 6, 6 -> 0
+    # K01: semua tahun tanpa kejadian
+    # K02: satu tahun saja (hanya lag NaN)
+    rows = [
+        ('K00', 2019, 0), ('K00', 2020, 3), ('K00', 2021, 6), ('K00', 2022, 0),
+        ('K01', 2019, 0), ('K01', 2020, 0), ('K01', 2021, 0),
+        ('K02', 2021, 4),
+    ]
+    df_agg = pd.DataFrame(rows, columns=['kabupaten', 'tahun', 'total_kasus'])
+    df_agg['jumlah_desa'] = 8
+    df_agg['jumlah_kecamatan'] = 5
+    df_agg['max_kasus'] = df_agg['total_kasus'].clip(upper=2)
+    df_agg['rata_kasus'] = df_agg['total_kasus'] / 8
+    return df_agg
+
+
+def test_growth_rate_matches_rowwise_apply():
+    df_agg = dt_data_preparation.add_temporal_features(make_agg())
+
+    assert df_agg['kasus_1tahun_lalu'].isna().sum() == 3
+    assert (df_agg['kasus_1tahun_lalu'] == 0).any()
+    np.testing.assert_array_equal(df_agg['growth_rate'].to_numpy(),
+                                  legacy_growth_rate(df_agg).to_numpy(dtype=float))
+
+
+def test_severity_ratio_matches_rowwise_apply():
+    df_agg = dt_data_preparation.add_geographic_features(make_agg())
+
+    assert (df_agg['rata_kasus'] == 0).any()
+    np.testing.assert_array_equal(df_agg['severity_ratio'].to_numpy(),
+                                  legacy_severity_ratio(df_agg).to_numpy(dtype=float))
+
+
+def make_raw(seed=0, n_kabupaten=4, n_kecamatan=3, n_desa=5, years=range(2019, 2023)):
+    rng = np.random.default_rng(seed)
+    rows = [(f'KAB {k}', f'KEC {k}-{c}', f'DESA {d}', t)
+            for k in range(n_kabupaten) for c in range(n_kecamatan)
+            for d in range(n_desa) for t in years]
+    df = pd.DataFrame(rows, columns=['bps_nama_kabupaten_kota', 'bps_nama_kecamatan',
+                                     'bps_nama_desa_kelurahan', 'tahun'])
+    df['jumlah_kejadian'] = rng.poisson(0.3, len(df))
+    # Baris duplikat desa-tahun & urutan acak: pasangan unik tersebar di banyak chunk
+    df = pd.concat([df, df.sample(frac=0.3, random_state=seed)], ignore_index=True)
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def test_streaming_aggregation_matches_in_memory():
+    df = make_raw()
+    for granularity in dt_data_preparation.GRANULARITY_LEVELS:
+        names = dt_data_preparation.unit_cols(granularity)
+        full = dt_data_preparation.aggregate_units(df, granularity=granularity)
+        chunked = dt_data_preparation.aggregate_units(df, granularity=granularity, chunk_rows=37)
+
+        def normalized(frame):
+            return (frame.astype({c: str for c in names}).sort_values(names + ['tahun'])
+                    .reset_index(drop=True))
+        pd.testing.assert_frame_equal(normalized(full), normalized(chunked), check_dtype=False)
@@ -0,0 +1,92 @@
+"""
+Kurva ROC/PR satu-sort (dt_metrics.compute_curves) dibandingkan dengan sklearn,
+termasuk probabilitas kembar (ties) seperti output leaf decision tree; bootstrap
+batch dibandingkan dengan loop resample naif dan antara 1 vs N worker.
+"""
+
+import numpy as np
+import pytest
+from sklearn.metrics import (accuracy_score, average_precision_score, f1_score,
+                             precision_score, recall_score, roc_auc_score, roc_curve)
+
+import dt_metrics
+
+
+def scores(seed, n=500, decimals=None):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, 2, size=n)
+    proba = np.clip(0.3 * y_true + rng.normal(0.35, 0.25, size=n), 0, 1)
+    if decimals is not None:
+        proba = np.round(proba, decimals)  # banyak nilai kembar
+    return y_true, proba
+
+
+@pytest.mark.parametrize('decimals', [None, 1, 0])
+def test_auc_and_average_precision_match_sklearn(decimals):
+    y_true, proba = scores(0, decimals=decimals)
+    curves = dt_metrics.compute_curves(y_true, proba)
+
+    assert curves.roc_auc == pytest.approx(roc_auc_score(y_true, proba), abs=1e-12)
+    assert curves.average_precision == pytest.approx(average_precision_score(y_true, proba),
+                                                     abs=1e-12)
+
+
+def test_roc_points_match_sklearn():
+    y_true, proba = scores(1, decimals=2)
+    curves = dt_metrics.compute_curves(y_true, proba)
+    fpr, tpr, thresholds = roc_curve(y_true, proba, drop_intermediate=False)
+
+    np.testing.assert_allclose(curves.fpr, fpr)
+    np.testing.assert_allclose(curves.tpr, tpr)
+    np.testing.assert_allclose(curves.thresholds, thresholds[1:])
+
+
+def test_single_class_auc_is_nan():
+    curves = dt_metrics.compute_curves(np.zeros(10, dtype=int), np.linspace(0, 1, 10))
+    assert np.isnan(curves.roc_auc)
+    assert np.isnan(curves.average_precision)
+
+
+def naive_bootstrap(y_true, y_pred, y_proba, n_boot, seed):
+    """Loop resample satu per satu dengan metrik sklearn (indeks sama dengan satu batch)."""
+    rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+    indices = rng.integers(0, len(y_true), size=(n_boot, len(y_true)))
+    samples = {metric: [] for metric in dt_metrics.METRICS}
+    for idx in indices:
+        t, p, s = y_true[idx], y_pred[idx], y_proba[idx]
+        samples['Accuracy'].append(accuracy_score(t, p))
+        samples['Precision'].append(precision_score(t, p, zero_division=0))
+        samples['Recall'].append(recall_score(t, p, zero_division=0))
+        samples['F1-Score'].append(f1_score(t, p, zero_division=0))
+        samples['ROC-AUC'].append(roc_auc_score(t, s) if len(np.unique(t)) == 2 else np.nan)
+    return {metric: np.array(values) for metric, values in samples.items()}
+
+
+def test_bootstrap_matches_naive_loop():
+    # Data kecil & tidak seimbang: sebagian resample hanya berisi satu kelas (AUC NaN)
+    rng = np.random.default_rng(3)
+    y_true = (rng.random(12) < 0.15).astype(int)
+    y_true[0] = 1
+    y_pred = rng.integers(0, 2, size=12)
+    y_proba = np.round(rng.random(12), 1)
+
+    samples = dt_metrics.bootstrap_metrics(y_true, y_pred, y_proba, n_boot=300, seed=7, workers=1)
+    naive = naive_bootstrap(y_true, y_pred, y_proba, n_boot=300, seed=7)
+
+    assert np.isnan(naive['ROC-AUC']).any()
+    for metric in dt_metrics.METRICS:
+        np.testing.assert_allclose(samples[metric], naive[metric], err_msg=metric)
+    assert (dt_metrics.confidence_intervals(samples)
+            == pytest.approx(dt_metrics.confidence_intervals(naive)))
+
+
+def test_bootstrap_same_with_one_or_many_workers(monkeypatch):
+    y_true, proba = scores(4, n=200, decimals=2)
+    y_pred = (proba >= 0.5).astype(int)
+    # Paksa beberapa batch dan process pool meskipun datanya kecil
+    monkeypatch.setattr(dt_metrics, 'BATCH_ELEMENTS', 200 * 64)
+    monkeypatch.setattr(dt_metrics, 'PARALLEL_MIN_ELEMENTS', 0)
+
+    serial = dt_metrics.metric_intervals(y_true, y_pred, proba, n_boot=500, workers=1)
+    parallel = dt_metrics.metric_intervals(y_true, y_pred, proba, n_boot=500, workers=3)
+    assert serial == parallel
@@ -0,0 +1,57 @@
+"""
+PART 3 end-to-end pada data kecil: Baseline yang menang tidak boleh membuat
+training gagal (model terbaik fallback ke DT Basic); skor CV grid search dipakai ulang
+tanpa fit tambahan.
+"""
+
+import numpy as np
+import pandas as pd
+
+import dt_data_preparation
+import dt_modeling
+
+
+def make_prepared(seed=0):
+    rng = np.random.default_rng(seed)
+    cols = ['kasus_1tahun_lalu', 'growth_rate', 'kabupaten_encoded']
+
+    def frame(n):
+        return pd.DataFrame(rng.normal(size=(n, len(cols))), columns=cols)
+
+    X_train, X_test = frame(150), frame(40)
+    y_train = pd.Series((X_train['kasus_1tahun_lalu'] > -0.3).astype(int), name='berisiko')
+    # Label test dibalik: semua tree mendapat F1 = 0, majority class (1) menang
+    y_test = pd.Series((X_test['kasus_1tahun_lalu'] <= -0.3).astype(int), name='berisiko')
+    return dt_data_preparation.PreparedData(
+        X_train=X_train, X_test=X_test, y_train=y_train, y_test=y_test,
+        data=pd.concat([X_train, y_train], axis=1), feature_cols=cols,
+        kabupaten_mapping=pd.DataFrame({'kabupaten': ['K00'], 'encoded_value': [0]}),
+        n_raw=190, n_aggregated=190,
+    )
+
+
+def test_train_when_baseline_wins(monkeypatch):
+    monkeypatch.setenv('DT_PROFILE_LOG', '0')
+    bundle = dt_modeling.train(make_prepared(), workers=1, search='ccp')
+
+    assert bundle.best_model_name == 'Baseline'
+    assert bundle.best.name == 'DT Basic'
+    assert set(bundle.feature_importance['feature']) == set(bundle.prepared.feature_cols)
+    assert np.isclose(bundle.feature_importance['importance'].sum(), 1.0)
+
+
+def test_grid_search_cv_reused_without_refit(monkeypatch):
+    monkeypatch.setenv('DT_PROFILE_LOG', '0')
+    prepared = make_prepared()
+    folds = dt_modeling.cv_folds(prepared)
+    result = dt_modeling.fit_dt_pruned(prepared, n_jobs=1, folds=folds, strategy='grid',
+                                       param_grid={'max_depth': [2, 3, None],
+                                                   'min_samples_leaf': [1, 5]})
+
+    cv_results, _, oof_proba = dt_modeling.cross_validate_model(result.model, prepared, folds)
+    for metric, scores in cv_results.items():
+        np.testing.assert_allclose(result.cv_results[metric], scores)
+    assert result.oof_proba is None  # OOF baru dihitung bila DT Pruned terpilih
+
+    dt_modeling.ensure_oof(result, prepared)
+    np.testing.assert_allclose(result.oof_proba, oof_proba)
@@ -0,0 +1,47 @@
+"""
+Sweep cutoff vektor (dt_threshold.threshold_sweep) dibandingkan dengan
+precision_recall_curve sklearn dan dengan metrik per cutoff yang dihitung langsung.
+"""
+
+import numpy as np
+import pytest
+from sklearn.metrics import f1_score, precision_recall_curve, precision_score, recall_score
+
+import dt_threshold
+
+
+def scores(seed=0, n=400):
+    rng = np.random.default_rng(seed)
+    y_true = rng.integers(0, 2, size=n)
+    # Probabilitas leaf tree: sedikit nilai unik, banyak ties
+    proba = np.round(np.clip(0.3 * y_true + rng.normal(0.35, 0.25, size=n), 0, 1), 1)
+    return y_true, proba
+
+
+def test_sweep_matches_precision_recall_curve():
+    y_true, proba = scores()
+    sweep = dt_threshold.threshold_sweep(y_true, proba).set_index('threshold')
+    precision, recall, thresholds = precision_recall_curve(y_true, proba)
+
+    # sklearn: threshold naik dan berhenti saat recall penuh; titik terakhir (P=1, R=0) tanpa cutoff
+    assert np.all(np.diff(sweep.index) < 0)
+    assert set(thresholds) <= set(sweep.index)
+    np.testing.assert_allclose(sweep.loc[thresholds, 'precision'], precision[:-1])
+    np.testing.assert_allclose(sweep.loc[thresholds, 'recall'], recall[:-1])
+
+
+def test_sweep_rows_match_direct_metrics():
+    y_true, proba = scores(1)
+    sweep = dt_threshold.threshold_sweep(y_true, proba, fn_cost=5.0, fp_cost=1.0)
+
+    for row in sweep.itertuples():
+        y_pred = (proba >= row.threshold).astype(int)
+        assert row.precision == pytest.approx(precision_score(y_true, y_pred, zero_division=0))
+        assert row.recall == pytest.approx(recall_score(y_true, y_pred))
+        assert row.f1 == pytest.approx(f1_score(y_true, y_pred))
+        assert row.tp + row.fp + row.fn + row.tn == len(y_true)
+        assert row.cost == 5.0 * row.fn + 1.0 * row.fp
+
+        fixed = dt_threshold.evaluate_threshold(y_true, proba, row.threshold)
+        assert (fixed.precision, fixed.recall, fixed.f1) == pytest.approx(
+            (row.precision, row.recall, row.f1))